@@ -0,0 +1,95 @@
+###
+## cluster_maker: benchmark of float32 versus float64 computation
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Compare the manual kmeans on the same data held in float64 and in float32.
+
+For each dtype this reports the size of X, the kmeans wall time and
+tracemalloc peak, and the final inertia with its relative difference from
+the float64 run.
+
+Usage:
+    python benchmarks/bench_dtype.py [n_samples] [n_features] [k]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import numpy as np
+
+from cluster_maker.algorithms import kmeans
+from cluster_maker.evaluation import compute_inertia
+
+DTYPES = ("float64", "float32")
+
+
+def bench_dtype(
+    X: np.ndarray,
+    k: int,
+    random_state: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Run kmeans once per dtype and collect the measurements.
+    """
+    rows = []
+    reference = None
+    for dtype in DTYPES:
+        X_typed = X.astype(dtype)
+        start = time.perf_counter()
+        kmeans(X_typed, k, random_state=random_state)
+        wall_time = time.perf_counter() - start
+
+        tracemalloc.start()
+        try:
+            labels, centroids = kmeans(X_typed, k, random_state=random_state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        inertia = compute_inertia(X_typed, labels, centroids)
+        if reference is None:
+            reference = inertia
+        rows.append(
+            {
+                "dtype": dtype,
+                "X_bytes": X_typed.nbytes,
+                "time_s": wall_time,
+                "peak_memory_bytes": peak,
+                "inertia": inertia,
+                "inertia_rel_delta": (inertia - reference) / reference,
+            }
+        )
+    return rows
+
+
+def main(args: List[str]) -> None:
+    n_samples = int(args[1]) if len(args) > 1 else 500_000
+    n_features = int(args[2]) if len(args) > 2 else 16
+    k = int(args[3]) if len(args) > 3 else 16
+
+    rng = np.random.RandomState(0)
+    centres = rng.normal(scale=5.0, size=(k, n_features))
+    X = centres[rng.randint(k, size=n_samples)] + rng.normal(size=(n_samples, n_features))
+
+    print(f"dtype benchmark: n={n_samples}, d={n_features}, k={k}")
+    print(
+        f"{'dtype':<8} {'X [MiB]':>9} {'time [s]':>9} {'peak [MiB]':>11} "
+        f"{'inertia':>16} {'rel. delta':>11}"
+    )
+    for row in bench_dtype(X, k):
+        print(
+            f"{row['dtype']:<8} {row['X_bytes'] / 1024 ** 2:>9.1f} {row['time_s']:>9.3f} "
+            f"{row['peak_memory_bytes'] / 1024 ** 2:>11.1f} {row['inertia']:>16.1f} "
+            f"{row['inertia_rel_delta']:>11.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv)
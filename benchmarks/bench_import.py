@@ -0,0 +1,84 @@
+###
+## cluster_maker: import-time benchmark
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Measure the cost of importing cluster_maker in a fresh interpreter.
+
+Each statement is timed in new subprocesses (best of `repeat`) and the heavy
+third-party packages it loads are listed. The script fails if a bare
+`import cluster_maker` loads matplotlib or scikit-learn.
+
+Usage:
+    python benchmarks/bench_import.py [repeat]
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Dict, List
+
+STATEMENTS = (
+    "import numpy",
+    "import cluster_maker",
+    "from cluster_maker import assign_clusters",
+    "from cluster_maker import load_model",
+    "from cluster_maker import run_clustering",
+    "import cluster_maker; cluster_maker.sklearn_kmeans",
+)
+
+HEAVY_MODULES = ("pandas", "scipy", "sklearn", "matplotlib")
+
+# Forbidden after a bare `import cluster_maker`.
+FORBIDDEN = ("matplotlib", "sklearn")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(' '.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def time_import(statement: str, repeat: int = 5) -> Dict[str, object]:
+    """
+    Best wall time of `statement` over `repeat` fresh interpreters, and the
+    heavy modules it loaded.
+    """
+    times = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.splitlines()
+        times.append(float(output[0]))
+        loaded = output[1].split() if len(output) > 1 else []
+    return {"statement": statement, "time_s": min(times), "loaded": loaded}
+
+
+def main(args: List[str]) -> None:
+    repeat = int(args[1]) if len(args) > 1 else 5
+    print(f"{'statement':<52} {'time [ms]':>10}  heavy modules loaded")
+    rows = [time_import(statement, repeat) for statement in STATEMENTS]
+    for row in rows:
+        print(
+            f"{row['statement']:<52} {row['time_s'] * 1e3:>10.1f}  "
+            f"{', '.join(row['loaded']) or '-'}"
+        )
+
+    bare = next(row for row in rows if row["statement"] == "import cluster_maker")
+    leaked = [name for name in FORBIDDEN if name in bare["loaded"]]
+    if leaked:
+        raise SystemExit(f"'import cluster_maker' loaded {leaked}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
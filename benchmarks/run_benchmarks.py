@@ -0,0 +1,300 @@
+###
+## cluster_maker: benchmark suite
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Reproducible benchmarks of the public algorithms and pipeline stages.
+
+Workloads are generated with `simulate_data` for a grid of
+(n_samples, n_features, k). Each benchmark is timed over several repeats
+(wall time) and run once more under tracemalloc (peak memory allocated
+during the call). Benchmarks that return a dict of metrics (e.g. the
+number of Lloyd iterations of a kmeans fit) have them recorded too.
+Results are written as JSON so that runs on different commits can be
+compared with --compare.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--preset small|medium|large]
+        [--repeat N] [--only NAME ...] [--output results.json]
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import cluster_maker
+from cluster_maker import (
+    assign_clusters,
+    compute_inertia,
+    define_dataframe_structure,
+    elbow_curve,
+    init_centroids,
+    kmeans,
+    KMeansModel,
+    run_clustering,
+    silhouette_score_sklearn,
+    simulate_data,
+    sklearn_kmeans,
+    update_centroids,
+)
+
+# (n_samples, n_features, k) grids.
+PRESETS: Dict[str, List[Tuple[int, int, int]]] = {
+    "small": [(2_000, 2, 3), (10_000, 8, 8)],
+    "medium": [(10_000, 8, 8), (100_000, 16, 16), (100_000, 64, 50)],
+    "large": [(100_000, 16, 16), (1_000_000, 16, 16), (1_000_000, 64, 50)],
+}
+
+# The exact silhouette is O(n^2): it is measured on at most this many rows.
+SILHOUETTE_MAX_SAMPLES = 10_000
+
+
+class Workload:
+    """
+    Data and fitted state shared by the benchmarks of one (n, d, k) point.
+    """
+
+    def __init__(self, n_samples: int, n_features: int, k: int, workdir: str) -> None:
+        self.n_samples, self.n_features, self.k = n_samples, n_features, k
+        rng = np.random.default_rng(0)
+        seed_df = define_dataframe_structure(
+            [
+                {"name": f"f{j}", "reps": list(rng.normal(scale=10.0, size=k))}
+                for j in range(n_features)
+            ]
+        )
+        self.data = simulate_data(seed_df, n_points=n_samples, random_state=0)
+        self.feature_cols = list(seed_df.columns)
+        self.X = self.data[self.feature_cols].to_numpy(dtype=float)
+        self.X32 = self.X.astype(np.float32)
+        self.centroids = init_centroids(self.X, k, random_state=0)
+        self.labels = assign_clusters(self.X, self.centroids)
+        self.model = KMeansModel.from_centroids(self.centroids)
+        self.csv_path = os.path.join(workdir, f"workload_{n_samples}_{n_features}_{k}.csv")
+        self.output_path = os.path.join(workdir, "labelled.csv")
+
+    def write_csv(self) -> None:
+        if not os.path.exists(self.csv_path):
+            self.data.to_csv(self.csv_path, index=False)
+
+
+def _run_pipeline(w: Workload) -> None:
+    import matplotlib.pyplot as plt
+
+    w.write_csv()
+    run_clustering(
+        w.csv_path,
+        w.feature_cols,
+        k=w.k,
+        random_state=0,
+        output_path=w.output_path,
+        compute_elbow=True,
+    )
+    plt.close("all")
+
+
+def _kmeans_fit(w: Workload, init: str) -> Dict[str, Any]:
+    _, _, info = kmeans(w.X, w.k, random_state=0, init=init, return_info=True)
+    return {"n_iter": info["n_iter"], "inertia": info["inertia"]}
+
+
+def _silhouette(w: Workload) -> None:
+    m = min(w.n_samples, SILHOUETTE_MAX_SAMPLES)
+    silhouette_score_sklearn(w.X[:m], w.labels[:m])
+
+
+# name -> function of a workload. Each call is one measured operation.
+BENCHMARKS: Dict[str, Callable[[Workload], Any]] = {
+    "assign_clusters": lambda w: assign_clusters(w.X, w.centroids),
+    "assign_clusters[float32]": lambda w: assign_clusters(w.X32, w.centroids),
+    "update_centroids": lambda w: update_centroids(w.X, w.labels, w.k),
+    "init_centroids[random]": lambda w: init_centroids(w.X, w.k, random_state=0, init="random"),
+    "init_centroids[k-means++]": lambda w: init_centroids(w.X, w.k, random_state=0, init="k-means++"),
+    "init_centroids[k-means||]": lambda w: init_centroids(w.X, w.k, random_state=0, init="k-means||"),
+    "kmeans": lambda w: _kmeans_fit(w, "random"),
+    "kmeans[k-means++]": lambda w: _kmeans_fit(w, "k-means++"),
+    "kmeans[k-means||]": lambda w: _kmeans_fit(w, "k-means||"),
+    "kmeans[hamerly]": lambda w: kmeans(w.X, w.k, random_state=0, algorithm="hamerly"),
+    "kmeans[elkan]": lambda w: kmeans(w.X, w.k, random_state=0, algorithm="elkan"),
+    "kmeans[float32]": lambda w: kmeans(w.X32, w.k, random_state=0),
+    "sklearn_kmeans": lambda w: sklearn_kmeans(w.X, w.k, random_state=0),
+    "compute_inertia": lambda w: compute_inertia(w.X, w.labels, w.centroids),
+    "KMeansModel.predict[1 row]": lambda w: w.model.predict(w.X[0]),
+    "KMeansModel.predict[256 rows]": lambda w: w.model.predict(w.X[:256]),
+    "silhouette_score_sklearn": _silhouette,
+    "elbow_curve": lambda w: elbow_curve(w.X, list(range(1, w.k + 1)), random_state=0),
+    "run_clustering": _run_pipeline,
+}
+
+
+def measure(
+    func: Callable[[Workload], Any],
+    workload: Workload,
+    repeat: int = 3,
+) -> Dict[str, Any]:
+    """
+    Wall times over `repeat` calls plus the tracemalloc peak of one extra call,
+    and the metrics returned by the first call if it returns a dict.
+    """
+    times = []
+    metrics = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(workload)
+        times.append(time.perf_counter() - start)
+        if metrics is None and isinstance(result, dict):
+            metrics = result
+
+    tracemalloc.start()
+    try:
+        func(workload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_time_s": {
+            "min": min(times),
+            "median": statistics.median(times),
+            "repeats": times,
+        },
+        "peak_memory_bytes": peak,
+        "metrics": metrics,
+    }
+
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": commit,
+        "cluster_maker_path": os.path.dirname(cluster_maker.__file__),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(
+    grid: List[Tuple[int, int, int]],
+    repeat: int = 3,
+    only: Optional[List[str]] = None,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the selected benchmarks on every workload of the grid.
+    """
+    names = list(BENCHMARKS) if not only else only
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {unknown}. Available: {list(BENCHMARKS)}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_samples, n_features, k in grid:
+            workload = Workload(n_samples, n_features, k, workdir)
+            for name in names:
+                row = {"benchmark": name, "n_samples": n_samples, "n_features": n_features, "k": k}
+                row.update(measure(BENCHMARKS[name], workload, repeat=repeat))
+                results.append(row)
+                if verbose:
+                    n_iter = (row["metrics"] or {}).get("n_iter")
+                    print(
+                        f"{name:<28} n={n_samples:<9} d={n_features:<4} k={k:<4} "
+                        f"{row['wall_time_s']['min']:>9.4f} s "
+                        f"{row['peak_memory_bytes'] / 1024 ** 2:>10.1f} MiB"
+                        + (f" {n_iter:>5d} iter" if n_iter is not None else "")
+                    )
+    return {"metadata": _metadata(), "results": results}
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Ratios new / old of min wall time and peak memory for matching rows,
+    plus both iteration counts where recorded.
+    """
+    def key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+        return row["benchmark"], row["n_samples"], row["n_features"], row["k"]
+
+    old_rows = {key(row): row for row in old["results"]}
+    rows = []
+    for row in new["results"]:
+        before = old_rows.get(key(row))
+        if before is None:
+            continue
+        rows.append(
+            {
+                "benchmark": row["benchmark"],
+                "workload": key(row)[1:],
+                "time_ratio": row["wall_time_s"]["min"] / max(before["wall_time_s"]["min"], 1e-12),
+                "memory_ratio": row["peak_memory_bytes"] / max(before["peak_memory_bytes"], 1),
+                "n_iter": (
+                    (before.get("metrics") or {}).get("n_iter"),
+                    (row.get("metrics") or {}).get("n_iter"),
+                ),
+            }
+        )
+    return rows
+
+
+def main(args: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="run only these benchmarks")
+    parser.add_argument("--output", default="bench_output.json", help="JSON results file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two JSON files")
+    options = parser.parse_args(args)
+
+    if options.compare:
+        with open(options.compare[0], encoding="utf-8") as f:
+            old = json.load(f)
+        with open(options.compare[1], encoding="utf-8") as f:
+            new = json.load(f)
+        for row in compare(old, new):
+            n_iter_old, n_iter_new = row["n_iter"]
+            print(
+                f"{row['benchmark']:<28} {str(row['workload']):<20} "
+                f"time x{row['time_ratio']:.2f}  memory x{row['memory_ratio']:.2f}"
+                + (
+                    f"  iterations {n_iter_old} -> {n_iter_new}"
+                    if n_iter_old is not None and n_iter_new is not None
+                    else ""
+                )
+            )
+        return
+
+    report = run_suite(PRESETS[options.preset], repeat=options.repeat, only=options.only)
+    report["metadata"]["preset"] = options.preset
+    with open(options.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {options.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
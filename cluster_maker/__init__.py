@@ -15,35 +15,109 @@ Allowed libraries:
 - scikit-learn
 """
 
-# --- Data generation & basic analysis ---
-from .dataframe_builder import define_dataframe_structure, simulate_data
-from .data_analyser import calculate_descriptive_statistics, calculate_correlation
-from .data_exporter import export_to_csv, export_formatted
-
-# --- Preprocessing ---
-from .preprocessing import select_features, standardise_features
-
-# --- Clustering algorithms ---
-from .algorithms import (
-    kmeans,
-    sklearn_kmeans,
-    init_centroids,
-    assign_clusters,
-    update_centroids,
-)
-
-# --- Evaluation ---
-from .evaluation import (
-    compute_inertia,
-    silhouette_score_sklearn,
-    elbow_curve,
-)
-
-# --- Plotting ---
-from .plotting_clustered import plot_clusters_2d, plot_elbow
-
-# --- High-level interface ---
-from .interface import run_clustering
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+# Public name -> submodule defining it. Submodules (and the heavy libraries
+# they use: pandas, matplotlib, scikit-learn) are only imported when one of
+# their names is first accessed (PEP 562), so `import cluster_maker` is cheap.
+_LAZY_ATTRIBUTES = {
+    # --- Data generation & basic analysis ---
+    "define_dataframe_structure": "dataframe_builder",
+    "simulate_data": "dataframe_builder",
+    "calculate_descriptive_statistics": "data_analyser",
+    "calculate_correlation": "data_analyser",
+    "StreamingStatistics": "data_analyser",
+    "streaming_statistics": "data_analyser",
+    "export_to_csv": "data_exporter",
+    "export_formatted": "data_exporter",
+    # --- Preprocessing ---
+    "select_features": "preprocessing",
+    "standardise_features": "preprocessing",
+    "StreamingStandardiser": "preprocessing",
+    # --- Clustering algorithms ---
+    "kmeans": "algorithms",
+    "sklearn_kmeans": "algorithms",
+    "bisecting_kmeans": "algorithms",
+    "init_centroids": "algorithms",
+    "assign_clusters": "algorithms",
+    "update_centroids": "algorithms",
+    # --- Evaluation ---
+    "compute_inertia": "evaluation",
+    "silhouette_score_sklearn": "evaluation",
+    "elbow_curve": "evaluation",
+    # --- Plotting ---
+    "plot_clusters_2d": "plotting_clustered",
+    "plot_elbow": "plotting_clustered",
+    # --- High-level interface ---
+    "run_clustering": "interface",
+    "run_batch": "batch",
+    # --- Fitted model ---
+    "KMeansModel": "model",
+    "save_model": "persistence",
+    "load_model": "persistence",
+}
+
+# Submodules that can be reached as attributes, e.g. cluster_maker.distances.
+_SUBMODULES = {
+    "algorithms",
+    "batch",
+    "cache",
+    "data_analyser",
+    "data_exporter",
+    "data_loader",
+    "dataframe_builder",
+    "distances",
+    "evaluation",
+    "interface",
+    "model",
+    "persistence",
+    "plotting_clustered",
+    "preprocessing",
+    "profiling",
+    "sampling",
+}
+
+if TYPE_CHECKING:  # pragma: no cover - for static analysis only
+    from .dataframe_builder import define_dataframe_structure, simulate_data
+    from .data_analyser import (
+        calculate_descriptive_statistics,
+        calculate_correlation,
+        StreamingStatistics,
+        streaming_statistics,
+    )
+    from .data_exporter import export_to_csv, export_formatted
+    from .preprocessing import select_features, standardise_features, StreamingStandardiser
+    from .algorithms import (
+        kmeans,
+        sklearn_kmeans,
+        bisecting_kmeans,
+        init_centroids,
+        assign_clusters,
+        update_centroids,
+    )
+    from .evaluation import compute_inertia, silhouette_score_sklearn, elbow_curve
+    from .plotting_clustered import plot_clusters_2d, plot_elbow
+    from .interface import run_clustering
+    from .batch import run_batch
+    from .model import KMeansModel
+    from .persistence import save_model, load_model
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return import_module(f".{name}", __name__)
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    # Cache it so that __getattr__ is not called again for this name.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _SUBMODULES)
 
 
 __all__ = [
@@ -54,6 +128,8 @@ __all__ = [
     # Analysis
     "calculate_descriptive_statistics",
     "calculate_correlation",
+    "StreamingStatistics",
+    "streaming_statistics",
 
     # Export
     "export_to_csv",
@@ -62,10 +138,12 @@ __all__ = [
     # Preprocessing
     "select_features",
     "standardise_features",
+    "StreamingStandardiser",
 
     # Algorithms
     "kmeans",
     "sklearn_kmeans",
+    "bisecting_kmeans",
     "init_centroids",
     "assign_clusters",
     "update_centroids",
@@ -81,4 +159,10 @@ __all__ = [
 
     # High-level orchestration
     "run_clustering",
+    "run_batch",
+
+    # Fitted model
+    "KMeansModel",
+    "save_model",
+    "load_model",
 ]
\ No newline at end of file
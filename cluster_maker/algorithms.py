@@ -6,19 +6,167 @@
 
 from __future__ import annotations
 
-from typing import Tuple, Optional
+import heapq
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Optional, Union
 
 import numpy as np
-from sklearn.cluster import KMeans
+
+from .distances import (
+    allocate_workspace,
+    chunk_rows,
+    iter_chunks,
+    labelled_sq_distances_sum,
+    nearest_centroid,
+    pairwise_sq_distances,
+    resolve_dtype,
+    squared_norms,
+)
+
+
+def _kmeans_plusplus(
+    X: np.ndarray,
+    k: int,
+    rng: np.random.RandomState,
+    n_local_trials: Optional[int] = None,
+    sample_weight: Optional[np.ndarray] = None,
+    memory_budget: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Greedy k-means++ seeding, optionally with sample weights.
+
+    Each new centre is the best (lowest resulting potential) of
+    `n_local_trials` candidates drawn with probability proportional to
+    weight * D(x)^2, where D(x) is the distance to the closest centre so far.
+    """
+    n_samples, n_features = X.shape
+    if n_local_trials is None:
+        n_local_trials = 2 + int(np.log(k))
+    if sample_weight is None:
+        sample_weight = np.ones(n_samples)
+    rows = chunk_rows(n_samples, n_local_trials, X.itemsize, memory_budget)
+
+    centers = np.empty((k, n_features), dtype=float)
+    first = rng.choice(n_samples, p=sample_weight / sample_weight.sum())
+    centers[0] = X[first]
+    _, closest = nearest_centroid(X, centers[:1], memory_budget=memory_budget)
+    closest = closest.astype(float)
+
+    for c in range(1, k):
+        weighted = np.cumsum(sample_weight * closest)
+        rand_vals = rng.random_sample(n_local_trials) * weighted[-1]
+        candidates = np.searchsorted(weighted, rand_vals)
+        np.clip(candidates, 0, n_samples - 1, out=candidates)
+        X_candidates = X[candidates]
+
+        # Potential obtained with each candidate, accumulated tile by tile.
+        potentials = np.zeros(n_local_trials)
+        for sl in iter_chunks(n_samples, rows):
+            d = pairwise_sq_distances(X[sl], X_candidates)
+            np.minimum(d, closest[sl, np.newaxis], out=d)
+            potentials += sample_weight[sl] @ d
+        best = int(np.argmin(potentials))
+
+        centers[c] = X[candidates[best]]
+        _, d_best = nearest_centroid(X, centers[c:c + 1], memory_budget=memory_budget)
+        np.minimum(closest, d_best, out=closest)
+
+    return centers
+
+
+def _kmeans_parallel(
+    X: np.ndarray,
+    k: int,
+    rng: np.random.RandomState,
+    oversampling_factor: float = 2.0,
+    n_rounds: int = 5,
+    memory_budget: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Scalable k-means|| seeding (Bahmani et al., 2012).
+
+    A few passes over X each sample about `oversampling_factor * k` points
+    with probability proportional to D(x)^2. The resulting candidates are
+    weighted by the number of points closest to them and reduced to k
+    centres with weighted k-means++, which only touches the candidates.
+    """
+    n_samples = X.shape[0]
+    centers = [X[rng.randint(n_samples)][np.newaxis, :]]
+    _, closest = nearest_centroid(X, centers[0], memory_budget=memory_budget)
+    closest = closest.astype(float)
+    ell = oversampling_factor * k
+
+    for _ in range(n_rounds):
+        phi = closest.sum()
+        if phi <= 0.0:
+            break
+        chosen = np.flatnonzero(rng.random_sample(n_samples) < ell * closest / phi)
+        if chosen.size == 0:
+            continue
+        new_centers = X[chosen]
+        centers.append(new_centers)
+        _, d_new = nearest_centroid(X, new_centers, memory_budget=memory_budget)
+        np.minimum(closest, d_new, out=closest)
+
+    candidates = np.vstack(centers)
+    if candidates.shape[0] < k:
+        # Too few distinct candidates (e.g. heavily duplicated data): top up
+        # with uniformly sampled points.
+        extra = rng.choice(n_samples, size=k - candidates.shape[0], replace=False)
+        candidates = np.vstack([candidates, X[extra]])
+
+    owner = assign_clusters(X, candidates, memory_budget=memory_budget)
+    weights = np.bincount(owner, minlength=candidates.shape[0]).astype(float)
+    # Duplicated candidates own no points; keep a tiny weight so that the
+    # sampling probabilities stay well defined.
+    weights[weights == 0.0] = 1e-12
+    return _kmeans_plusplus(candidates, k, rng, sample_weight=weights)
+
+
+_INIT_METHODS = ("random", "k-means++", "k-means||")
 
 
 def init_centroids(
     X: np.ndarray,
     k: int,
-    random_state: Optional[int] = None,
+    random_state: Union[None, int, np.random.RandomState] = None,
+    init: Union[str, np.ndarray] = "random",
+    n_local_trials: Optional[int] = None,
+    oversampling_factor: float = 2.0,
+    n_rounds: int = 5,
+    memory_budget: Optional[int] = None,
 ) -> np.ndarray:
     """
-    Initialise centroids by randomly sampling points from X without replacement.
+    Initialise centroids.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    k : int
+        Number of clusters.
+    random_state : int, RandomState or None
+    init : {"random", "k-means++", "k-means||"} or ndarray, default "random"
+        - "random": sample k points from X without replacement.
+        - "k-means++": greedy k-means++ seeding (k passes over X).
+        - "k-means||": scalable k-means|| seeding, which needs only
+          `n_rounds` + 2 passes over X and suits large n.
+        - ndarray of shape (k, n_features): use these centroids (a copy is
+          returned), e.g. to warm-start from a previous solution.
+    n_local_trials : int or None
+        Candidates tried per centre by k-means++; default 2 + log(k).
+    oversampling_factor : float, default 2.0
+        Expected number of candidates sampled per round by k-means||,
+        as a multiple of k.
+    n_rounds : int, default 5
+        Number of sampling rounds of k-means||.
+    memory_budget : int or None
+        Budget in bytes for the per-tile distance block.
+
+    Returns
+    -------
+    centroids : ndarray of shape (k, n_features)
     """
     if k <= 0:
         raise ValueError("k must be a positive integer.")
@@ -26,60 +174,528 @@ def init_centroids(
     if k > n_samples:
         raise ValueError("k cannot be larger than the number of samples.")
 
-    rng = np.random.RandomState(random_state)
+    if isinstance(init, np.ndarray):
+        if init.shape != (k, X.shape[1]):
+            raise ValueError(
+                f"Initial centroids must have shape {(k, X.shape[1])}, got {init.shape}."
+            )
+        return np.array(init, dtype=float)
+    if init not in _INIT_METHODS:
+        raise ValueError(
+            f"Unknown init '{init}'. Use 'random', 'k-means++', 'k-means||' or an array."
+        )
+
+    rng = _check_random_state(random_state)
+    if init == "k-means++":
+        return _kmeans_plusplus(X, k, rng, n_local_trials=n_local_trials, memory_budget=memory_budget)
+    if init == "k-means||":
+        return _kmeans_parallel(
+            X,
+            k,
+            rng,
+            oversampling_factor=oversampling_factor,
+            n_rounds=n_rounds,
+            memory_budget=memory_budget,
+        )
     indices = rng.choice(n_samples, size=k, replace=False)
     return X[indices]
 
 
-def assign_clusters(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+def assign_clusters(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    dtype: Any = None,
+) -> np.ndarray:
     """
     Assign each sample to the nearest centroid (Euclidean distance).
+
+    Distances are computed tile by tile through the distance engine in
+    `cluster_maker.distances`, so memory use is bounded by `memory_budget`
+    instead of growing with n_samples * k * n_features.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    centroids : ndarray of shape (k, n_features)
+    memory_budget : int or None
+        Budget in bytes for the per-tile distance block.
+    out : ndarray of shape (n_samples,) or None
+        Preallocated integer buffer for the labels.
+    dtype : {"float32", "float64"} or None
+        Dtype of the distance computations; defaults to that of X
+        (float64 for non-float X). Tiles of X are cast as needed.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
     """
-    # X: (n_samples, n_features)
-    # centroids: (k, n_features)
-    # Broadcast to compute distances
-    diff = X[:, np.newaxis, :] - centroids[np.newaxis, :, :]
-    distances = np.linalg.norm(diff, axis=2)  # (n_samples, k)
-    labels = np.argmin(distances, axis=1)
+    labels, _ = nearest_centroid(
+        X, centroids, memory_budget=memory_budget, labels_out=out, dtype=dtype
+    )
     return labels
 
 
+def _check_random_state(
+    random_state: Union[None, int, np.random.RandomState],
+) -> np.random.RandomState:
+    """
+    Turn a seed (or None) into a RandomState; pass RandomState instances through.
+    """
+    if isinstance(random_state, np.random.RandomState):
+        return random_state
+    return np.random.RandomState(random_state)
+
+
+def _cluster_sums(
+    X: np.ndarray,
+    labels: np.ndarray,
+    k: int,
+    out: Optional[np.ndarray] = None,
+    memory_budget: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-cluster sums of the rows of X and per-cluster counts.
+
+    All clusters are aggregated together: one bincount over the labels per
+    feature, with sums accumulated in float64 whatever the dtype of X,
+    instead of one boolean mask over X per cluster. Rows are read in chunks,
+    so only one chunk of one column is converted to float64 at a time.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    k : int
+    out : ndarray of shape (k, n_features) or None
+        Preallocated buffer for the sums.
+    memory_budget : int or None
+        Budget in bytes for the float64 copy of one column chunk.
+
+    Returns
+    -------
+    sums : ndarray of shape (k, n_features)
+    counts : ndarray of shape (k,)
+    """
+    n_samples, n_features = X.shape
+    counts = np.zeros(k, dtype=np.intp)
+    if out is None:
+        out = np.empty((k, n_features), dtype=float)
+    out[...] = 0.0
+    rows = chunk_rows(n_samples, 1, 8, memory_budget)
+    for sl in iter_chunks(n_samples, rows):
+        block_labels = labels[sl]
+        counts += np.bincount(block_labels, minlength=k)
+        for j in range(n_features):
+            out[:, j] += np.bincount(block_labels, weights=X[sl, j], minlength=k)
+    return out, counts
+
+
 def update_centroids(
     X: np.ndarray,
     labels: np.ndarray,
     k: int,
-    random_state: Optional[int] = None,
+    random_state: Union[None, int, np.random.RandomState] = None,
+    out: Optional[np.ndarray] = None,
+    dtype: Any = None,
+    memory_budget: Optional[int] = None,
 ) -> np.ndarray:
     """
     Update centroids by taking the mean of points in each cluster.
     If a cluster becomes empty, re-initialise its centroid randomly from X.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    k : int
+        Number of clusters.
+    random_state : int, RandomState or None
+        Used only for empty clusters. Pass the same RandomState across
+        iterations so that successive re-initialisations draw different
+        points; a seed creates a fresh generator on every call.
+    out : ndarray of shape (k, n_features) or None
+        Preallocated buffer for the new centroids. Must not alias X.
+    dtype : {"float32", "float64"} or None
+        Dtype of the returned centroids when `out` is None (default
+        float64). The sums are accumulated in float64 either way.
+    memory_budget : int or None
+        Budget in bytes for the temporaries of one chunk of rows.
+
+    Returns
+    -------
+    new_centroids : ndarray of shape (k, n_features)
     """
-    n_features = X.shape[1]
-    new_centroids = np.zeros((k, n_features), dtype=float)
-    rng = np.random.RandomState(random_state)
+    new_centroids, counts = _cluster_sums(X, labels, k, out=out, memory_budget=memory_budget)
+    filled = counts > 0
+    new_centroids[filled] /= counts[filled, np.newaxis]
 
-    for cluster_id in range(k):
-        mask = labels == cluster_id
-        if not np.any(mask):
-            # Empty cluster: re-initialise randomly
+    empty = np.flatnonzero(~filled)
+    if empty.size:
+        # Empty cluster: re-initialise randomly
+        rng = _check_random_state(random_state)
+        for cluster_id in empty:
             idx = rng.randint(0, X.shape[0])
             new_centroids[cluster_id] = X[idx]
-        else:
-            new_centroids[cluster_id] = X[mask].mean(axis=0)
 
+    if out is None and dtype is not None:
+        new_centroids = new_centroids.astype(resolve_dtype(X, dtype), copy=False)
     return new_centroids
 
 
+_KMEANS_ALGORITHMS = ("lloyd", "hamerly", "elkan")
+
+
+def _resolve_algorithm(algorithm: str, k: int) -> str:
+    """
+    Map the `algorithm` argument of `kmeans` to a concrete iteration scheme.
+    """
+    if algorithm == "auto":
+        # Elkan skips more distances than Hamerly, but its per-candidate
+        # bookkeeping costs more than they save: it is the slowest of the
+        # three at every k measured (see the kmeans[...] benchmarks).
+        return "hamerly"
+    if algorithm not in _KMEANS_ALGORITHMS:
+        raise ValueError(
+            f"Unknown algorithm '{algorithm}'. "
+            "Use 'lloyd', 'hamerly', 'elkan' or 'auto'."
+        )
+    return algorithm
+
+
+def _row_distances(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    Exact Euclidean distance between each row of X and the matching row of
+    `centroids` (both of shape (m, n_features)).
+    """
+    diff = X - centroids
+    return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+
+def _centroid_separation(centroids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise centroid distances and half the distance from each centroid to
+    its closest other centroid.
+    """
+    cc = np.sqrt(pairwise_sq_distances(centroids, centroids))
+    np.fill_diagonal(cc, np.inf)
+    half_min = 0.5 * cc.min(axis=1)
+    np.fill_diagonal(cc, 0.0)
+    return cc, half_min
+
+
+def _elkan_pairs(
+    upper: np.ndarray,
+    lower: np.ndarray,
+    cc: np.ndarray,
+    own: np.ndarray,
+) -> np.ndarray:
+    """
+    Boolean (m, k) mask of the (sample, centroid) distances that Elkan's
+    bounds cannot rule out for m samples currently assigned to `own`.
+    """
+    u = upper[:, np.newaxis]
+    mask = (u > lower) & (u > 0.5 * cc[own])
+    mask[np.arange(own.size), own] = False
+    return mask
+
+
+def _record_iteration(
+    history: List[Dict[str, Any]],
+    iteration: int,
+    start: float,
+    shift: float,
+    inertia: float,
+) -> None:
+    """
+    Append the statistics of one K-means iteration to `history`.
+    """
+    history.append(
+        {
+            "iteration": iteration,
+            "time_s": time.perf_counter() - start,
+            "shift": float(shift),
+            "inertia": inertia,
+        }
+    )
+
+
+def _lloyd_iterations(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    max_iter: int,
+    tol: float,
+    rng: np.random.RandomState,
+    memory_budget: Optional[int],
+    history: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Plain Lloyd iterations: every point-to-centroid distance is recomputed
+    on every iteration.
+    """
+    n_samples = X.shape[0]
+    k = centroids.shape[0]
+    labels = np.empty(n_samples, dtype=np.intp)
+    workspace = allocate_workspace(n_samples, k, X.dtype, memory_budget)
+    min_sq_dist = np.empty(workspace.shape[0], dtype=X.dtype)
+    # The squared norms of X are kept across iterations only if they fit in
+    # the budget; otherwise each tile recomputes its own.
+    x_sq_norms = None
+    if chunk_rows(n_samples, 1, X.itemsize, memory_budget) == n_samples:
+        x_sq_norms = squared_norms(X, memory_budget=memory_budget)
+
+    def _assign(centroids: np.ndarray) -> float:
+        # Tile by tile, so that the distances of a tile are dropped once
+        # summed.
+        inertia = 0.0
+        for sl in iter_chunks(n_samples, workspace.shape[0]):
+            _, tile_sq_dist = nearest_centroid(
+                X[sl],
+                centroids,
+                x_sq_norms=None if x_sq_norms is None else x_sq_norms[sl],
+                labels_out=labels[sl],
+                distances_out=min_sq_dist[: sl.stop - sl.start],
+                workspace=workspace,
+            )
+            inertia += float(tile_sq_dist.sum(dtype=np.float64))
+        return inertia
+
+    # Two centroid buffers, swapped every iteration.
+    spare = np.empty_like(centroids)
+    n_iter = 0
+    for _ in range(max_iter):
+        n_iter += 1
+        start = time.perf_counter()
+        inertia = _assign(centroids)
+        new_centroids = update_centroids(
+            X, labels, k, random_state=rng, out=spare, memory_budget=memory_budget
+        )
+        shift = np.linalg.norm(new_centroids - centroids)
+        spare, centroids = centroids, new_centroids
+        if history is not None:
+            _record_iteration(history, n_iter, start, shift, inertia)
+        if shift < tol:
+            break
+
+    _assign(centroids)
+    info = {"n_iter": n_iter, "distance_evaluations": (n_iter + 1) * n_samples * k}
+    return labels, centroids, info
+
+
+def _hamerly_iterations(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    max_iter: int,
+    tol: float,
+    rng: np.random.RandomState,
+    memory_budget: Optional[int],
+    history: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Hamerly's accelerated iterations.
+
+    Each sample keeps an upper bound on the distance to its own centroid and
+    a single lower bound on the distance to every other centroid. Only the
+    samples whose bounds overlap are re-examined after a centroid update.
+    Distances are computed in the dtype of X, as by Lloyd.
+    """
+    n_samples = X.shape[0]
+    k = centroids.shape[0]
+    rows = chunk_rows(n_samples, k, X.itemsize, memory_budget)
+
+    def _full_assign(idx: np.ndarray, centroids: np.ndarray) -> None:
+        # Exact nearest and second-nearest distances for the samples in idx.
+        for sl in iter_chunks(idx.size, rows):
+            sub = idx[sl]
+            dist = np.sqrt(pairwise_sq_distances(X[sub], centroids))
+            best = np.argmin(dist, axis=1)
+            labels[sub] = best
+            upper[sub] = dist[np.arange(sub.size), best]
+            if k > 1:
+                dist[np.arange(sub.size), best] = np.inf
+                lower[sub] = dist.min(axis=1)
+
+    labels = np.empty(n_samples, dtype=np.intp)
+    upper = np.empty(n_samples, dtype=float)
+    lower = np.full(n_samples, np.inf)
+    _full_assign(np.arange(n_samples), centroids.astype(X.dtype, copy=False))
+    evaluations = n_samples * k
+
+    # Two centroid buffers, swapped every iteration.
+    spare = np.empty_like(centroids)
+    n_iter = 0
+    for _ in range(max_iter):
+        n_iter += 1
+        start = time.perf_counter()
+        if history is not None:
+            # Inertia of the current assignment, as recorded by Lloyd.
+            inertia = labelled_sq_distances_sum(X, labels, centroids, memory_budget=memory_budget)
+        new_centroids = update_centroids(
+            X, labels, k, random_state=rng, out=spare, memory_budget=memory_budget
+        )
+        deltas = _row_distances(new_centroids, centroids)
+        shift = np.linalg.norm(new_centroids - centroids)
+        spare, centroids = centroids, new_centroids
+
+        # Move the bounds by how far the centroids moved. The lower bound of
+        # a sample drops by the largest shift among the *other* centroids.
+        upper += deltas[labels]
+        if k > 1:
+            order = np.argsort(deltas)
+            largest, second = deltas[order[-1]], deltas[order[-2]]
+            lower -= np.where(labels == order[-1], second, largest)
+
+        _, half_min = _centroid_separation(centroids)
+        bound = np.maximum(half_min[labels], lower)
+        candidates = np.flatnonzero(upper > bound)
+        if candidates.size:
+            compute = centroids.astype(X.dtype, copy=False)
+            # Tighten the upper bound before paying for a full search.
+            upper[candidates] = _row_distances(X[candidates], compute[labels[candidates]])
+            evaluations += candidates.size
+            candidates = candidates[upper[candidates] > bound[candidates]]
+            _full_assign(candidates, compute)
+            evaluations += candidates.size * k
+
+        if history is not None:
+            _record_iteration(history, n_iter, start, shift, inertia)
+        if shift < tol:
+            break
+
+    info = {"n_iter": n_iter, "distance_evaluations": evaluations}
+    return labels, centroids, info
+
+
+def _elkan_iterations(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    max_iter: int,
+    tol: float,
+    rng: np.random.RandomState,
+    memory_budget: Optional[int],
+    history: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Elkan's accelerated iterations.
+
+    Each sample keeps an upper bound on the distance to its own centroid and
+    one lower bound per centroid, so an (n_samples, k) array of bounds is
+    held in memory. Together with the inter-centroid distances these prune
+    most individual point-to-centroid distances. Distances are computed in
+    the dtype of X, as by Lloyd.
+    """
+    n_samples, n_features = X.shape
+    k = centroids.shape[0]
+
+    labels = np.empty(n_samples, dtype=np.intp)
+    upper = np.empty(n_samples, dtype=float)
+    lower = np.empty((n_samples, k), dtype=float)
+    rows = chunk_rows(n_samples, k, X.itemsize, memory_budget)
+    compute = centroids.astype(X.dtype, copy=False)
+    for sl in iter_chunks(n_samples, rows):
+        dist = np.sqrt(pairwise_sq_distances(X[sl], compute))
+        lower[sl] = dist
+        labels[sl] = np.argmin(dist, axis=1)
+        upper[sl] = dist[np.arange(dist.shape[0]), labels[sl]]
+    evaluations = n_samples * k
+
+    # Rows of candidates examined together; each may gather up to k rows of X.
+    pair_rows = chunk_rows(n_samples, k * n_features, X.itemsize, memory_budget)
+
+    # Two centroid buffers, swapped every iteration.
+    spare = np.empty_like(centroids)
+    n_iter = 0
+    for _ in range(max_iter):
+        n_iter += 1
+        start = time.perf_counter()
+        if history is not None:
+            # Inertia of the current assignment, as recorded by Lloyd.
+            inertia = labelled_sq_distances_sum(X, labels, centroids, memory_budget=memory_budget)
+        new_centroids = update_centroids(
+            X, labels, k, random_state=rng, out=spare, memory_budget=memory_budget
+        )
+        deltas = _row_distances(new_centroids, centroids)
+        shift = np.linalg.norm(new_centroids - centroids)
+        spare, centroids = centroids, new_centroids
+
+        lower -= deltas[np.newaxis, :]
+        np.maximum(lower, 0.0, out=lower)
+        upper += deltas[labels]
+
+        cc, half_min = _centroid_separation(centroids)
+        compute = centroids.astype(X.dtype, copy=False)
+        candidates = np.flatnonzero(upper > half_min[labels])
+        for sl in iter_chunks(candidates.size, pair_rows):
+            idx = candidates[sl]
+            own = labels[idx]
+            mask = _elkan_pairs(upper[idx], lower[idx], cc, own)
+            keep = mask.any(axis=1)
+            if not np.any(keep):
+                continue
+            idx, own = idx[keep], own[keep]
+            local = np.arange(idx.size)
+
+            # Tighten the upper bound, then re-prune with the exact value.
+            u = _row_distances(X[idx], compute[own])
+            evaluations += idx.size
+            lower[idx, own] = u
+            mask = _elkan_pairs(u, lower[idx], cc, own)
+
+            r, c = np.nonzero(mask)
+            d = _row_distances(X[idx[r]], compute[c])
+            evaluations += r.size
+            lower[idx[r], c] = d
+
+            dist = np.full((idx.size, k), np.inf)
+            dist[r, c] = d
+            dist[local, own] = u
+            best = np.argmin(dist, axis=1)
+            labels[idx] = best
+            upper[idx] = dist[local, best]
+
+        if history is not None:
+            _record_iteration(history, n_iter, start, shift, inertia)
+        if shift < tol:
+            break
+
+    info = {"n_iter": n_iter, "distance_evaluations": evaluations}
+    return labels, centroids, info
+
+
+_ITERATIONS = {
+    "lloyd": _lloyd_iterations,
+    "hamerly": _hamerly_iterations,
+    "elkan": _elkan_iterations,
+}
+
+
 def kmeans(
     X: np.ndarray,
     k: int,
     max_iter: int = 300,
     tol: float = 1e-4,
     random_state: Optional[int] = None,
-) -> Tuple[np.ndarray, np.ndarray]:
+    memory_budget: Optional[int] = None,
+    algorithm: str = "lloyd",
+    return_info: bool = False,
+    init: Union[str, np.ndarray] = "random",
+    n_init: int = 1,
+    n_jobs: Optional[int] = None,
+    dtype: Any = None,
+) -> Union[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, Dict[str, Any]]]:
     """
     Simple manual K-means implementation.
 
+    With algorithm="lloyd" every point-to-centroid distance is recomputed on
+    every iteration, tile by tile; the label array, the squared norms of X
+    (if they fit in memory_budget) and the per-tile buffers are allocated
+    once and reused.
+    "hamerly" and "elkan" keep per-sample distance bounds and skip the
+    distances that cannot change an assignment. In float64 all three give
+    the same labels and centroids for a fixed random_state; in float32,
+    rounding can settle near-ties differently, so the fits may differ.
+
     Parameters
     ----------
     X : ndarray of shape (n_samples, n_features)
@@ -90,36 +706,678 @@ def kmeans(
     tol : float, default 1e-4
         Convergence tolerance on centroid movement.
     random_state : int or None
+    memory_budget : int or None
+        Budget in bytes for the per-tile distance block
+        (see `cluster_maker.distances`).
+    algorithm : {"lloyd", "hamerly", "elkan", "auto"}, default "lloyd"
+        Iteration scheme. "auto" uses Hamerly, the fastest of the three.
+        Elkan stores an (n_samples, k) array of lower bounds.
+    return_info : bool, default False
+        If True, also return a dict with "algorithm", "n_iter",
+        "distance_evaluations" and "distances_skipped" (relative to plain
+        Lloyd iterations), "inertia" and "history" for the returned run,
+        plus "n_init" and "inertias" (one per run). "history" has one dict
+        per iteration with "iteration", "time_s", "shift" (centroid
+        movement) and "inertia" (of the assignment made in that iteration).
+    init : {"random", "k-means++", "k-means||"} or ndarray, default "random"
+        Initialisation method, see `init_centroids`.
+    n_init : int, default 1
+        Number of runs with different initialisations; the run with the
+        lowest inertia is returned. The seed of each run is derived from
+        random_state only, so results do not depend on n_jobs. With a single
+        run random_state is used as is. Ignored when init is an array.
+    n_jobs : int or None, default None
+        Number of runs executed concurrently on a thread pool (None means 1,
+        -1 means all CPUs).
+    dtype : {"float32", "float64"} or None
+        Dtype in which X is held and distances are computed; defaults to
+        that of X (float64 for non-float X). X is converted (copied) only if
+        it has another dtype, so pass float32 data to halve memory use.
+        Centroids, centroid sums and inertias are kept in float64.
 
     Returns
     -------
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features)
+        Always float64.
+    info : dict
+        Only if return_info is True.
     """
     if not isinstance(X, np.ndarray):
         raise TypeError("X must be a NumPy array.")
+    X = X.astype(resolve_dtype(X, dtype), copy=False)
+    if n_init <= 0:
+        raise ValueError("n_init must be a positive integer.")
+    algorithm = _resolve_algorithm(algorithm, k)
 
-    centroids = init_centroids(X, k, random_state=random_state)
-    for _ in range(max_iter):
-        labels = assign_clusters(X, centroids)
-        new_centroids = update_centroids(X, labels, k, random_state=random_state)
-        shift = np.linalg.norm(new_centroids - centroids)
-        centroids = new_centroids
-        if shift < tol:
+    if n_init == 1 or isinstance(init, np.ndarray):
+        # Explicit centroids make every restart identical.
+        seeds: List[Any] = [random_state]
+    else:
+        # Per-restart seeds depend only on random_state, not on n_jobs.
+        seeds = list(
+            np.random.RandomState(random_state).randint(np.iinfo(np.int32).max, size=n_init)
+        )
+
+    def _run(seed: Any) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+        return _kmeans_single(
+            X, k, max_iter, tol, seed, memory_budget, algorithm, init, track_history=return_info
+        )
+
+    n_workers = min(effective_n_jobs(n_jobs), len(seeds))
+    if n_workers > 1:
+        # Threads share X without copying it, and the heavy NumPy work
+        # (matrix products, bincount) releases the GIL.
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            runs = list(pool.map(_run, seeds))
+    else:
+        runs = [_run(seed) for seed in seeds]
+
+    inertias = [info["inertia"] for _, _, info in runs]
+    best = int(np.argmin(inertias))
+    labels, centroids, info = runs[best]
+
+    if not return_info:
+        return labels, centroids
+    # Lloyd computes n_samples * k distances per assignment step, and every
+    # scheme performs n_iter + 1 assignment steps.
+    full_cost = (info["n_iter"] + 1) * X.shape[0] * k
+    info["algorithm"] = algorithm
+    info["distances_skipped"] = full_cost - info["distance_evaluations"]
+    info["n_init"] = len(seeds)
+    info["inertias"] = inertias
+    return labels, centroids, info
+
+
+def effective_n_jobs(n_jobs: Optional[int]) -> int:
+    """
+    Number of workers for n_jobs (None means 1, negative values count back
+    from the number of CPUs, so -1 means all of them).
+    """
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def _kmeans_single(
+    X: np.ndarray,
+    k: int,
+    max_iter: int,
+    tol: float,
+    random_state: Optional[int],
+    memory_budget: Optional[int],
+    algorithm: str,
+    init: Union[str, np.ndarray],
+    track_history: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    One K-means run (initialisation and iterations) for a single seed.
+    """
+    history: Optional[List[Dict[str, Any]]] = [] if track_history else None
+    centroids = init_centroids(
+        X, k, random_state=random_state, init=init, memory_budget=memory_budget
+    ).astype(float)
+    # A single generator for the whole run, so that repeated empty-cluster
+    # re-initialisations do not keep drawing the same point.
+    rng = np.random.RandomState(random_state)
+    labels, centroids, info = _ITERATIONS[algorithm](
+        X, centroids, max_iter, tol, rng, memory_budget, history
+    )
+    if history is not None:
+        info["history"] = history
+    info["inertia"] = labelled_sq_distances_sum(X, labels, centroids, memory_budget=memory_budget)
+    return labels, centroids, info
+
+
+def minibatch_update(
+    centroids: np.ndarray,
+    counts: np.ndarray,
+    X_batch: np.ndarray,
+    memory_budget: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Update centroids in place with one mini-batch (Sculley's rule).
+
+    Each centroid moves towards the mean of the batch points assigned to it
+    with a per-centroid learning rate of 1 / (points seen so far), so that a
+    centroid is always the running mean of every point ever assigned to it.
+
+    Parameters
+    ----------
+    centroids : ndarray of shape (k, n_features)
+        Modified in place.
+    counts : ndarray of shape (k,)
+        Number of points assigned to each centroid so far. Modified in place.
+    X_batch : ndarray of shape (batch_size, n_features)
+    memory_budget : int or None
+        Budget in bytes for the per-tile distance block.
+
+    Returns
+    -------
+    labels : ndarray of shape (batch_size,)
+        Assignments of the batch points used for the update.
+    """
+    k = centroids.shape[0]
+    labels = assign_clusters(X_batch, centroids, memory_budget=memory_budget)
+    sums, batch_counts = _cluster_sums(X_batch, labels, k)
+    counts += batch_counts
+    hit = batch_counts > 0
+    centroids[hit] += (
+        sums[hit] - batch_counts[hit, np.newaxis] * centroids[hit]
+    ) / counts[hit, np.newaxis]
+    return labels
+
+
+def minibatch_kmeans(
+    batches: Callable[[], Iterable[np.ndarray]],
+    k: int,
+    n_epochs: int = 3,
+    tol: float = 1e-4,
+    random_state: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mini-batch K-means over a re-iterable stream of batches.
+
+    Only one batch is held in memory at a time, so the cost in memory is
+    bounded by the batch size rather than by the size of the data set.
+
+    Parameters
+    ----------
+    batches : callable
+        Called once per epoch; must return an iterable of arrays of shape
+        (batch_size, n_features), e.g. successive chunks of a file.
+    k : int
+        Number of clusters.
+    n_epochs : int, default 3
+        Maximum number of passes over the stream.
+    tol : float, default 1e-4
+        Stop early when the centroids move less than this over one epoch.
+    random_state : int or None
+        Seed for the initial centroids, drawn from the first batch.
+    memory_budget : int or None
+        Budget in bytes for the per-tile distance block.
+
+    Returns
+    -------
+    centroids : ndarray of shape (k, n_features)
+    counts : ndarray of shape (k,)
+        Number of points assigned to each centroid during the last epoch.
+    """
+    if n_epochs <= 0:
+        raise ValueError("n_epochs must be a positive integer.")
+
+    centroids: Optional[np.ndarray] = None
+    counts = np.zeros(k, dtype=np.int64)
+    for _ in range(n_epochs):
+        previous = None if centroids is None else centroids.copy()
+        # Restart the learning rates each epoch so that later epochs can
+        # still correct the centroids.
+        counts[:] = 0
+        for X_batch in batches():
+            if X_batch.shape[0] == 0:
+                continue
+            if centroids is None:
+                if X_batch.shape[0] < k:
+                    raise ValueError(
+                        "The first batch must contain at least k samples; "
+                        "use a larger chunk size."
+                    )
+                centroids = init_centroids(X_batch, k, random_state=random_state).astype(float)
+            minibatch_update(centroids, counts, X_batch, memory_budget=memory_budget)
+        if centroids is None:
+            raise ValueError("The batch stream is empty.")
+        if previous is not None and np.linalg.norm(centroids - previous) < tol:
             break
 
-    labels = assign_clusters(X, centroids)
-    return labels, centroids
+    return centroids, counts
+
+
+REFIT_METHODS = ("online", "refine")
+
+
+def incremental_kmeans(
+    centroids: np.ndarray,
+    counts: np.ndarray,
+    X_new: np.ndarray,
+    X: Optional[np.ndarray] = None,
+    method: str = "online",
+    batch_size: int = 1024,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    memory_budget: Optional[int] = None,
+    algorithm: str = "lloyd",
+    return_info: bool = False,
+    random_state: Optional[int] = None,
+) -> Union[
+    Tuple[np.ndarray, np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]],
+]:
+    """
+    Update a fitted K-means solution with new (e.g. appended) rows.
+
+    Parameters
+    ----------
+    centroids : ndarray of shape (k, n_features)
+        Previously fitted centroids (not modified).
+    counts : ndarray of shape (k,)
+        Number of points previously assigned to each centroid.
+    X_new : ndarray of shape (n_new, n_features)
+        The rows added since the previous fit.
+    X : ndarray of shape (n_samples, n_features) or None
+        All rows, old and new. Required by method="refine"; with "online"
+        it is only used to label every row with the updated centroids.
+    method : {"online", "refine"}, default "online"
+        - "online": mini-batch updates with the new rows only (see
+          `minibatch_update`), continuing the per-centroid learning rates
+          from `counts`, so each centroid stays the running mean of the
+          points assigned to it. Costs one pass over X_new.
+        - "refine": K-means iterations over X warm-started from
+          `centroids`. This takes fewer iterations than a cold fit, by how
+          many depends on how much the new rows move the clusters (from a
+          handful for a few percent more rows of well-separated clusters,
+          to a sizeable fraction of a cold fit otherwise); max_iter caps it.
+    batch_size : int, default 1024
+        Rows per mini-batch for "online".
+    max_iter, tol, algorithm : see `kmeans` (used by "refine").
+    memory_budget : int or None
+        Budget in bytes for the per-tile distance block.
+    return_info : bool, default False
+        If True, also return a dict with "method", "n_new" and, for
+        "refine", the `kmeans` info (including "n_iter").
+    random_state : int or None
+        Seeds the re-initialisation of clusters that become empty during
+        "refine".
+
+    Returns
+    -------
+    labels : ndarray
+        Labels of X if given, else of X_new, for the updated centroids.
+    centroids : ndarray of shape (k, n_features)
+    counts : ndarray of shape (k,)
+        Points per centroid: the accumulated counts for "online", the
+        cluster sizes in X for "refine".
+    info : dict
+        Only if return_info is True.
+    """
+    if method not in REFIT_METHODS:
+        raise ValueError(f"Unknown refit method '{method}'. Use 'online' or 'refine'.")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer.")
+    centroids = np.array(centroids, dtype=np.float64)
+    counts = np.array(counts, dtype=np.int64)
+    k = centroids.shape[0]
+    if counts.shape != (k,):
+        raise ValueError(f"counts must have shape ({k},).")
+    if X_new.ndim != 2 or X_new.shape[1] != centroids.shape[1]:
+        raise ValueError(f"X_new must have {centroids.shape[1]} features.")
+    info: Dict[str, Any] = {"method": method, "n_new": int(X_new.shape[0])}
+
+    if method == "refine":
+        if X is None:
+            raise ValueError("method='refine' needs the full data X.")
+        labels, centroids, fit_info = kmeans(
+            X,
+            k,
+            max_iter=max_iter,
+            tol=tol,
+            memory_budget=memory_budget,
+            algorithm=algorithm,
+            init=centroids,
+            random_state=random_state,
+            return_info=True,
+        )
+        info.update(fit_info)
+        counts = np.bincount(labels, minlength=k).astype(np.int64)
+    else:
+        for sl in iter_chunks(X_new.shape[0], batch_size):
+            minibatch_update(centroids, counts, X_new[sl], memory_budget=memory_budget)
+        target = X_new if X is None else X
+        labels = assign_clusters(target, centroids, memory_budget=memory_budget)
+
+    if return_info:
+        return labels, centroids, counts, info
+    return labels, centroids, counts
+
+
+def _right_of(block: np.ndarray, w: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Whether each row of block is strictly closer to the right than to the
+    left centroid of its node, given the node hyperplanes w = c_right -
+    c_left and b = (||c_right||^2 - ||c_left||^2) / 2 (one row each).
+    """
+    return np.einsum("ij,ij->i", block, w) > b
+
+
+class ClusterTree:
+    """
+    Binary tree of the clusters made by `bisecting_kmeans`.
+
+    Node 0 holds the whole data set, and split s (s = 1, 2, ...) adds nodes
+    2s - 1 and 2s, the two halves of the node it splits. The left half keeps
+    the label of its parent and the right half takes label s, so the first
+    m - 1 splits give the clustering into m clusters, for any m up to
+    n_clusters.
+
+    A point is assigned by descending from the root to the nearer child at
+    each node, which costs O(depth * n_features) instead of the
+    O(k * n_features) of a flat nearest-centroid search. This reproduces
+    the labels of the bisecting fit, which partitions each node between its
+    two children; it is not a nearest-centroid assignment, and for large k
+    many points end in a leaf whose centroid is not their nearest (use
+    `assign_clusters` with the leaf centroids for that).
+
+    Attributes
+    ----------
+    centroids : ndarray of shape (n_nodes, n_features)
+        Mean of the points of each node (float64).
+    children : ndarray of shape (n_nodes, 2)
+        Left and right child of each node, -1 for leaves.
+    labels : ndarray of shape (n_nodes,)
+        Cluster label of each node.
+    sse : ndarray of shape (n_nodes,)
+        Sum of squared distances of the points of each node to its centroid.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        children: np.ndarray,
+        labels: np.ndarray,
+        sse: np.ndarray,
+    ) -> None:
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.children = np.asarray(children, dtype=np.int64)
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self.sse = np.asarray(sse, dtype=np.float64)
+        left, right = self.centroids[self.children[:, 0]], self.centroids[self.children[:, 1]]
+        internal = self.children[:, 0] >= 0
+        # Separating hyperplane of the two children of each internal node.
+        self._w = np.where(internal[:, np.newaxis], right - left, 0.0)
+        self._b = np.where(
+            internal,
+            0.5 * (np.einsum("ij,ij->i", right, right) - np.einsum("ij,ij->i", left, left)),
+            0.0,
+        )
+
+    @property
+    def n_clusters(self) -> int:
+        return (self.centroids.shape[0] + 1) // 2
+
+    def _check_n_clusters(self, n_clusters: Optional[int]) -> int:
+        if n_clusters is None:
+            return self.n_clusters
+        if not 1 <= n_clusters <= self.n_clusters:
+            raise ValueError(f"n_clusters must be between 1 and {self.n_clusters}.")
+        return n_clusters
+
+    def _is_split(self, n_clusters: int) -> np.ndarray:
+        # Nodes split within the first n_clusters - 1 splits.
+        first_child = self.children[:, 0]
+        return (first_child >= 0) & (first_child <= 2 * (n_clusters - 1))
+
+    def leaf_centroids(self, n_clusters: Optional[int] = None) -> np.ndarray:
+        """
+        Centroids of the clustering into n_clusters clusters (default: all),
+        ordered by label.
+        """
+        n_clusters = self._check_n_clusters(n_clusters)
+        n_nodes = 2 * n_clusters - 1
+        leaves = np.flatnonzero(~self._is_split(n_clusters)[:n_nodes])
+        centroids = np.empty((n_clusters, self.centroids.shape[1]))
+        centroids[self.labels[leaves]] = self.centroids[leaves]
+        return centroids
+
+    def inertias(self) -> np.ndarray:
+        """
+        Inertia of the clustering into m clusters, for m = 1..n_clusters.
+        """
+        inertias = np.empty(self.n_clusters)
+        inertias[0] = self.sse[0]
+        parents = np.flatnonzero(self.children[:, 0] >= 0)
+        # Split s replaces the SSE of its parent by those of nodes 2s-1 and 2s.
+        split_parent = np.empty(self.n_clusters, dtype=np.int64)
+        split_parent[(self.children[parents, 0] + 1) // 2] = parents
+        for s in range(1, self.n_clusters):
+            inertias[s] = (
+                inertias[s - 1] - self.sse[split_parent[s]] + self.sse[2 * s - 1] + self.sse[2 * s]
+            )
+        return inertias
+
+    def depth(self, n_clusters: Optional[int] = None) -> int:
+        """
+        Largest number of nodes split on the way from the root to a leaf.
+        """
+        n_clusters = self._check_n_clusters(n_clusters)
+        is_split = self._is_split(n_clusters)
+        depth = np.zeros(2 * n_clusters - 1, dtype=np.int64)
+        # Children always have larger indices than their parent.
+        for node in np.flatnonzero(is_split):
+            depth[self.children[node]] = depth[node] + 1
+        return int(depth.max())
+
+    def assign(
+        self,
+        X: np.ndarray,
+        n_clusters: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Label of the leaf reached by each row of X, descending the tree cut
+        at n_clusters clusters (default: all).
+
+        Parameters
+        ----------
+        X : ndarray of shape (n_samples, n_features)
+        n_clusters : int or None
+        memory_budget : int or None
+            Budget in bytes for the per-tile temporary blocks.
+
+        Returns
+        -------
+        labels : ndarray of shape (n_samples,)
+        """
+        n_clusters = self._check_n_clusters(n_clusters)
+        if X.ndim != 2 or X.shape[1] != self.centroids.shape[1]:
+            raise ValueError(f"X must have {self.centroids.shape[1]} features.")
+        is_split = self._is_split(n_clusters)
+        labels = np.empty(X.shape[0], dtype=np.intp)
+        # Each step gathers the rows (in the dtype of X) and the float64
+        # hyperplanes of their nodes.
+        rows = chunk_rows(
+            X.shape[0], X.shape[1], X.dtype.itemsize + self._w.itemsize, memory_budget
+        )
+        for sl in iter_chunks(X.shape[0], rows):
+            block = X[sl]
+            node = np.zeros(block.shape[0], dtype=np.int64)
+            active = np.arange(block.shape[0])
+            while active.size:
+                active = active[is_split[node[active]]]
+                at = node[active]
+                right = _right_of(block[active], self._w[at], self._b[at])
+                node[active] = self.children[at, right.astype(np.intp)]
+            labels[sl] = self.labels[node]
+        return labels
+
+
+def bisecting_kmeans(
+    X: np.ndarray,
+    k: int,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    random_state: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    algorithm: str = "lloyd",
+    init: str = "random",
+    n_init: int = 1,
+    return_info: bool = False,
+    dtype: Any = None,
+) -> Union[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, Dict[str, Any]]]:
+    """
+    Bisecting K-means: repeatedly split the cluster with the highest SSE in
+    two with 2-means, until there are k clusters.
+
+    Each split only touches the points of the cluster being split, so the
+    total cost is about O(n_samples * n_features * depth) per 2-means
+    iteration instead of the O(n_samples * k * n_features) of `kmeans`,
+    which makes k in the thousands practical. The splits form a
+    `ClusterTree`, used to assign new points in O(depth * n_features), and
+    the inertia after every split gives the elbow curve for k = 1..k with
+    no further fits. The inertia is usually somewhat higher than that of
+    `kmeans` with the same k.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    k : int
+        Number of clusters.
+    max_iter, tol, memory_budget, algorithm : see `kmeans`
+        Options of each 2-means split.
+    random_state : int or None
+        The seed of each split is drawn from it, so the first m - 1 splits
+        do not depend on k.
+    init : {"random", "k-means++", "k-means||"}, default "random"
+    n_init : int, default 1
+        Initialisation and number of runs of each split.
+    return_info : bool, default False
+        If True, also return a dict with "tree" (the `ClusterTree`),
+        "n_splits", "depth", "n_iter" (2-means iterations over all splits),
+        "inertia" and "elbow_inertias" ({m: inertia} for m = 1..k).
+    dtype : {"float32", "float64"} or None
+        Compute dtype, see `kmeans`.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+        Equal to `tree.assign(X)`.
+    centroids : ndarray of shape (k, n_features)
+    info : dict
+        Only if return_info is True.
+    """
+    if not isinstance(X, np.ndarray):
+        raise TypeError("X must be a NumPy array.")
+    X = X.astype(resolve_dtype(X, dtype), copy=False)
+    n_samples, n_features = X.shape
+    if k <= 0:
+        raise ValueError("k must be a positive integer.")
+    if n_samples < k:
+        raise ValueError(f"X has {n_samples} samples, fewer than k={k}.")
+    rng = np.random.RandomState(random_state)
+    rows = chunk_rows(n_samples, n_features, 8, memory_budget)
+
+    centroids = np.empty((2 * k - 1, n_features))
+    children = np.full((2 * k - 1, 2), -1, dtype=np.int64)
+    node_labels = np.zeros(2 * k - 1, dtype=np.int64)
+    sse = np.zeros(2 * k - 1)
+    labels = np.zeros(n_samples, dtype=np.intp)
+    members: Dict[int, np.ndarray] = {0: np.arange(n_samples)}
+
+    # The root: mean and SSE of X, accumulated in float64 tile by tile.
+    total = np.zeros(n_features)
+    for sl in iter_chunks(n_samples, rows):
+        total += X[sl].sum(axis=0, dtype=np.float64)
+    centroids[0] = total / n_samples
+    for sl in iter_chunks(n_samples, rows):
+        diff = X[sl] - centroids[0]
+        sse[0] += float(np.einsum("ij,ij->", diff, diff))
+
+    # Max-heap of the splittable leaves by SSE.
+    heap: List[Tuple[float, int]] = [(-sse[0], 0)] if sse[0] > 0 else []
+    n_iter = 0
+    n_nodes = 1
+    while n_nodes < 2 * k - 1:
+        if not heap:
+            raise ValueError(
+                f"Only {(n_nodes + 1) // 2} clusters could be formed: "
+                f"X has fewer than k={k} distinct points."
+            )
+        _, node = heapq.heappop(heap)
+        idx = members[node]
+        X_node = X if idx.size == n_samples else X[idx]
+        seed = rng.randint(np.iinfo(np.int32).max)
+        _, halves, split_info = kmeans(
+            X_node,
+            2,
+            max_iter=max_iter,
+            tol=tol,
+            random_state=seed,
+            memory_budget=memory_budget,
+            algorithm=algorithm,
+            init=init,
+            n_init=n_init,
+            return_info=True,
+        )
+        n_iter += split_info["n_iter"]
+
+        # Label the points with the same test as `ClusterTree.assign`.
+        w = halves[1] - halves[0]
+        b = 0.5 * (halves[1] @ halves[1] - halves[0] @ halves[0])
+        right = np.empty(idx.size, dtype=bool)
+        half_sse = np.zeros(2)
+        for sl in iter_chunks(idx.size, rows):
+            block = X_node[sl]
+            side = _right_of(block, np.broadcast_to(w, block.shape), np.full(block.shape[0], b))
+            right[sl] = side
+            diff = block - halves[side.astype(np.intp)]
+            half_sse += np.bincount(side, weights=np.einsum("ij,ij->i", diff, diff), minlength=2)
+        if right.all() or not right.any():
+            # The 2-means solution put every point on one side: leave the node as is.
+            continue
+
+        s = (n_nodes + 1) // 2
+        left_node, right_node = n_nodes, n_nodes + 1
+        n_nodes += 2
+        children[node] = (left_node, right_node)
+        centroids[[left_node, right_node]] = halves
+        node_labels[left_node], node_labels[right_node] = node_labels[node], s
+        sse[[left_node, right_node]] = half_sse
+        labels[idx[right]] = s
+        del members[node]
+        for child, half in ((left_node, idx[~right]), (right_node, idx[right])):
+            members[child] = half
+            if half.size > 1 and sse[child] > 0:
+                heapq.heappush(heap, (-sse[child], child))
+
+    tree = ClusterTree(centroids, children, node_labels, sse)
+    leaf_centroids = tree.leaf_centroids()
+    if not return_info:
+        return labels, leaf_centroids
+    inertias = tree.inertias()
+    info = {
+        "tree": tree,
+        "n_splits": k - 1,
+        "depth": tree.depth(),
+        "n_iter": n_iter,
+        "inertia": float(inertias[-1]),
+        "elbow_inertias": {m + 1: float(value) for m, value in enumerate(inertias)},
+    }
+    return labels, leaf_centroids, info
 
 
 def sklearn_kmeans(
     X: np.ndarray,
     k: int,
     random_state: Optional[int] = None,
+    n_init: int = 10,
+    init: Union[str, np.ndarray] = "k-means++",
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Thin wrapper around scikit-learn's KMeans.
 
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    k : int
+        Number of clusters.
+    random_state : int or None
+    n_init : int, default 10
+        Number of runs with different initialisations.
+    init : str or ndarray, default "k-means++"
+        Initialisation passed to KMeans. With an array of initial centroids
+        a single run is performed.
+
     Returns
     -------
     labels : ndarray of shape (n_samples,)
@@ -128,10 +1386,14 @@ def sklearn_kmeans(
     if not isinstance(X, np.ndarray):
         raise TypeError("X must be a NumPy array.")
 
+    # Imported here so that the manual algorithms do not load scikit-learn.
+    from sklearn.cluster import KMeans
+
     model = KMeans(
         n_clusters=k,
         random_state=random_state,
-        n_init=10,
+        n_init=1 if isinstance(init, np.ndarray) else n_init,
+        init=init,
     )
     model.fit(X)
     labels = model.labels_
@@ -0,0 +1,316 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Batch clustering of many input files over a grid of parameters.
+
+Each input is loaded, its features selected and standardised once, and the
+prepared matrices are written to temporary .npy files. The fits of the
+parameter grid then run as separate jobs on a process pool, each reading
+the matrix it needs through a memory map, so the data are neither re-read
+nor copied between processes. A failing input or fit is recorded in the
+summary table and does not stop the other jobs.
+
+Run from the shell with `cluster-maker batch` (see `cli`).
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .algorithms import bisecting_kmeans, effective_n_jobs, kmeans, sklearn_kmeans
+from .data_exporter import export_data, export_labels
+from .data_loader import load_data, open_npy
+from .distances import COMPUTE_DTYPES
+from .evaluation import SILHOUETTE_METHODS, compute_inertia, silhouette_metrics
+from .preprocessing import StreamingStandardiser, select_features
+
+# Parameters that can vary across the grid, with their defaults.
+GRID_PARAMETERS: Dict[str, Any] = {
+    "k": 3,
+    "algorithm": "kmeans",
+    "standardise": True,
+    "random_state": None,
+}
+
+SUMMARY_COLUMNS = [
+    "input",
+    "k",
+    "algorithm",
+    "standardise",
+    "random_state",
+    "status",
+    "error",
+    "n_samples",
+    "inertia",
+    "silhouette",
+    "silhouette_method",
+    "fit_time_s",
+    "labels_path",
+]
+
+
+class _InlineExecutor(Executor):
+    """
+    Executor running each job when it is submitted (for n_jobs=1).
+    """
+
+    def submit(self, fn: Any, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _error_message(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _prepare_input(
+    input_path: str,
+    feature_cols: Optional[List[str]],
+    workdir: str,
+    index: int,
+    raw: bool,
+    standardised: bool,
+    dtype: str,
+) -> Dict[str, Any]:
+    """
+    Load one input and write its raw and/or standardised feature matrix to
+    .npy files in workdir. Runs in a worker process.
+    """
+    df = load_data(input_path, columns=feature_cols)
+    if feature_cols is None:
+        feature_cols = list(df.select_dtypes(include="number").columns)
+        if not feature_cols:
+            raise ValueError("The input has no numeric columns.")
+    X = select_features(df, feature_cols).to_numpy(dtype=np.float64)
+    if X.shape[0] == 0:
+        raise ValueError("The input contains no data rows.")
+    del df
+
+    prepared: Dict[str, Any] = {"n_samples": X.shape[0], "feature_cols": feature_cols}
+    if raw:
+        prepared["raw"] = os.path.join(workdir, f"{index}-raw.npy")
+        np.save(prepared["raw"], X.astype(dtype, copy=False))
+    if standardised:
+        prepared["standardised"] = os.path.join(workdir, f"{index}-standardised.npy")
+        np.save(prepared["standardised"], StreamingStandardiser().fit(X).transform(X, dtype=dtype))
+    return prepared
+
+
+def _fit_job(
+    matrix_path: str,
+    params: Dict[str, Any],
+    silhouette_options: Dict[str, Any],
+    labels_path: Optional[str],
+) -> Dict[str, Any]:
+    """
+    One fit of the grid on a prepared matrix. Runs in a worker process.
+    """
+    X = open_npy(matrix_path)
+    start = time.perf_counter()
+    if params["algorithm"] == "kmeans":
+        labels, centroids = kmeans(X, k=params["k"], random_state=params["random_state"])
+    elif params["algorithm"] == "sklearn_kmeans":
+        labels, centroids = sklearn_kmeans(
+            np.asarray(X), k=params["k"], random_state=params["random_state"]
+        )
+    elif params["algorithm"] == "bisecting_kmeans":
+        labels, centroids = bisecting_kmeans(X, k=params["k"], random_state=params["random_state"])
+    else:
+        raise ValueError(
+            f"Unknown algorithm '{params['algorithm']}'. "
+            "Use 'kmeans', 'sklearn_kmeans' or 'bisecting_kmeans'."
+        )
+    fit_time = time.perf_counter() - start
+
+    row: Dict[str, Any] = {
+        "inertia": compute_inertia(X, labels, centroids),
+        "fit_time_s": fit_time,
+    }
+    silhouette = silhouette_metrics(
+        X, labels, centroids, random_state=params["random_state"], **silhouette_options
+    )
+    row["silhouette"] = silhouette["silhouette"]
+    row["silhouette_method"] = silhouette["silhouette_method"]
+    if labels_path is not None:
+        export_labels(labels, labels_path)
+        row["labels_path"] = labels_path
+    return row
+
+
+def _expand_grid(param_grid: Optional[Dict[str, Sequence[Any]]]) -> List[Dict[str, Any]]:
+    """
+    Every combination of the grid values, completed with the defaults.
+    """
+    param_grid = dict(param_grid or {})
+    unknown = sorted(set(param_grid) - set(GRID_PARAMETERS))
+    if unknown:
+        raise ValueError(
+            f"Unknown grid parameters {unknown}; use {sorted(GRID_PARAMETERS)}."
+        )
+    names = list(GRID_PARAMETERS)
+    values = [
+        list(param_grid[name]) if name in param_grid else [GRID_PARAMETERS[name]]
+        for name in names
+    ]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _labels_path(output_dir: str, input_path: str, index: int, params: Dict[str, Any]) -> str:
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    std = "std" if params["standardise"] else "raw"
+    return os.path.join(
+        output_dir,
+        f"{index:04d}-{stem}-k{params['k']}-{params['algorithm']}-{std}"
+        f"-rs{params['random_state']}.csv",
+    )
+
+
+def run_batch(
+    inputs: Iterable[str],
+    feature_cols: Optional[List[str]] = None,
+    param_grid: Optional[Dict[str, Sequence[Any]]] = None,
+    n_jobs: Optional[int] = None,
+    output_dir: Optional[str] = None,
+    summary_path: Optional[str] = None,
+    silhouette: str = "auto",
+    silhouette_sample_size: int = 10_000,
+    dtype: Any = "float64",
+) -> pd.DataFrame:
+    """
+    Cluster every input with every combination of a parameter grid.
+
+    Parameters
+    ----------
+    inputs : iterable of str
+        Data files (any format supported by `load_data`).
+    feature_cols : list of str or None
+        Feature columns; if None, all numeric columns of each input.
+    param_grid : dict or None
+        Values to try for "k", "algorithm", "standardise" and
+        "random_state", e.g. {"k": [2, 3, 4], "standardise": [True, False]}.
+        Parameters not in the grid take the defaults of `run_clustering`
+        (k=3, algorithm="kmeans", standardise=True, random_state=None).
+    n_jobs : int or None, default None
+        Maximum number of worker processes (None means 1, -1 all CPUs).
+        With one worker the jobs run in this process.
+    output_dir : str or None
+        If given, the labels of each fit are written there as CSV (see
+        `export_labels`); the file is named in the "labels_path" column.
+    summary_path : str or None
+        If given, the summary table is also written to this file (format
+        from its extension, see `export_data`).
+    silhouette : {"auto", "exact", "sampled", "simplified", "none"}, default "auto"
+    silhouette_sample_size : int, default 10000
+        Silhouette options, as in `run_clustering`.
+    dtype : {"float32", "float64"}, default "float64"
+        Dtype of the prepared matrices and of the fits.
+
+    Returns
+    -------
+    summary : pandas.DataFrame
+        One row per (input, parameter combination), with the parameters,
+        "status" ("ok" or "error"), the error message of failed jobs,
+        n_samples, inertia, silhouette, silhouette_method, fit_time_s and
+        labels_path.
+    """
+    inputs = list(inputs)
+    grid = _expand_grid(param_grid)
+    dtype = np.dtype(dtype)
+    if dtype not in COMPUTE_DTYPES:
+        raise ValueError(f"dtype must be float32 or float64, got {dtype}.")
+    if silhouette != "none" and silhouette not in SILHOUETTE_METHODS:
+        raise ValueError(
+            f"Unknown silhouette method '{silhouette}'. "
+            "Use 'auto', 'exact', 'sampled', 'simplified' or 'none'."
+        )
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    silhouette_options = {"method": silhouette, "sample_size": silhouette_sample_size}
+    need_raw = any(not params["standardise"] for params in grid)
+    need_standardised = any(params["standardise"] for params in grid)
+
+    n_workers = effective_n_jobs(n_jobs)
+    rows: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="cluster_maker_batch_") as workdir:
+        pool: Executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else _InlineExecutor()
+        with pool:
+            # Stage 1: load and standardise each input once.
+            prepare = [
+                pool.submit(
+                    _prepare_input,
+                    path,
+                    feature_cols,
+                    workdir,
+                    i,
+                    need_raw,
+                    need_standardised,
+                    dtype.name,
+                )
+                for i, path in enumerate(inputs)
+            ]
+            # Stage 2: one job per fit, submitted as soon as its input is ready.
+            jobs = []
+            for i, (path, future) in enumerate(zip(inputs, prepare)):
+                try:
+                    prepared = future.result()
+                    error = None
+                except Exception as exc:
+                    prepared, error = None, _error_message(exc)
+                for params in grid:
+                    row: Dict[str, Any] = {"input": path, **params}
+                    if prepared is None:
+                        row.update(status="error", error=error)
+                        jobs.append((row, None))
+                        continue
+                    row["n_samples"] = prepared["n_samples"]
+                    matrix = prepared["standardised" if params["standardise"] else "raw"]
+                    labels_path = None
+                    if output_dir is not None:
+                        labels_path = _labels_path(output_dir, path, i, params)
+                    jobs.append(
+                        (row, pool.submit(_fit_job, matrix, params, silhouette_options, labels_path))
+                    )
+
+            for row, job in jobs:
+                if job is not None:
+                    try:
+                        row.update(job.result())
+                        row["status"] = "ok"
+                    except Exception as exc:
+                        row.update(status="error", error=_error_message(exc))
+                rows.append(row)
+
+    summary = pd.DataFrame(rows).reindex(columns=SUMMARY_COLUMNS)
+    if summary_path is not None:
+        export_data(summary, summary_path)
+    return summary
+
+
+def print_summary(summary: pd.DataFrame) -> int:
+    """
+    Print a batch summary table; returns 1 if any job failed, else 0.
+    """
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(summary.drop(columns=["labels_path"]).to_string(index=False))
+    failed = summary["status"] != "ok"
+    if failed.any():
+        print(f"\n{int(failed.sum())} of {len(summary)} jobs failed.", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,214 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+On-disk cache for clustering results.
+
+Entries are keyed on a SHA-256 fingerprint of the input file plus the
+parameters that determine the result, and stored as uncompressed .npz
+archives: arrays as .npy members and JSON-serialisable values in a "meta"
+member (as in `persistence`). File fingerprints are remembered together
+with the file size and modification time, one small file per input, so an
+unchanged file is not hashed again. The cache is bounded in total size; the least recently used
+entries are evicted first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Bump when the content of cached entries changes, so that old entries are
+# no longer matched.
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 ** 2
+
+_FINGERPRINTS_DIR = "fingerprints"
+_HASH_BLOCK_SIZE = 1024 ** 2
+
+
+def _json_default(value: Any) -> Any:
+    # NumPy scalars and arrays in metrics or parameters.
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serialisable.")
+
+
+def _atomic_write(path: str, write: Any) -> None:
+    """
+    Call write(file) on a temporary file and move it to path, so that
+    concurrent readers never see a partial file.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ResultCache:
+    """
+    Size-bounded, least-recently-used cache of arrays and metadata.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory for the entries; created if needed. Several processes may
+        share it: files are replaced atomically.
+    max_bytes : int, default 512 MiB
+        Total size of the entries above which the least recently used ones
+        are deleted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer.")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    def fingerprint(self, path: str) -> str:
+        """
+        SHA-256 of the content of a file.
+
+        The digest is stored with the file's size and modification time;
+        while they are unchanged it is reused without reading the file.
+        Each input has its own record, replaced atomically, so concurrent
+        processes cannot overwrite each other's records.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        record_dir = os.path.join(self.cache_dir, _FINGERPRINTS_DIR)
+        record_path = os.path.join(
+            record_dir, hashlib.sha256(path.encode("utf-8")).hexdigest() + ".json"
+        )
+        try:
+            with open(record_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+        if (
+            entry
+            and entry.get("path") == path
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return entry["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        entry = {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+        os.makedirs(record_dir, exist_ok=True)
+        _atomic_write(record_path, lambda f: f.write(json.dumps(entry).encode("utf-8")))
+        return sha256
+
+    @staticmethod
+    def key(kind: str, fingerprint: str, params: Dict[str, Any]) -> str:
+        """
+        Entry key for a kind of result (e.g. "fit", "elbow") of an input
+        with the given fingerprint and parameters.
+        """
+        payload = json.dumps(
+            {"version": CACHE_VERSION, "kind": kind, "input": fingerprint, "params": params},
+            sort_keys=True,
+            default=_json_default,
+        )
+        return f"{kind}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+        """
+        The (meta, arrays) stored under key, or None if absent.
+        """
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+                arrays = {name: data[name] for name in data.files if name != "meta"}
+        except (OSError, ValueError, KeyError):
+            # Missing, evicted meanwhile, or unreadable: treat as a miss.
+            return None
+        # Mark as recently used.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return meta, arrays
+
+    def put(
+        self,
+        key: str,
+        meta: Dict[str, Any],
+        arrays: Optional[Dict[str, np.ndarray]] = None,
+    ) -> None:
+        """
+        Store JSON-serialisable meta and arrays under key, then evict least
+        recently used entries beyond max_bytes.
+        """
+        members = {name: np.asarray(value) for name, value in (arrays or {}).items()}
+        members["meta"] = np.frombuffer(
+            json.dumps(meta, default=_json_default).encode("utf-8"), dtype=np.uint8
+        )
+        _atomic_write(self._entry_path(key), lambda f: np.savez(f, **members))
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete least recently used entries until the cache fits max_bytes.
+        """
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for item in it:
+                if item.name.endswith(".npz") and item.is_file():
+                    stat = item.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Delete every entry and stored fingerprint.
+        """
+        with os.scandir(self.cache_dir) as it:
+            for item in it:
+                if item.name.endswith(".npz") and item.is_file():
+                    os.remove(item.path)
+        record_dir = os.path.join(self.cache_dir, _FINGERPRINTS_DIR)
+        if os.path.isdir(record_dir):
+            with os.scandir(record_dir) as it:
+                for item in it:
+                    os.remove(item.path)
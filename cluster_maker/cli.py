@@ -0,0 +1,257 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+The `cluster-maker` command line.
+
+    cluster-maker run data.csv --features x y --k 4 --chunk-size 100000
+    cluster-maker batch a.csv b.csv --k 2 3 4 --n-jobs 4 --summary summary.csv
+
+Only the standard library is imported at start-up; the clustering code
+(and, for plots, matplotlib) is imported once the arguments are parsed,
+so `--help` and argument errors are immediate.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+SILHOUETTE_METHODS = ["auto", "exact", "sampled", "simplified", "none"]
+ALGORITHMS = ["kmeans", "sklearn_kmeans", "bisecting_kmeans"]
+
+
+def _bool_value(text: str) -> bool:
+    lowered = text.lower()
+    if lowered not in ("true", "false", "1", "0", "yes", "no"):
+        raise argparse.ArgumentTypeError(f"invalid boolean value '{text}'")
+    return lowered in ("true", "1", "yes")
+
+
+def _seed_value(text: str) -> Optional[int]:
+    if text.lower() == "none":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid seed '{text}'") from None
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("input", help="input data file (CSV, Parquet, Feather/Arrow or .npy)")
+    parser.add_argument(
+        "--features", nargs="+", default=None, help="feature columns (default: all numeric)"
+    )
+    parser.add_argument("--k", type=int, default=3, help="number of clusters (default: 3)")
+    parser.add_argument("--algorithm", default="kmeans", choices=ALGORITHMS)
+    parser.add_argument(
+        "--no-standardise", dest="standardise", action="store_false", help="use the raw features"
+    )
+    parser.add_argument("--random-state", type=int, default=None)
+    parser.add_argument("--output", default=None, help="write the labelled data to this file")
+    parser.add_argument(
+        "--labels-only", action="store_true", help="write only the row index and the labels"
+    )
+    parser.add_argument("--model", default=None, help="save the fitted model to this file")
+    parser.add_argument("--scaler", default=None, help="standardisation parameters file to reuse")
+    parser.add_argument(
+        "--refit-from", default=None, help="update the fit saved in this model file (see --model)"
+    )
+    parser.add_argument("--refit", default="refine", choices=["online", "refine"])
+
+    perf = parser.add_argument_group("performance")
+    perf.add_argument(
+        "--chunk-size", type=int, default=None, help="stream the input in chunks of this many rows"
+    )
+    perf.add_argument(
+        "--memory-map", action="store_true", help="use a .npy input through a memory map"
+    )
+    perf.add_argument(
+        "--n-jobs",
+        type=int,
+        default=None,
+        help="worker threads for the elbow curve (-1: all CPUs); the main fit is serial",
+    )
+    perf.add_argument("--dtype", default="float64", choices=["float32", "float64"])
+    perf.add_argument("--silhouette", default="auto", choices=SILHOUETTE_METHODS)
+    perf.add_argument("--silhouette-sample-size", type=int, default=10_000)
+    perf.add_argument("--silhouette-time-budget", type=float, default=None, metavar="SECONDS")
+    perf.add_argument("--cache-dir", default=None, help="reuse results cached in this directory")
+    perf.add_argument(
+        "--trace-memory", action="store_true", help="trace per-stage allocations (slower)"
+    )
+
+    plots = parser.add_argument_group("plots (none are made unless --plot-dir is given)")
+    plots.add_argument("--plot-dir", default=None, help="save the figures as PNG files here")
+    plots.add_argument(
+        "--plot-style", default="auto", choices=["auto", "scatter", "raster", "hexbin", "hist2d"]
+    )
+    plots.add_argument("--elbow", action="store_true", help="compute the elbow curve")
+    plots.add_argument("--elbow-k", nargs="+", type=int, default=None, help="k values of the elbow curve")
+    plots.add_argument(
+        "--elbow-warm-start",
+        action="store_true",
+        help="start each elbow fit from the previous one with its worst cluster split",
+    )
+
+
+def _add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("inputs", nargs="+", help="input data files")
+    parser.add_argument(
+        "--features", nargs="+", default=None, help="feature columns (default: all numeric)"
+    )
+    parser.add_argument("--k", nargs="+", type=int, default=None, help="values of k")
+    parser.add_argument(
+        "--algorithm", nargs="+", default=None, choices=ALGORITHMS
+    )
+    parser.add_argument(
+        "--standardise", nargs="+", type=_bool_value, default=None, help="true and/or false"
+    )
+    parser.add_argument(
+        "--random-state", nargs="+", type=_seed_value, default=None, help="seeds, or none"
+    )
+    parser.add_argument("--n-jobs", type=int, default=None, help="worker processes (-1: all CPUs)")
+    parser.add_argument("--output-dir", default=None, help="write the labels of each fit here")
+    parser.add_argument("--summary", default=None, help="summary table file (e.g. summary.csv)")
+    parser.add_argument("--silhouette", default="auto", choices=SILHOUETTE_METHODS)
+    parser.add_argument("--dtype", default="float64", choices=["float32", "float64"])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Parser of the `cluster-maker` command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="cluster-maker",
+        description="K-means clustering of tabular data files.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    run = commands.add_parser("run", help="cluster one input file")
+    _add_run_arguments(run)
+
+    batch = commands.add_parser("batch", help="cluster many files over a parameter grid")
+    _add_batch_arguments(batch)
+    return parser
+
+
+def _numeric_columns(path: str) -> List[str]:
+    """
+    Numeric columns of a data file, judged on its first rows.
+    """
+    from .data_loader import iter_data_chunks
+
+    first = next(iter_data_chunks(path, 1000), None)
+    if first is None:
+        raise ValueError(f"'{path}' contains no data rows.")
+    return [str(col) for col in first.select_dtypes(include="number").columns]
+
+
+def _run(args: argparse.Namespace) -> int:
+    from .interface import run_clustering
+    from .profiling import format_profile
+
+    feature_cols = args.features or _numeric_columns(args.input)
+    if not feature_cols:
+        raise ValueError(f"'{args.input}' has no numeric columns.")
+
+    plot_options: Dict[str, Any] = {"style": args.plot_style}
+    if args.plot_dir is not None:
+        os.makedirs(args.plot_dir, exist_ok=True)
+        plot_options["output_path"] = os.path.join(args.plot_dir, "cluster_plot.png")
+
+    result = run_clustering(
+        input_path=args.input,
+        feature_cols=feature_cols,
+        algorithm=args.algorithm,
+        k=args.k,
+        standardise=args.standardise,
+        output_path=args.output,
+        random_state=args.random_state,
+        compute_elbow=args.elbow,
+        elbow_k_values=args.elbow_k,
+        chunk_size=args.chunk_size,
+        n_jobs=args.n_jobs,
+        elbow_warm_start=args.elbow_warm_start,
+        silhouette=args.silhouette,
+        silhouette_sample_size=args.silhouette_sample_size,
+        silhouette_time_budget=args.silhouette_time_budget,
+        trace_memory=args.trace_memory,
+        output_labels_only=args.labels_only,
+        memory_map=args.memory_map,
+        dtype=args.dtype,
+        model_path=args.model,
+        plot="eager" if args.plot_dir is not None else "none",
+        plot_options=plot_options,
+        scaler_path=args.scaler,
+        cache_dir=args.cache_dir,
+        refit_from=args.refit_from,
+        refit=args.refit,
+    )
+
+    print(f"Features: {', '.join(feature_cols)}")
+    # Streaming runs do not keep the labels in memory.
+    n_samples = result["n_samples"] if "n_samples" in result else len(result["labels"])
+    print(f"Clustered {n_samples} rows into {args.k} clusters.")
+    for key, value in result["metrics"].items():
+        print(f"  {key}: {value}")
+    if result["elbow_inertias"] is not None:
+        print("Elbow inertias:")
+        for k, inertia in result["elbow_inertias"].items():
+            print(f"  k={k}: {inertia:.6g}")
+    if result["fig_elbow"] is not None:
+        result["fig_elbow"].savefig(os.path.join(args.plot_dir, "elbow_plot.png"), dpi=150)
+    print()
+    print(format_profile(result["profile"].values()))
+    return 0
+
+
+def _batch(args: argparse.Namespace) -> int:
+    from .batch import print_summary, run_batch
+
+    grid = {
+        name: values
+        for name, values in (
+            ("k", args.k),
+            ("algorithm", args.algorithm),
+            ("standardise", args.standardise),
+            ("random_state", args.random_state),
+        )
+        if values is not None
+    }
+    summary = run_batch(
+        args.inputs,
+        feature_cols=args.features,
+        param_grid=grid,
+        n_jobs=args.n_jobs,
+        output_dir=args.output_dir,
+        summary_path=args.summary,
+        silhouette=args.silhouette,
+        dtype=args.dtype,
+    )
+    return print_summary(summary)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of the `cluster-maker` console script; returns the exit
+    status (0 on success, 1 on errors or failed batch jobs).
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "batch":
+            return _batch(args)
+        return _run(args)
+    except (KeyError, TypeError, ValueError, OSError) as exc:
+        print(f"cluster-maker: error: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
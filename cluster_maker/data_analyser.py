@@ -6,8 +6,13 @@
 
 from __future__ import annotations
 
+from typing import Any, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
 import pandas as pd
 
+from .data_loader import iter_data_chunks
+
 
 def calculate_descriptive_statistics(data: pd.DataFrame) -> pd.DataFrame:
     """
@@ -42,4 +47,353 @@ def calculate_correlation(data: pd.DataFrame) -> pd.DataFrame:
     """
     if not isinstance(data, pd.DataFrame):
         raise TypeError("data must be a pandas DataFrame.")
-    return data.corr(numeric_only=True)
\ No newline at end of file
+    return data.corr(numeric_only=True)
+
+
+# ----------------------------------------------------------------------
+# Streaming statistics
+# ----------------------------------------------------------------------
+
+DEFAULT_STATS_CHUNK_SIZE = 100_000
+
+
+class QuantileSketch:
+    """
+    Mergeable approximate quantiles of a stream of numbers.
+
+    A compactor sketch (as in KLL): values enter level 0 with weight 1;
+    when a level holds more than `capacity` values it is sorted and every
+    other value (from a random offset) moves up one level with twice the
+    weight. Memory is O(capacity * log(n / capacity)) and the rank error is
+    of the order of 1 / capacity. Until the first compaction the sketch
+    holds every value and quantiles are exact.
+
+    Parameters
+    ----------
+    capacity : int, default 1024
+        Values kept per level before it is compacted.
+    random_state : int or None
+        Seed for the compaction offsets.
+    """
+
+    def __init__(self, capacity: int = 1024, random_state: Optional[int] = None) -> None:
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2.")
+        self.capacity = capacity
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.RandomState(random_state)
+
+    @property
+    def count(self) -> int:
+        """
+        Total weight, i.e. the number of values seen.
+        """
+        return int(sum(level.size << h for h, level in enumerate(self.levels)))
+
+    def update(self, values: Any) -> "QuantileSketch":
+        """
+        Add values; NaNs are ignored.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Add the values summarised by another sketch, in place.
+        """
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if level.size > self.capacity:
+                level = np.sort(level)
+                # An odd value out stays at this level.
+                keep = level[-1:] if level.size % 2 else level[:0]
+                promoted = level[self._rng.randint(2):level.size - keep.size:2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
+        """
+        Approximate quantile(s) q in [0, 1]; NaN if no values were seen.
+        """
+        q_arr = np.asarray(q, dtype=np.float64)
+        if np.any((q_arr < 0) | (q_arr > 1)):
+            raise ValueError("Quantiles must be in [0, 1].")
+        if len(self.levels) == 1:
+            if self.levels[0].size == 0:
+                result = np.full(q_arr.shape, np.nan)
+            else:
+                result = np.quantile(self.levels[0], q_arr)
+        else:
+            values = np.concatenate(self.levels)
+            weights = np.concatenate(
+                [np.full(level.size, float(1 << h)) for h, level in enumerate(self.levels)]
+            )
+            order = np.argsort(values, kind="stable")
+            values, weights = values[order], weights[order]
+            # Each value stands for the middle of the rank interval it covers.
+            positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+            result = np.interp(q_arr, positions, values)
+        return float(result) if result.ndim == 0 else result
+
+
+class StreamingStatistics:
+    """
+    Descriptive statistics, covariance and correlation of numeric columns,
+    accumulated chunk by chunk in bounded memory.
+
+    Pairwise moments are kept for every pair of columns (count, means and
+    co-moments over the rows where both are present), so that missing
+    values are handled as in `DataFrame.describe` and `DataFrame.corr`.
+    Chunk moments are computed about the chunk mean and merged with Chan's
+    parallel update, which is numerically stable. Accumulators built on
+    different chunks or workers can be combined with `merge`.
+
+    Parameters
+    ----------
+    columns : list of str or None
+        Columns to summarise. If None, the numeric columns of the first
+        chunk.
+    sketch_capacity : int, default 1024
+        Capacity of the per-column `QuantileSketch`.
+    random_state : int or None
+        Seed for the quantile sketches.
+
+    Notes
+    -----
+    Memory is O(n_features^2 + n_features * sketch_capacity), independent
+    of the number of rows.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        sketch_capacity: int = 1024,
+        random_state: Optional[int] = None,
+    ) -> None:
+        self.sketch_capacity = sketch_capacity
+        self.random_state = random_state
+        self.columns_: Optional[List[str]] = None
+        if columns is not None:
+            self._init_state(list(columns))
+
+    def _init_state(self, columns: List[str]) -> None:
+        p = len(columns)
+        self.columns_ = columns
+        # [i, j] entries are over the rows where columns i and j are both
+        # present; the diagonal holds the per-column moments.
+        self.count_ = np.zeros((p, p))
+        self.mean_ = np.zeros((p, p))
+        self.m2_ = np.zeros((p, p))
+        self.comoment_ = np.zeros((p, p))
+        self.min_ = np.full(p, np.nan)
+        self.max_ = np.full(p, np.nan)
+        self.sketches_ = [
+            QuantileSketch(self.sketch_capacity, self.random_state) for _ in range(p)
+        ]
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingStatistics":
+        """
+        Add the rows of a DataFrame chunk.
+        """
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("chunk must be a pandas DataFrame.")
+        if self.columns_ is None:
+            self._init_state(list(chunk.select_dtypes(include="number").columns))
+        missing = [c for c in self.columns_ if c not in chunk.columns]
+        if missing:
+            raise KeyError(f"The following columns are missing from the chunk: {missing}")
+        X = chunk[self.columns_].to_numpy(dtype=np.float64)
+        if X.shape[0] == 0:
+            return self
+
+        present = ~np.isnan(X)
+        W = present.astype(np.float64)
+        # Moments are taken about the chunk column means for accuracy.
+        X0 = np.where(present, X, 0.0)
+        shift = X0.sum(axis=0) / np.maximum(W.sum(axis=0), 1.0)
+        Z = np.where(present, X0 - shift, 0.0)
+
+        count = W.T @ W
+        safe = np.maximum(count, 1.0)
+        sums = Z.T @ W
+        m2 = (Z * Z).T @ W - sums * sums / safe
+        comoment = Z.T @ Z - sums * sums.T / safe
+        self._merge_moments(count, sums / safe + shift[:, np.newaxis], m2, comoment)
+
+        # fmin / fmax ignore NaNs; all-NaN columns stay NaN.
+        self.min_ = np.fmin(self.min_, np.fmin.reduce(X, axis=0))
+        self.max_ = np.fmax(self.max_, np.fmax.reduce(X, axis=0))
+        for j, sketch in enumerate(self.sketches_):
+            sketch.update(X[:, j])
+        return self
+
+    def _merge_moments(
+        self,
+        count: np.ndarray,
+        mean: np.ndarray,
+        m2: np.ndarray,
+        comoment: np.ndarray,
+    ) -> None:
+        """
+        Chan's update of the pairwise moments with those of other rows.
+        """
+        total = self.count_ + count
+        safe = np.maximum(total, 1.0)
+        delta = mean - self.mean_
+        weight = self.count_ * count / safe
+        self.mean_ = self.mean_ + delta * (count / safe)
+        self.m2_ += m2 + delta ** 2 * weight
+        # delta.T[i, j] is the shift in the mean of column j over the same rows.
+        self.comoment_ += comoment + delta * delta.T * weight
+        self.count_ = total
+
+    def merge(self, other: "StreamingStatistics") -> "StreamingStatistics":
+        """
+        Combine with statistics accumulated on other rows, in place.
+        """
+        if other.columns_ is None:
+            return self
+        if self.columns_ is None:
+            self._init_state(list(other.columns_))
+        if other.columns_ != self.columns_:
+            raise ValueError("Cannot merge statistics over different columns.")
+        self._merge_moments(other.count_, other.mean_, other.m2_, other.comoment_)
+        self.min_ = np.fmin(self.min_, other.min_)
+        self.max_ = np.fmax(self.max_, other.max_)
+        for sketch, other_sketch in zip(self.sketches_, other.sketches_):
+            sketch.merge(other_sketch)
+        return self
+
+    def _check_updated(self) -> None:
+        if self.columns_ is None:
+            raise RuntimeError("No data has been added; call update first.")
+
+    def quantile(self, q: Union[float, Sequence[float]] = 0.5) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Approximate quantiles of each column (see `QuantileSketch`).
+        """
+        self._check_updated()
+        if np.ndim(q) == 0:
+            return pd.Series(
+                [sketch.quantile(q) for sketch in self.sketches_], index=self.columns_, name=q
+            )
+        return pd.DataFrame(
+            np.column_stack([sketch.quantile(q) for sketch in self.sketches_]),
+            index=list(q),
+            columns=self.columns_,
+        )
+
+    def describe(self, percentiles: Sequence[float] = (0.25, 0.5, 0.75)) -> pd.DataFrame:
+        """
+        Statistics laid out as `DataFrame.describe`: count, mean, std
+        (ddof=1), min, percentiles and max. Percentiles are approximate
+        once the data exceed the sketch capacity.
+        """
+        self._check_updated()
+        count = self.count_.diagonal().copy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, self.mean_.diagonal(), np.nan)
+            std = np.where(count > 1, np.sqrt(np.maximum(self.m2_.diagonal(), 0.0) / (count - 1)), np.nan)
+        rows = [count, mean, std, self.min_]
+        index = ["count", "mean", "std", "min"]
+        if len(percentiles):
+            rows.extend(self.quantile(list(percentiles)).to_numpy())
+            index.extend(f"{100 * p:g}%" for p in percentiles)
+        rows.append(self.max_)
+        index.append("max")
+        return pd.DataFrame(np.vstack(rows), index=index, columns=self.columns_)
+
+    def covariance(self) -> pd.DataFrame:
+        """
+        Pairwise sample covariance matrix (ddof=1), as `DataFrame.cov`.
+        """
+        self._check_updated()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = np.where(self.count_ > 1, self.comoment_ / (self.count_ - 1), np.nan)
+        return pd.DataFrame(cov, index=self.columns_, columns=self.columns_)
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Pairwise Pearson correlation matrix, as `DataFrame.corr`.
+        """
+        self._check_updated()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.comoment_ / np.sqrt(self.m2_ * self.m2_.T)
+        corr = np.where(self.count_ > 1, np.clip(corr, -1.0, 1.0), np.nan)
+        np.fill_diagonal(corr, np.where(np.isnan(corr.diagonal()), np.nan, 1.0))
+        return pd.DataFrame(corr, index=self.columns_, columns=self.columns_)
+
+
+def streaming_statistics(
+    source: Union[str, Iterable[pd.DataFrame]],
+    columns: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_STATS_CHUNK_SIZE,
+    sketch_capacity: int = 1024,
+    random_state: Optional[int] = None,
+) -> StreamingStatistics:
+    """
+    Accumulate `StreamingStatistics` over a file or an iterable of chunks.
+
+    Parameters
+    ----------
+    source : str or iterable of pandas.DataFrame
+        A data file (any format supported by `iter_data_chunks`), read
+        chunk_size rows at a time, or DataFrame chunks, e.g. from
+        `pd.read_csv(..., chunksize=...)`.
+    columns : list of str or None
+        Columns to summarise; the numeric columns of the first chunk if None.
+    chunk_size : int, default 100000
+        Rows per chunk when source is a path.
+    sketch_capacity : int, default 1024
+    random_state : int or None
+
+    Returns
+    -------
+    stats : StreamingStatistics
+        Call `describe()`, `correlation()`, ... on it, or `merge` it with
+        statistics computed elsewhere.
+    """
+    if isinstance(source, str):
+        source = iter_data_chunks(source, chunk_size, columns=columns)
+    stats = StreamingStatistics(columns, sketch_capacity, random_state)
+    for chunk in source:
+        stats.update(chunk)
+    return stats
+
+
+def calculate_streaming_descriptive_statistics(
+    source: Union[str, Iterable[pd.DataFrame]],
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Streaming counterpart of `calculate_descriptive_statistics`; see
+    `streaming_statistics` for the parameters. Quantiles are approximate
+    for large inputs.
+    """
+    return streaming_statistics(source, **kwargs).describe()
+
+
+def calculate_streaming_correlation(
+    source: Union[str, Iterable[pd.DataFrame]],
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Streaming counterpart of `calculate_correlation`; see
+    `streaming_statistics` for the parameters.
+    """
+    return streaming_statistics(source, **kwargs).correlation()
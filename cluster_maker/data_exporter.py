@@ -6,16 +6,20 @@
 
 from __future__ import annotations
 
-from typing import Union, TextIO
+from typing import Optional, Union, TextIO
 
+import numpy as np
 import pandas as pd
 
+from .data_loader import detect_format, require_pyarrow
+
 
 def export_to_csv(
     data: pd.DataFrame,
     filename: str,
     delimiter: str = ",",
     include_index: bool = False,
+    append: bool = False,
 ) -> None:
     """
     Export a DataFrame to CSV.
@@ -27,10 +31,19 @@ def export_to_csv(
         Output filename.
     delimiter : str, default ","
     include_index : bool, default False
+    append : bool, default False
+        If True, append the rows to an existing file without writing the
+        header again. Used to write large outputs chunk by chunk.
     """
     if not isinstance(data, pd.DataFrame):
         raise TypeError("data must be a pandas DataFrame.")
-    data.to_csv(filename, sep=delimiter, index=include_index)
+    data.to_csv(
+        filename,
+        sep=delimiter,
+        index=include_index,
+        mode="a" if append else "w",
+        header=not append,
+    )
 
 
 def export_formatted(
@@ -57,4 +70,77 @@ def export_formatted(
         with open(file, "w", encoding="utf-8") as f:
             f.write(table_str)
     else:
-        file.write(table_str)
\ No newline at end of file
+        file.write(table_str)
+
+
+def export_data(
+    data: pd.DataFrame,
+    filename: str,
+    include_index: bool = False,
+) -> None:
+    """
+    Export a DataFrame in the format given by the file extension.
+
+    Supported formats are CSV, Feather/Arrow IPC and Parquet (both need
+    pyarrow) and .npy (numeric columns only, written as one 2D array).
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+    filename : str
+        Output filename; its extension selects the format.
+    include_index : bool, default False
+        Write the index as well (as a column for Feather and .npy).
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("data must be a pandas DataFrame.")
+    fmt = detect_format(filename)
+    if fmt == "csv":
+        export_to_csv(data, filename, include_index=include_index)
+        return
+    if include_index:
+        data = data.reset_index()
+    if fmt == "npy":
+        np.save(filename, data.to_numpy(dtype=float))
+        return
+    require_pyarrow(fmt)
+    if fmt == "parquet":
+        data.to_parquet(filename, index=False)
+    else:
+        data.reset_index(drop=True).to_feather(filename)
+
+
+def export_labels(
+    labels: np.ndarray,
+    filename: str,
+    index: Optional[Union[np.ndarray, pd.Index]] = None,
+    append: bool = False,
+) -> None:
+    """
+    Write only the cluster labels, alongside the row index of the input.
+
+    This avoids rewriting the full input data: the labels can be joined back
+    to the input on the "row" column.
+
+    Parameters
+    ----------
+    labels : ndarray of shape (n_samples,)
+    filename : str
+        Output filename; its extension selects the format (see `export_data`).
+    index : array-like or None
+        Row index of each label. Defaults to 0..n_samples-1.
+    append : bool, default False
+        Append to an existing CSV file (CSV only), e.g. chunk by chunk.
+    """
+    labels = np.asarray(labels)
+    if index is None:
+        index = np.arange(labels.shape[0])
+    if len(index) != labels.shape[0]:
+        raise ValueError("index and labels must have the same length.")
+    table = pd.DataFrame({"row": np.asarray(index), "cluster": labels})
+    if append:
+        if detect_format(filename) != "csv":
+            raise ValueError("Appending labels is only supported for CSV output.")
+        export_to_csv(table, filename, append=True)
+    else:
+        export_data(table, filename)
@@ -0,0 +1,233 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Format-aware loading of tabular input: CSV, Feather/Arrow IPC, Parquet
+and raw NumPy .npy files. The format is detected from the file extension.
+
+Feather and Parquet need the optional dependency pyarrow. A .npy file holds
+a 2D numeric array whose columns are named "0", "1", ... .
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# File extension -> format name.
+FORMATS = {
+    ".csv": "csv",
+    ".txt": "csv",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".npy": "npy",
+}
+
+
+def detect_format(path: str) -> str:
+    """
+    Format of a data file from its extension.
+
+    Returns
+    -------
+    fmt : {"csv", "feather", "parquet", "npy"}
+
+    Raises
+    ------
+    ValueError
+        If the extension is not recognised.
+    """
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(
+            f"Cannot detect the format of '{path}'. "
+            f"Supported extensions: {sorted(FORMATS)}"
+        )
+    return FORMATS[ext]
+
+
+def require_pyarrow(fmt: str) -> Any:
+    """
+    Import and return pyarrow, needed to read or write `fmt` files.
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            f"Reading or writing {fmt} files requires the optional dependency pyarrow."
+        ) from exc
+    return pyarrow
+
+
+def npy_column_names(n_columns: int) -> List[str]:
+    """
+    Column names of a .npy array with n_columns columns: "0", "1", ... .
+    """
+    return [str(j) for j in range(n_columns)]
+
+
+def open_npy(path: str, mmap_mode: str = "r") -> np.ndarray:
+    """
+    Memory-map a 2D .npy file (nothing is read until it is sliced).
+    """
+    array = np.load(path, mmap_mode=mmap_mode)
+    if array.ndim != 2:
+        raise ValueError(f"'{path}' must contain a 2D array, got {array.ndim} dimensions.")
+    return array
+
+
+def read_columns(path: str) -> List[str]:
+    """
+    Column names of a data file, read from its header/metadata only.
+    """
+    fmt = detect_format(path)
+    if fmt == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    if fmt == "npy":
+        return npy_column_names(open_npy(path).shape[1])
+    pa = require_pyarrow(fmt)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(path).names)
+    with pa.memory_map(path, "r") as source:
+        return list(pa.ipc.open_file(source).schema.names)
+
+
+def _check_columns(path: str, columns: Optional[List[str]]) -> None:
+    if columns is None:
+        return
+    available = read_columns(path)
+    missing = [col for col in columns if col not in available]
+    if missing:
+        raise KeyError(f"The following feature columns are missing: {missing}")
+
+
+def load_data(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load a data file into a DataFrame, optionally reading only some columns.
+
+    Column projection means that, for Parquet and Feather, the other columns
+    are never read from disk; for CSV they are skipped while parsing.
+
+    Parameters
+    ----------
+    path : str
+        Input file; the format is detected from its extension.
+    columns : list of str or None
+        Columns to read. All columns if None.
+
+    Returns
+    -------
+    data : pandas.DataFrame
+
+    Raises
+    ------
+    KeyError
+        If any requested column is missing.
+    """
+    fmt = detect_format(path)
+    _check_columns(path, columns)
+    if fmt == "csv":
+        data = pd.read_csv(path, usecols=columns)
+    elif fmt == "npy":
+        array = open_npy(path)
+        names = npy_column_names(array.shape[1])
+        if columns is not None:
+            array = array[:, [names.index(col) for col in columns]]
+            names = list(columns)
+        data = pd.DataFrame(np.asarray(array), columns=names)
+    elif fmt == "parquet":
+        require_pyarrow(fmt)
+        data = pd.read_parquet(path, columns=columns)
+    else:
+        require_pyarrow(fmt)
+        data = pd.read_feather(path, columns=columns)
+
+    if columns is not None:
+        # usecols does not preserve the requested order.
+        data = data[list(columns)]
+    return data
+
+
+def iter_data_chunks(
+    path: str,
+    chunk_size: int,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a data file as consecutive DataFrames of at most chunk_size rows.
+
+    Each chunk is indexed by its global row numbers. Only one chunk (plus
+    whatever the reader buffers) is held in memory at a time.
+
+    Parameters
+    ----------
+    path : str
+    chunk_size : int
+    columns : list of str or None
+        Columns to read. All columns if None.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    fmt = detect_format(path)
+    _check_columns(path, columns)
+
+    if fmt == "csv":
+        for chunk in pd.read_csv(path, chunksize=chunk_size, usecols=columns):
+            yield chunk if columns is None else chunk[list(columns)]
+        return
+
+    if fmt == "npy":
+        array = open_npy(path)
+        names = npy_column_names(array.shape[1])
+        col_idx = list(range(len(names))) if columns is None else [names.index(c) for c in columns]
+        names = [names[j] for j in col_idx]
+        for start in range(0, array.shape[0], chunk_size):
+            stop = min(start + chunk_size, array.shape[0])
+            yield pd.DataFrame(
+                np.asarray(array[start:stop][:, col_idx]),
+                columns=names,
+                index=pd.RangeIndex(start, stop),
+            )
+        return
+
+    pa = require_pyarrow(fmt)
+    start = 0
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns)
+        for batch in batches:
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+        return
+
+    with pa.memory_map(path, "r") as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            # Re-slice the stored record batches to the requested size.
+            for offset in range(0, batch.num_rows, chunk_size):
+                chunk = batch.slice(offset, chunk_size).to_pandas()
+                chunk.index = pd.RangeIndex(start, start + len(chunk))
+                start += len(chunk)
+                yield chunk
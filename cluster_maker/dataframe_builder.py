@@ -6,11 +6,13 @@
 
 from __future__ import annotations
 
-from typing import List, Dict, Any, Sequence
+from typing import Iterator, List, Dict, Any, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
 
+from .data_exporter import export_to_csv
+
 
 def define_dataframe_structure(column_specs: List[Dict[str, Any]]) -> pd.DataFrame:
     """
@@ -55,16 +57,122 @@ def define_dataframe_structure(column_specs: List[Dict[str, Any]]) -> pd.DataFra
             raise ValueError("All 'reps' lists must have the same length.")
         data[name] = list(reps)
 
-    seed_df = pd.DataFrame.from_dict(data, orient="index")
+    seed_df = pd.DataFrame(data)
     seed_df.index.name = "cluster_id"
     return seed_df
 
 
+def _cluster_counts(
+    n_points: int,
+    n_clusters: int,
+    weights: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    Number of points per cluster: proportional to the weights (equal by
+    default), with the remainder given to the largest fractional parts.
+    """
+    if weights is None:
+        weights_arr = np.ones(n_clusters)
+    else:
+        weights_arr = np.asarray(weights, dtype=float)
+        if weights_arr.shape != (n_clusters,):
+            raise ValueError("weights must have one entry per cluster.")
+        if np.any(weights_arr < 0) or weights_arr.sum() <= 0:
+            raise ValueError("weights must be non-negative and not all zero.")
+
+    exact = n_points * weights_arr / weights_arr.sum()
+    counts = np.floor(exact).astype(int)
+    remainder = n_points - counts.sum()
+    # Stable sort keeps ties in cluster order (equal weights: first clusters).
+    order = np.argsort(-(exact - counts), kind="stable")
+    counts[order[:remainder]] += 1
+    return counts
+
+
+def _cluster_stds(
+    cluster_std: Union[float, Sequence[float]],
+    n_clusters: int,
+) -> np.ndarray:
+    """
+    Per-cluster standard deviations from a scalar or a sequence.
+    """
+    stds = np.asarray(cluster_std, dtype=float)
+    if stds.ndim == 0:
+        stds = np.full(n_clusters, float(stds))
+    elif stds.shape != (n_clusters,):
+        raise ValueError("cluster_std must be a number or have one entry per cluster.")
+    if np.any(stds <= 0):
+        raise ValueError("cluster_std must be positive.")
+    return stds
+
+
+def simulate_data_chunks(
+    seed_df: pd.DataFrame,
+    n_points: int = 100,
+    cluster_std: Union[float, Sequence[float]] = 1.0,
+    random_state: int | None = None,
+    weights: Optional[Sequence[float]] = None,
+    chunk_size: int = 1_000_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Simulate clustered data chunk by chunk.
+
+    Yields consecutive DataFrames of at most `chunk_size` rows whose
+    concatenation equals `simulate_data` called with the same arguments, so
+    data sets larger than memory can be generated and written piecewise.
+
+    Parameters
+    ----------
+    seed_df : pandas.DataFrame
+        Rows represent cluster centres, columns represent features.
+    n_points : int, default 100
+        Total number of data points to simulate.
+    cluster_std : float or sequence of float, default 1.0
+        Standard deviation of the Gaussian noise, common or per cluster.
+    random_state : int or None, default None
+        Seed of the numpy Generator.
+    weights : sequence of float or None, default None
+        Relative cluster sizes. Points are split equally if None.
+    chunk_size : int, default 1000000
+        Maximum number of rows per chunk.
+
+    Yields
+    ------
+    chunk : pandas.DataFrame
+        Feature columns plus 'true_cluster', indexed by global row number.
+    """
+    if n_points <= 0:
+        raise ValueError("n_points must be a positive integer.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    rng = np.random.default_rng(random_state)
+    centres = seed_df.to_numpy(dtype=float)
+    n_clusters, n_features = centres.shape
+    stds = _cluster_stds(cluster_std, n_clusters)
+    # Points are generated grouped by cluster, in cluster order.
+    boundaries = np.cumsum(_cluster_counts(n_points, n_clusters, weights))
+
+    for start in range(0, n_points, chunk_size):
+        stop = min(start + chunk_size, n_points)
+        cluster_ids = np.searchsorted(boundaries, np.arange(start, stop), side="right")
+        points = rng.standard_normal((stop - start, n_features))
+        points *= stds[cluster_ids, np.newaxis]
+        points += centres[cluster_ids]
+
+        columns: Dict[Any, np.ndarray] = {
+            col: points[:, j] for j, col in enumerate(seed_df.columns)
+        }
+        columns["true_cluster"] = cluster_ids
+        yield pd.DataFrame(columns, index=pd.RangeIndex(start, stop))
+
+
 def simulate_data(
     seed_df: pd.DataFrame,
     n_points: int = 100,
-    cluster_std: str = "1.0",
+    cluster_std: Union[float, Sequence[float]] = 1.0,
     random_state: int | None = None,
+    weights: Optional[Sequence[float]] = None,
 ) -> pd.DataFrame:
     """
     Simulate clustered data around the given cluster centres.
@@ -75,10 +183,14 @@ def simulate_data(
         Rows represent cluster centres, columns represent features.
     n_points : int, default 100
         Total number of data points to simulate.
-    cluster_std : float, default 1.0
-        Standard deviation of Gaussian noise added around centres.
+    cluster_std : float or sequence of float, default 1.0
+        Standard deviation of Gaussian noise added around centres, either
+        common to all clusters or one value per cluster.
     random_state : int or None, default None
         Random seed for reproducibility.
+    weights : sequence of float or None, default None
+        Relative cluster sizes. Points are distributed as evenly as possible
+        across clusters if None.
 
     Returns
     -------
@@ -86,29 +198,38 @@ def simulate_data(
         Simulated data with all original feature columns plus a 'true_cluster'
         column indicating the generating cluster.
     """
-    if n_points <= 0:
-        raise ValueError("n_points must be a positive integer.")
-    if cluster_std <= 0:
-        raise ValueError("cluster_std must be positive.")
-
-    rng = np.random.RandomState(random_state)
-    centres = seed_df.to_numpy(dtype=float)
-    n_clusters, n_features = centres.shape
+    chunks = simulate_data_chunks(
+        seed_df,
+        n_points=n_points,
+        cluster_std=cluster_std,
+        random_state=random_state,
+        weights=weights,
+        chunk_size=max(1, n_points),
+    )
+    return next(chunks)
+
+
+def simulate_data_to_csv(
+    seed_df: pd.DataFrame,
+    filename: str,
+    n_points: int = 100,
+    cluster_std: Union[float, Sequence[float]] = 1.0,
+    random_state: int | None = None,
+    weights: Optional[Sequence[float]] = None,
+    chunk_size: int = 1_000_000,
+) -> None:
+    """
+    Simulate clustered data and write it straight to a CSV file.
 
-    # Distribute points as evenly as possible across clusters.
-    base = n_points // n_clusters
-    remainder = n_points % n_clusters
-    counts = np.full(n_clusters, base, dtype=int)
-    counts[:remainder] += 1
-
-    records = []
-    for cluster_id, (centre, count) in enumerate(zip(centres, counts)):
-        noise = rng.normal(loc=0.0, scale=cluster_std, size=(count, n_features))
-        points = centre + noise
-        for point in points:
-            record = {col: val for col, val in zip(seed_df.columns, point)}
-            record["true_cluster"] = cluster_id
-            records.append(record)
-
-    data = pd.DataFrame.from_records(records)
-    return data
\ No newline at end of file
+    Only one chunk is held in memory at a time (see `simulate_data_chunks`).
+    """
+    chunks = simulate_data_chunks(
+        seed_df,
+        n_points=n_points,
+        cluster_std=cluster_std,
+        random_state=random_state,
+        weights=weights,
+        chunk_size=chunk_size,
+    )
+    for i, chunk in enumerate(chunks):
+        export_to_csv(chunk, filename, append=i > 0)
@@ -0,0 +1,284 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Memory-bounded distance engine shared by the clustering algorithms.
+
+Squared Euclidean distances are computed with the expansion
+
+    ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2
+
+so that the expensive part is a single matrix product (GEMM) per tile of
+rows of X. Rows are processed in tiles whose size is chosen so that the
+temporary (tile, k) distance block fits in a configurable memory budget;
+peak memory therefore does not grow with n_samples * k * n_features.
+
+Distances can be computed in float32 or float64 (the "compute dtype");
+sums over samples are always accumulated in float64.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+# Default memory budget (bytes) for the temporary distance block of one tile.
+DEFAULT_MEMORY_BUDGET = 64 * 1024 ** 2
+
+
+# Floating-point types supported for the distance computations.
+COMPUTE_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+
+def resolve_dtype(X: np.ndarray, dtype: Any = None) -> np.dtype:
+    """
+    Compute dtype for X: `dtype` if given, else the dtype of X if it is
+    float32 or float64, else float64.
+
+    Raises
+    ------
+    ValueError
+        If `dtype` is not float32 or float64.
+    """
+    if dtype is None:
+        return X.dtype if X.dtype in COMPUTE_DTYPES else np.dtype(np.float64)
+    dtype = np.dtype(dtype)
+    if dtype not in COMPUTE_DTYPES:
+        raise ValueError(f"dtype must be float32 or float64, got {dtype}.")
+    return dtype
+
+
+def chunk_rows(
+    n_samples: int,
+    n_columns: int,
+    itemsize: int = 8,
+    memory_budget: Optional[int] = None,
+) -> int:
+    """
+    Number of rows per tile so that a (rows, n_columns) block fits the budget.
+
+    Parameters
+    ----------
+    n_samples : int
+        Total number of rows to process.
+    n_columns : int
+        Width of the temporary block (e.g. number of centroids).
+    itemsize : int, default 8
+        Size in bytes of one element of the temporary block.
+    memory_budget : int or None
+        Budget in bytes. If None, DEFAULT_MEMORY_BUDGET is used.
+
+    Returns
+    -------
+    rows : int
+        At least 1 and at most n_samples (or 1 if n_samples is 0).
+    """
+    if memory_budget is None:
+        memory_budget = DEFAULT_MEMORY_BUDGET
+    if memory_budget <= 0:
+        raise ValueError("memory_budget must be a positive number of bytes.")
+    rows = int(memory_budget // max(1, n_columns * itemsize))
+    return max(1, min(rows, max(1, n_samples)))
+
+
+def iter_chunks(n_samples: int, rows: int) -> Iterator[slice]:
+    """
+    Yield consecutive row slices of at most `rows` rows covering n_samples.
+    """
+    for start in range(0, n_samples, rows):
+        yield slice(start, min(start + rows, n_samples))
+
+
+def squared_norms(X: np.ndarray, memory_budget: Optional[int] = None) -> np.ndarray:
+    """
+    Squared Euclidean norm of each row of X.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    memory_budget : int or None
+        Budget in bytes for the temporaries of one tile.
+
+    Returns
+    -------
+    norms : ndarray of shape (n_samples,)
+    """
+    n_samples, n_features = X.shape
+    out = np.empty(n_samples, dtype=X.dtype)
+    rows = chunk_rows(n_samples, n_features, X.itemsize, memory_budget)
+    for sl in iter_chunks(n_samples, rows):
+        block = X[sl]
+        np.einsum("ij,ij->i", block, block, out=out[sl])
+    return out
+
+
+def pairwise_sq_distances(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    x_sq_norms: Optional[np.ndarray] = None,
+    c_sq_norms: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Squared Euclidean distances between all rows of X and all centroids.
+
+    This is the unchunked building block: the result has shape
+    (n_samples, k), so callers are expected to pass a tile of X.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    centroids : ndarray of shape (k, n_features)
+    x_sq_norms : ndarray of shape (n_samples,) or None
+        Precomputed squared norms of the rows of X.
+    c_sq_norms : ndarray of shape (k,) or None
+        Precomputed squared norms of the centroids.
+    out : ndarray of shape (n_samples, k) or None
+        Preallocated output buffer.
+
+    Returns
+    -------
+    sq_dist : ndarray of shape (n_samples, k)
+        Non-negative squared distances.
+    """
+    if x_sq_norms is None:
+        x_sq_norms = np.einsum("ij,ij->i", X, X)
+    if c_sq_norms is None:
+        c_sq_norms = np.einsum("ij,ij->i", centroids, centroids)
+
+    out = np.dot(X, centroids.T, out=out)
+    out *= -2.0
+    out += c_sq_norms[np.newaxis, :]
+    out += x_sq_norms[:, np.newaxis]
+    # Rounding can make distances of coincident points slightly negative.
+    np.maximum(out, 0.0, out=out)
+    return out
+
+
+def nearest_centroid(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    x_sq_norms: Optional[np.ndarray] = None,
+    memory_budget: Optional[int] = None,
+    labels_out: Optional[np.ndarray] = None,
+    distances_out: Optional[np.ndarray] = None,
+    workspace: Optional[np.ndarray] = None,
+    dtype: Any = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Index of and squared distance to the nearest centroid for each row of X.
+
+    X is processed in tiles sized to `memory_budget`. All outputs and the
+    per-tile distance block can be supplied by the caller so that repeated
+    calls (e.g. successive K-means iterations) allocate nothing large.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    centroids : ndarray of shape (k, n_features)
+    x_sq_norms : ndarray of shape (n_samples,) or None
+        Precomputed squared norms of the rows of X (see `squared_norms`).
+    memory_budget : int or None
+        Budget in bytes for the per-tile distance block. Ignored when
+        `workspace` is given, whose number of rows sets the tile size.
+    labels_out : ndarray of shape (n_samples,) or None
+        Preallocated integer buffer for the labels.
+    distances_out : ndarray of shape (n_samples,) or None
+        Preallocated buffer for the squared distances to the nearest centroid.
+    workspace : ndarray of shape (tile_rows, k) or None
+        Preallocated buffer for the per-tile distance block
+        (see `allocate_workspace`). Its dtype is the compute dtype.
+    dtype : {float32, float64} or None
+        Compute dtype (see `resolve_dtype`). Tiles of X and the centroids
+        are cast to it as needed, so X is never converted as a whole.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+    min_sq_dist : ndarray of shape (n_samples,)
+    """
+    n_samples = X.shape[0]
+    k = centroids.shape[0]
+    if X.shape[1] != centroids.shape[1]:
+        raise ValueError("X and centroids must have the same number of features.")
+
+    dtype = workspace.dtype if workspace is not None else resolve_dtype(X, dtype)
+    if labels_out is None:
+        labels_out = np.empty(n_samples, dtype=np.intp)
+    if distances_out is None:
+        distances_out = np.empty(n_samples, dtype=dtype)
+    if workspace is None:
+        workspace = allocate_workspace(n_samples, k, dtype, memory_budget)
+    rows = workspace.shape[0]
+
+    centroids = centroids.astype(dtype, copy=False)
+    c_sq_norms = np.einsum("ij,ij->i", centroids, centroids)
+    for sl in iter_chunks(n_samples, rows):
+        block = X[sl].astype(dtype, copy=False)
+        tile = workspace[: block.shape[0]]
+        # The ||x||^2 term does not change the argmin; add it afterwards only
+        # to the selected distances.
+        np.dot(block, centroids.T, out=tile)
+        tile *= -2.0
+        tile += c_sq_norms[np.newaxis, :]
+        labels = np.argmin(tile, axis=1, out=labels_out[sl])
+        best = tile[np.arange(block.shape[0]), labels]
+        if x_sq_norms is None:
+            best += np.einsum("ij,ij->i", block, block)
+        else:
+            best += x_sq_norms[sl]
+        np.maximum(best, 0.0, out=best)
+        distances_out[sl] = best
+
+    return labels_out, distances_out
+
+
+def allocate_workspace(
+    n_samples: int,
+    k: int,
+    dtype: np.dtype = np.float64,
+    memory_budget: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Allocate the reusable per-tile distance block used by `nearest_centroid`.
+
+    Returns
+    -------
+    workspace : ndarray of shape (tile_rows, k)
+    """
+    dtype = np.dtype(dtype)
+    rows = chunk_rows(n_samples, k, dtype.itemsize, memory_budget)
+    return np.empty((rows, k), dtype=dtype)
+
+
+def labelled_sq_distances_sum(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
+    dtype: Any = None,
+) -> float:
+    """
+    Sum of squared distances of each row of X to its assigned centroid.
+
+    The differences are formed tile by tile in the compute dtype (see
+    `resolve_dtype`), so the temporary memory is bounded by `memory_budget`
+    rather than by the size of X. Per-row distances are summed in float64.
+
+    Returns
+    -------
+    total : float
+    """
+    n_samples, n_features = X.shape
+    dtype = resolve_dtype(X, dtype)
+    centroids = centroids.astype(dtype, copy=False)
+    rows = chunk_rows(n_samples, n_features, dtype.itemsize, memory_budget)
+    total = 0.0
+    for sl in iter_chunks(n_samples, rows):
+        diff = np.subtract(X[sl], centroids[labels[sl]], dtype=dtype)
+        total += float(np.einsum("ij,ij->i", diff, diff).sum(dtype=np.float64))
+    return total
@@ -6,18 +6,58 @@
 
 from __future__ import annotations
 
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from statistics import NormalDist
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
 
 import numpy as np
-from sklearn.metrics import silhouette_score
 
-from .algorithms import kmeans, sklearn_kmeans
+from .algorithms import effective_n_jobs, kmeans, sklearn_kmeans
+from .distances import (
+    DEFAULT_MEMORY_BUDGET,
+    chunk_rows,
+    iter_chunks,
+    labelled_sq_distances_sum,
+    nearest_centroid,
+    pairwise_sq_distances,
+    resolve_dtype,
+)
+from .sampling import stratified_sample
+
+# scikit-learn's metrics are imported inside the functions that use them, so
+# that importing this module does not load scikit-learn.
+
+
+def _n_clusters(labels: np.ndarray) -> int:
+    """
+    Number of distinct labels. Non-negative integer labels are counted with
+    a bincount, which unlike np.unique does not sort a copy of them.
+    """
+    if labels.size and np.can_cast(labels.dtype, np.intp) and labels.min() >= 0:
+        return int(np.count_nonzero(np.bincount(labels)))
+    return len(np.unique(labels))
+
+
+def _sklearn_working_memory(memory_budget: Optional[int], n_samples: int) -> Any:
+    """
+    scikit-learn config context in which pairwise distances between
+    n_samples points are computed in chunks of about memory_budget bytes
+    (DEFAULT_MEMORY_BUDGET if None, at least one row) instead of 1 GiB.
+    """
+    from sklearn import config_context
+
+    if memory_budget is None:
+        memory_budget = DEFAULT_MEMORY_BUDGET
+    return config_context(working_memory=max(memory_budget, 8 * n_samples) / 1024 ** 2)
 
 
 def compute_inertia(
     X: np.ndarray,
     labels: np.ndarray,
     centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
+    dtype: Any = None,
 ) -> float:
     """
     Compute the within-cluster sum of squared distances (inertia).
@@ -27,6 +67,11 @@ def compute_inertia(
     X : ndarray of shape (n_samples, n_features)
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features)
+    memory_budget : int or None
+        Budget in bytes for the temporaries of one tile of X.
+    dtype : {"float32", "float64"} or None
+        Dtype of the per-sample differences; defaults to that of X. The
+        total is always accumulated in float64.
 
     Returns
     -------
@@ -35,26 +80,446 @@ def compute_inertia(
     if X.shape[0] != labels.shape[0]:
         raise ValueError("X and labels must have the same number of samples.")
 
-    distances = X - centroids[labels]
-    sq_dist = np.sum(distances ** 2)
-    return float(sq_dist)
+    return labelled_sq_distances_sum(
+        X, labels, centroids, memory_budget=memory_budget, dtype=dtype
+    )
 
 
 def silhouette_score_sklearn(
     X: np.ndarray,
     labels: np.ndarray,
+    memory_budget: Optional[int] = None,
 ) -> float:
     """
     Compute the silhouette score using scikit-learn.
 
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    memory_budget : int or None
+        Budget in bytes for each chunk of pairwise distances.
+
     Returns
     -------
     score : float
     """
     # Silhouette is only defined when there are at least 2 clusters
-    if len(np.unique(labels)) < 2:
+    if _n_clusters(labels) < 2:
+        raise ValueError("Silhouette score requires at least 2 clusters.")
+    from sklearn.metrics import silhouette_score
+
+    with _sklearn_working_memory(memory_budget, X.shape[0]):
+        return float(silhouette_score(X, labels))
+
+
+def silhouette_score_sampled(
+    X: np.ndarray,
+    labels: np.ndarray,
+    sample_size: int = 10_000,
+    confidence: float = 0.95,
+    random_state: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+) -> Tuple[float, Tuple[float, float]]:
+    """
+    Estimate the silhouette score from a sample stratified by cluster.
+
+    The silhouette of each sampled point is computed within the sample
+    (O(sample_size^2) instead of O(n^2)). The per-cluster means are combined
+    with the cluster proportions of the full data, and a normal-approximation
+    confidence interval accounts for the sampling variance (with finite
+    population correction).
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    sample_size : int, default 10000
+        Approximate number of points in the sample.
+    confidence : float, default 0.95
+        Confidence level of the interval.
+    random_state : int or None
+    memory_budget : int or None
+        Budget in bytes for each chunk of pairwise distances within the
+        sample, which would otherwise take up to 1 GiB.
+
+    Returns
+    -------
+    score : float
+    interval : (float, float)
+        Lower and upper bounds of the confidence interval.
+    """
+    if _n_clusters(labels) < 2:
+        raise ValueError("Silhouette score requires at least 2 clusters.")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0 and 1.")
+
+    from sklearn.metrics import silhouette_samples
+
+    rng = np.random.RandomState(random_state)
+    idx = stratified_sample(labels, sample_size, rng)
+    with _sklearn_working_memory(memory_budget, idx.size):
+        values = silhouette_samples(X[idx], labels[idx])
+    sample_labels = labels[idx]
+
+    clusters, sizes = np.unique(labels, return_counts=True)
+    weights = sizes / sizes.sum()
+    score = 0.0
+    variance = 0.0
+    for cluster, size, weight in zip(clusters, sizes, weights):
+        s_h = values[sample_labels == cluster]
+        score += weight * s_h.mean()
+        if s_h.size > 1:
+            variance += weight ** 2 * s_h.var(ddof=1) / s_h.size * (1.0 - s_h.size / size)
+
+    half_width = NormalDist().inv_cdf(0.5 + confidence / 2.0) * np.sqrt(variance)
+    return float(score), (float(score - half_width), float(score + half_width))
+
+
+def simplified_silhouette(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
+) -> float:
+    """
+    Centroid-based (simplified) silhouette score in O(n_samples * k).
+
+    For each point, a is the distance to its own centroid and b the distance
+    to the closest other centroid; the score is the mean of (b - a) / max(a, b).
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    centroids : ndarray of shape (k, n_features)
+    memory_budget : int or None
+        Budget in bytes for the per-tile distance block.
+
+    Returns
+    -------
+    score : float
+    """
+    if _n_clusters(labels) < 2:
+        raise ValueError("Silhouette score requires at least 2 clusters.")
+
+    n_samples = X.shape[0]
+    # Centroids in the dtype of X, so that tiles of X are not upcast.
+    centroids = centroids.astype(resolve_dtype(X), copy=False)
+    rows = chunk_rows(n_samples, centroids.shape[0], X.itemsize, memory_budget)
+    total = 0.0
+    for sl in iter_chunks(n_samples, rows):
+        dist = pairwise_sq_distances(X[sl], centroids)
+        np.sqrt(dist, out=dist)
+        local = np.arange(dist.shape[0])
+        own = labels[sl]
+        a = dist[local, own]
+        dist[local, own] = np.inf
+        b = dist.min(axis=1)
+        denom = np.maximum(a, b)
+        # s = (b - a) / max(a, b), in place in b; b - a is 0 where a = b = 0.
+        b -= a
+        np.divide(b, denom, out=b, where=denom > 0)
+        total += float(b.sum(dtype=np.float64))
+    return total / n_samples
+
+
+# Silhouette strategies understood by evaluate_silhouette.
+SILHOUETTE_METHODS = ("auto", "exact", "sampled", "simplified")
+
+# Smallest sample worth using for a sampled silhouette under a time budget;
+# below this, the simplified silhouette is used instead.
+_MIN_SILHOUETTE_SAMPLE = 200
+
+
+def evaluate_silhouette(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: Optional[np.ndarray] = None,
+    method: str = "auto",
+    sample_size: int = 10_000,
+    time_budget: Optional[float] = None,
+    confidence: float = 0.95,
+    random_state: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Silhouette score with a strategy suited to the size of the data.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    centroids : ndarray of shape (k, n_features) or None
+        Needed for the "simplified" method.
+    method : {"auto", "exact", "sampled", "simplified"}, default "auto"
+        "auto" uses the exact score when n_samples <= sample_size and the
+        sampled estimate otherwise. With a time budget, the sample is shrunk
+        to fit it, falling back to the simplified score (when centroids are
+        given) if too few points could be afforded.
+    sample_size : int, default 10000
+        Sample size of the "sampled" method.
+    time_budget : float or None
+        Approximate time budget in seconds for the "auto" method, enforced by
+        extrapolating the quadratic cost of a small pilot computation.
+    confidence : float, default 0.95
+        Confidence level of the interval of the "sampled" method.
+    random_state : int or None
+    memory_budget : int or None
+        Budget in bytes for the distance blocks: per tile of X for the
+        "simplified" method, per chunk of pairwise distances otherwise.
+
+    Returns
+    -------
+    result : dict
+        "silhouette" (float), "silhouette_method" (the method actually used),
+        "silhouette_ci" ((low, high) for "sampled", else None) and
+        "silhouette_sample_size" (number of points used, or None).
+    """
+    if method not in SILHOUETTE_METHODS:
+        raise ValueError(f"Unknown silhouette method '{method}'. Use one of {SILHOUETTE_METHODS}.")
+    if _n_clusters(labels) < 2:
         raise ValueError("Silhouette score requires at least 2 clusters.")
-    return float(silhouette_score(X, labels))
+    n_samples = X.shape[0]
+
+    if method == "auto":
+        method = "exact" if n_samples <= sample_size else "sampled"
+        if time_budget is not None:
+            affordable = _affordable_sample_size(X, labels, time_budget, random_state)
+            if affordable < min(n_samples, sample_size):
+                sample_size = affordable
+                method = "sampled"
+            if sample_size < _MIN_SILHOUETTE_SAMPLE and centroids is not None:
+                method = "simplified"
+
+    if method == "exact":
+        return {
+            "silhouette": silhouette_score_sklearn(X, labels, memory_budget=memory_budget),
+            "silhouette_method": "exact",
+            "silhouette_ci": None,
+            "silhouette_sample_size": n_samples,
+        }
+    if method == "simplified":
+        if centroids is None:
+            raise ValueError("The simplified silhouette requires centroids.")
+        return {
+            "silhouette": simplified_silhouette(
+                X, labels, centroids, memory_budget=memory_budget
+            ),
+            "silhouette_method": "simplified",
+            "silhouette_ci": None,
+            "silhouette_sample_size": None,
+        }
+    score, interval = silhouette_score_sampled(
+        X,
+        labels,
+        sample_size=sample_size,
+        confidence=confidence,
+        random_state=random_state,
+        memory_budget=memory_budget,
+    )
+    return {
+        "silhouette": score,
+        "silhouette_method": "sampled",
+        "silhouette_ci": interval,
+        "silhouette_sample_size": min(sample_size, n_samples),
+    }
+
+
+def silhouette_metrics(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: Optional[np.ndarray] = None,
+    method: str = "auto",
+    sample_size: int = 10_000,
+    time_budget: Optional[float] = None,
+    random_state: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    `evaluate_silhouette` for a metrics table: method "none" is accepted,
+    and the entries are None when it is given or when the score is
+    undefined (fewer than 2 clusters). Other errors, such as an unknown
+    method, are raised.
+
+    Returns
+    -------
+    result : dict
+        The keys of `evaluate_silhouette`.
+    """
+    if method == "none" or _n_clusters(labels) < 2:
+        return {
+            "silhouette": None,
+            "silhouette_method": None,
+            "silhouette_ci": None,
+            "silhouette_sample_size": None,
+        }
+    return evaluate_silhouette(
+        X,
+        labels,
+        centroids=centroids,
+        method=method,
+        sample_size=sample_size,
+        time_budget=time_budget,
+        random_state=random_state,
+        memory_budget=memory_budget,
+    )
+
+
+def _affordable_sample_size(
+    X: np.ndarray,
+    labels: np.ndarray,
+    time_budget: float,
+    random_state: Optional[int],
+) -> int:
+    """
+    Largest sample whose silhouette should take about time_budget seconds,
+    extrapolated quadratically from a small pilot computation.
+    """
+    from sklearn.metrics import silhouette_samples
+
+    pilot_size = min(X.shape[0], 500)
+    idx = stratified_sample(labels, pilot_size, np.random.RandomState(random_state))
+    start = time.perf_counter()
+    silhouette_samples(X[idx], labels[idx])
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    return int(idx.size * np.sqrt(time_budget / elapsed))
+
+
+def _cluster_sse(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+) -> np.ndarray:
+    """
+    Sum of squared distances to the centroid, per cluster.
+    """
+    k = centroids.shape[0]
+    sse = np.zeros(k)
+    rows = chunk_rows(X.shape[0], X.shape[1], X.itemsize)
+    for sl in iter_chunks(X.shape[0], rows):
+        diff = X[sl] - centroids[labels[sl]]
+        sse += np.bincount(labels[sl], weights=np.einsum("ij,ij->i", diff, diff), minlength=k)
+    return sse
+
+
+def _split_highest_sse(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    n_splits: int,
+) -> np.ndarray:
+    """
+    Add n_splits centroids by repeatedly splitting the cluster with the
+    highest SSE into two centres placed one standard deviation (per feature)
+    either side of its centroid.
+
+    A cluster with no spread (one member, or identical members) cannot be
+    split that way: the new centroid is then the point farthest from every
+    centroid, the most likely k-means++ draw.
+    """
+    centroids = np.array(centroids, dtype=float)
+    labels = np.array(labels)
+    for _ in range(n_splits):
+        sse = _cluster_sse(X, labels, centroids)
+        worst = int(np.argmax(sse))
+        members = np.flatnonzero(labels == worst)
+        offset = X[members].std(axis=0) if members.size > 1 else np.zeros(X.shape[1])
+        if not offset.any():
+            _, sq_dist = nearest_centroid(X, centroids)
+            farthest = int(np.argmax(sq_dist))
+            centroids = np.vstack([centroids, X[farthest]])
+            labels[farthest] = centroids.shape[0] - 1
+            continue
+        centre = centroids[worst].copy()
+        centroids[worst] = centre - offset
+        centroids = np.vstack([centroids, centre + offset])
+        # Share the members of the split cluster between its two halves.
+        new_id = centroids.shape[0] - 1
+        diff_old = X[members] - centroids[worst]
+        diff_new = X[members] - centroids[new_id]
+        closer = np.einsum("ij,ij->i", diff_new, diff_new) < np.einsum("ij,ij->i", diff_old, diff_old)
+        labels[members[closer]] = new_id
+    return centroids
+
+
+def iter_elbow_curve(
+    X: np.ndarray,
+    k_values: List[int],
+    random_state: Optional[int] = None,
+    use_sklearn: bool = True,
+    n_jobs: Optional[int] = None,
+    warm_start: bool = False,
+    memory_budget: Optional[int] = None,
+) -> Iterator[Tuple[int, float]]:
+    """
+    Yield (k, inertia) pairs for the elbow method as each fit completes.
+
+    Parameters
+    ----------
+    X : ndarray
+    k_values : list of int
+    random_state : int or None
+    use_sklearn : bool, default True
+        If True, use scikit-learn KMeans; otherwise use manual kmeans.
+    n_jobs : int or None, default None
+        Number of k values fitted concurrently on a thread pool (None means
+        1, -1 means all CPUs). Results are yielded in completion order.
+        Ignored when warm_start is True.
+    warm_start : bool, default False
+        If True, fit the k values in increasing order, initialising each fit
+        from the previous solution with its highest-SSE cluster(s) split in
+        two. This is sequential, but each fit needs few iterations.
+    memory_budget : int or None
+        Budget in bytes for the per-tile temporaries of the manual kmeans
+        fits and of the inertias.
+
+    Yields
+    ------
+    k : int
+    inertia : float
+    """
+    for k in k_values:
+        if k <= 0:
+            raise ValueError("All k values must be positive integers.")
+
+    def _fit(k: int, init: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if use_sklearn:
+            if init is None:
+                return sklearn_kmeans(X, k, random_state=random_state)
+            return sklearn_kmeans(X, k, random_state=random_state, init=init)
+        return kmeans(
+            X,
+            k,
+            random_state=random_state,
+            init="random" if init is None else init,
+            memory_budget=memory_budget,
+        )
+
+    if warm_start:
+        labels = centroids = None
+        for k in sorted(set(k_values)):
+            init = None
+            if centroids is not None:
+                init = _split_highest_sse(X, labels, centroids, k - centroids.shape[0])
+            labels, centroids = _fit(k, init)
+            yield k, compute_inertia(X, labels, centroids, memory_budget=memory_budget)
+        return
+
+    def _inertia(k: int) -> Tuple[int, float]:
+        labels, centroids = _fit(k)
+        return k, compute_inertia(X, labels, centroids, memory_budget=memory_budget)
+
+    n_workers = min(effective_n_jobs(n_jobs), len(k_values))
+    if n_workers <= 1:
+        for k in k_values:
+            yield _inertia(k)
+        return
+
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(_inertia, k) for k in k_values]
+        for future in as_completed(futures):
+            yield future.result()
 
 
 def elbow_curve(
@@ -62,6 +527,10 @@ def elbow_curve(
     k_values: List[int],
     random_state: Optional[int] = None,
     use_sklearn: bool = True,
+    n_jobs: Optional[int] = None,
+    warm_start: bool = False,
+    callback: Optional[Callable[[int, float], None]] = None,
+    memory_budget: Optional[int] = None,
 ) -> Dict[int, float]:
     """
     Compute inertia values for multiple K values (elbow method).
@@ -73,22 +542,33 @@ def elbow_curve(
     random_state : int or None
     use_sklearn : bool, default True
         If True, use scikit-learn KMeans; otherwise use manual kmeans.
+    n_jobs : int or None, default None
+        Number of k values fitted concurrently (see `iter_elbow_curve`).
+    warm_start : bool, default False
+        Initialise each k from the previous solution (see `iter_elbow_curve`).
+    callback : callable or None, default None
+        Called as callback(k, inertia) as soon as each k completes.
+    memory_budget : int or None
+        Budget in bytes for the per-tile temporaries (see `iter_elbow_curve`).
 
     Returns
     -------
     inertia_dict : dict
-        Mapping from k to inertia.
+        Mapping from k to inertia, in the order of k_values.
     """
-    inertia_dict: Dict[int, float] = {}
-
-    for k in k_values:
-        if k <= 0:
-            raise ValueError("All k values must be positive integers.")
-        if use_sklearn:
-            labels, centroids = sklearn_kmeans(X, k, random_state=random_state)
-        else:
-            labels, centroids = kmeans(X, k, random_state=random_state)
-        inertia = compute_inertia(X, labels, centroids)
-        inertia_dict[k] = inertia
+    completed: Dict[int, float] = {}
+    for k, inertia in iter_elbow_curve(
+        X,
+        k_values,
+        random_state=random_state,
+        use_sklearn=use_sklearn,
+        n_jobs=n_jobs,
+        warm_start=warm_start,
+        memory_budget=memory_budget,
+    ):
+        completed[k] = inertia
+        if callback is not None:
+            callback(k, inertia)
 
-    return inertia_dict
\ No newline at end of file
+    inertia_dict: Dict[int, float] = {k: completed[k] for k in k_values}
+    return inertia_dict
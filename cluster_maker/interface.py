@@ -6,16 +6,52 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
+import os
+import tempfile
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-from .preprocessing import select_features, standardise_features
-from .algorithms import kmeans, sklearn_kmeans
-from .evaluation import compute_inertia, elbow_curve, silhouette_score_sklearn
+from .preprocessing import (
+    StreamingStandardiser,
+    apply_standardisation,
+    select_features,
+)
+from .algorithms import (
+    REFIT_METHODS,
+    bisecting_kmeans,
+    incremental_kmeans,
+    kmeans,
+    sklearn_kmeans,
+    minibatch_kmeans,
+)
+from .distances import (
+    COMPUTE_DTYPES,
+    DEFAULT_MEMORY_BUDGET,
+    chunk_rows,
+    iter_chunks,
+    nearest_centroid,
+)
+from .evaluation import (
+    SILHOUETTE_METHODS,
+    compute_inertia,
+    elbow_curve,
+    silhouette_metrics,
+)
 from .plotting_clustered import plot_clusters_2d, plot_elbow
-from .data_exporter import export_to_csv
+from .data_exporter import export_data, export_labels, export_to_csv
+from .data_loader import (
+    detect_format,
+    iter_data_chunks,
+    load_data,
+    npy_column_names,
+    open_npy,
+    read_columns,
+)
+from .persistence import load_model_arrays, save_model
+from .cache import DEFAULT_CACHE_MAX_BYTES, ResultCache
+from .profiling import StageProfiler, array_info
 
 
 def run_clustering(
@@ -28,37 +64,171 @@ def run_clustering(
     random_state: Optional[int] = None,
     compute_elbow: bool = False,
     elbow_k_values: Optional[List[int]] = None,
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    elbow_warm_start: bool = False,
+    silhouette: str = "auto",
+    silhouette_sample_size: int = 10_000,
+    silhouette_time_budget: Optional[float] = None,
+    profile_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+    trace_memory: bool = False,
+    output_labels_only: bool = False,
+    memory_map: bool = False,
+    standardise_in_place: bool = False,
+    dtype: Any = "float64",
+    model_path: Optional[str] = None,
+    plot: str = "eager",
+    plot_options: Optional[Dict[str, Any]] = None,
+    scaler_path: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    refit_from: Optional[str] = None,
+    refit: str = "refine",
 ) -> Dict[str, Any]:
     """
     High-level function to run the full clustering workflow.
 
     Steps:
-    1. Load data from CSV
+    1. Load data (CSV, Feather/Arrow IPC, Parquet or .npy)
     2. Select feature columns
     3. Optionally standardise features
     4. Run the chosen clustering algorithm
     5. Compute evaluation metrics
     6. Generate plots
-    7. Optionally write labelled data to CSV
+    7. Optionally write labelled data (or only the labels)
 
     Parameters
     ----------
     input_path : str
-        Path to the input CSV file.
+        Path to the input file. The format is detected from the extension:
+        .csv, .feather/.arrow/.ipc, .parquet (both need pyarrow) or .npy
+        (a 2D numeric array whose columns are named "0", "1", ...).
     feature_cols : list of str
         Names of feature columns to use.
-    algorithm : {"kmeans", "sklearn_kmeans"}, default "kmeans"
+    algorithm : {"kmeans", "sklearn_kmeans", "bisecting_kmeans"}, default "kmeans"
+        "bisecting_kmeans" (see `algorithms.bisecting_kmeans`) suits large
+        k: its cost grows with the depth of the tree of splits rather than
+        with k, and the elbow curve is read from its split history instead
+        of one fit per k value (the splits continue up to the largest
+        elbow k). Not available with `chunk_size` or `memory_map`.
     k : int, default 3
         Number of clusters.
     standardise : bool, default True
     output_path : str or None, default None
-        If provided, the input data with cluster labels will be saved to this CSV.
+        If provided, the input data with cluster labels will be saved to this
+        file, in the format given by its extension.
     random_state : int or None, default None
     compute_elbow : bool, default False
         If True, compute inertia for multiple k values.
     elbow_k_values : list of int or None, default None
         k-values for elbow curve. If None and compute_elbow is True, defaults
         to range 1..(k+5).
+    chunk_size : int or None, default None
+        If provided, run in streaming mode: the input is read `chunk_size`
+        rows at a time, clustered with mini-batch K-means and the labelled
+        output is written chunk by chunk, so memory is bounded by the chunk
+        size. Only algorithm="kmeans" and CSV output are supported.
+        Silhouette, plots and the elbow curve are computed on a uniform
+        random sample of at most 10,000 rows, and "data" and "labels" are
+        None in the result.
+    n_jobs : int or None, default None
+        Number of k values of the elbow curve fitted concurrently
+        (None means 1, -1 means all CPUs).
+    elbow_warm_start : bool, default False
+        If True, initialise each k of the elbow curve from the k-1 solution
+        with its highest-SSE cluster split in two (sequential).
+    silhouette : {"auto", "exact", "sampled", "simplified", "none"}, default "auto"
+        Silhouette strategy (see `evaluation.evaluate_silhouette`). "auto"
+        computes the exact score for up to `silhouette_sample_size` rows and
+        a stratified sampled estimate with a confidence interval above that.
+        "none" skips the silhouette.
+    silhouette_sample_size : int, default 10000
+    silhouette_time_budget : float or None, default None
+        Approximate cap in seconds on the silhouette computation ("auto").
+    profile_hook : callable or None, default None
+        Called with the record of each pipeline stage as soon as it ends
+        (see `profiling.StageProfiler`).
+    trace_memory : bool, default False
+        If True, also record the tracemalloc peak of each stage.
+    output_labels_only : bool, default False
+        If True, only the feature columns are read from the input, and the
+        output file holds just a "row" index and the "cluster" label
+        instead of a copy of the full input. "data" then contains only the
+        feature columns and "cluster".
+    memory_map : bool, default False
+        If True, `input_path` must be a .npy file and the feature matrix is
+        used straight from the memory-mapped file: no DataFrame is built,
+        standardisation writes to a temporary memory-mapped file (or the
+        input itself, see `standardise_in_place`), and clustering and
+        inertia work on it in bounded chunks, so the extra memory stays a
+        small fraction of the feature matrix. Feature columns are the
+        column numbers as strings ("0", "1", ...); selecting a subset of
+        them, or a file stored in another dtype than `dtype`, costs one
+        copy to a temporary file.
+        If `output_path` is given only the labels are written (as with
+        `output_labels_only`). The cluster plot shows a uniform sample of
+        at most 10,000 rows. silhouette="auto" uses the simplified
+        silhouette, whose memory is bounded like the rest of the run (the
+        other methods hold a sample's pairwise distances in memory).
+        "data" is None in the result.
+    standardise_in_place : bool, default False
+        With `memory_map`, standardise the input .npy file in place
+        (the file is overwritten) instead of using a temporary file.
+    dtype : {"float32", "float64"}, default "float64"
+        Dtype of the feature matrix and of the distance computations.
+        float32 halves the memory of X; centroids, centroid sums and
+        inertias are still accumulated in float64.
+    model_path : str or None, default None
+        If provided, save the centroids with the standardisation mean and
+        scale and the feature names to this model file (see
+        `persistence.save_model`), so that new points can be assigned with
+        `persistence.load_model(model_path).predict(...)`.
+    scaler_path : str or None, default None
+        Standardisation parameters file (see
+        `preprocessing.StreamingStandardiser.save`). If it exists, the mean
+        and scale are read from it instead of being computed, so repeated
+        runs over the same data skip that pass; its feature names must
+        match `feature_cols`. Otherwise they are computed and saved there.
+    cache_dir : str or None, default None
+        Directory of an on-disk result cache (see `cache.ResultCache`).
+        Labels, centroids, standardisation parameters and metrics of the
+        main fit, and the elbow inertias, are cached under a SHA-256 hash
+        of the input file plus the parameters they depend on, and reused
+        by later runs: the fit, inertia, silhouette and elbow stages are
+        skipped (the data are still loaded and standardised for the
+        result, the exports and the plots). The elbow curve is cached
+        separately, so e.g. enabling `compute_elbow` reuses the cached fit.
+        Runs with random_state=None are not cached, and
+        `silhouette_time_budget` is not part of the key (a cached silhouette
+        may come from a run with another budget). Not available with
+        `chunk_size` or `memory_map`.
+    cache_max_bytes : int, default 512 MiB
+        Size of the cache above which the least recently used entries are
+        evicted.
+    refit_from : str or None, default None
+        Model file saved by an earlier run (`model_path`) on the same input,
+        to update that fit instead of starting from random centroids, e.g.
+        after rows were appended to the input. Its standardisation mean and
+        scale are reused, and k, feature_cols and standardise must match.
+        Save the new fit with `model_path` to refit again later.
+    refit : {"online", "refine"}, default "refine"
+        With `refit_from`: "online" updates the centroids with the rows
+        added since the saved fit only (one pass over them), "refine" runs
+        K-means iterations over all rows warm-started from the saved
+        centroids, which takes fewer iterations than a fresh fit (how many
+        fewer depends on how much the new rows move the clusters). See
+        `algorithms.incremental_kmeans`.
+    plot : {"eager", "deferred", "none"}, default "eager"
+        "eager" builds the figures during the run. "deferred" skips them
+        and returns a "render_plots" callable that builds them on demand
+        (it keeps a reference to the feature matrix, or to the plot sample
+        in streaming and memory_map modes). "none" skips plotting.
+    plot_options : dict or None, default None
+        Keyword arguments for `plot_clusters_2d`, e.g. style ("auto",
+        "scatter", "raster", "hexbin", "hist2d"), max_points or
+        output_path to render straight to a file. Figures are headless
+        (built without pyplot, so they are freed with the result) unless
+        {"headless": False} is given.
 
     Returns
     -------
@@ -67,75 +237,944 @@ def run_clustering(
         - "data": DataFrame with added "cluster" column
         - "labels": ndarray of cluster labels
         - "centroids": ndarray of cluster centroids
-        - "metrics": dict with "inertia" and optional "silhouette"
-        - "fig_cluster": Figure for the cluster plot
+        - "cluster_counts": ndarray with the number of rows per cluster (for
+          an online refit, of all rows the centroids were fitted on)
+        - "metrics": dict with "inertia" and "silhouette" (None if not
+          computed), plus "silhouette_method", "silhouette_ci" and
+          "silhouette_sample_size"
+        - "fig_cluster": Figure for the cluster plot (None unless plot is
+          "eager")
         - "fig_elbow": Figure for the elbow plot or None
+        - "render_plots": with plot="deferred", a callable returning
+          (fig_cluster, fig_elbow); otherwise None
         - "elbow_inertias": dict mapping k -> inertia (if computed)
+        - "profile": dict mapping stage name ("load", "select", "cache",
+          "standardise", "fit", "inertia", "silhouette", "export", "plot",
+          "elbow") to its record: wall and CPU time, peak RSS, optional
+          tracemalloc peak and array sizes. Stages served from the cache
+          are absent; the "cache" record holds the lookup "hits". For algorithm="kmeans" the
+          "fit" record also holds the kmeans info, including the
+          per-iteration "history"; for "bisecting_kmeans", "n_splits",
+          "depth" and "n_iter".
+        - "n_samples": number of rows (streaming and memory_map modes only)
     """
+    if silhouette != "none" and silhouette not in SILHOUETTE_METHODS:
+        raise ValueError(
+            f"Unknown silhouette method '{silhouette}'. "
+            "Use 'auto', 'exact', 'sampled', 'simplified' or 'none'."
+        )
+    if plot not in PLOT_MODES:
+        raise ValueError(f"Unknown plot mode '{plot}'. Use 'eager', 'deferred' or 'none'.")
+    dtype = np.dtype(dtype)
+    if dtype not in COMPUTE_DTYPES:
+        raise ValueError(f"dtype must be float32 or float64, got {dtype}.")
+    silhouette_options = {
+        "method": silhouette,
+        "sample_size": silhouette_sample_size,
+        "time_budget": silhouette_time_budget,
+        "random_state": random_state,
+    }
+
+    # Shared by every mode: the elbow curve runs over k = 1..k+5 by default.
+    elbow_options = None
+    if compute_elbow:
+        if elbow_k_values is None:
+            elbow_k_values = list(range(1, max(2, k + 5) + 1))
+        elbow_options = {
+            "k_values": elbow_k_values,
+            "random_state": random_state,
+            "n_jobs": n_jobs,
+            "warm_start": elbow_warm_start,
+        }
+
+    if cache_dir is not None and (memory_map or chunk_size is not None):
+        raise ValueError("cache_dir cannot be used with chunk_size or memory_map.")
+    if refit not in REFIT_METHODS:
+        raise ValueError(f"Unknown refit method '{refit}'. Use 'online' or 'refine'.")
+    if refit_from is not None:
+        if memory_map or chunk_size is not None or cache_dir is not None:
+            raise ValueError("refit_from cannot be used with chunk_size, memory_map or cache_dir.")
+        if algorithm != "kmeans":
+            raise ValueError("refit_from needs algorithm='kmeans'.")
+
+    if memory_map:
+        if chunk_size is not None:
+            raise ValueError("memory_map and chunk_size cannot be used together.")
+        return _run_clustering_memmap(
+            input_path,
+            feature_cols,
+            algorithm=algorithm,
+            k=k,
+            standardise=standardise,
+            standardise_in_place=standardise_in_place,
+            output_path=output_path,
+            random_state=random_state,
+            elbow_options=elbow_options,
+            silhouette_options=silhouette_options,
+            profiler=StageProfiler(trace_memory=trace_memory, hook=profile_hook),
+            dtype=dtype,
+            model_path=model_path,
+            plot=plot,
+            plot_options=plot_options,
+            scaler_path=scaler_path,
+        )
+
+    if chunk_size is not None:
+        return _run_clustering_streaming(
+            input_path,
+            feature_cols,
+            algorithm=algorithm,
+            k=k,
+            standardise=standardise,
+            output_path=output_path,
+            random_state=random_state,
+            elbow_options=elbow_options,
+            chunk_size=chunk_size,
+            silhouette_options=silhouette_options,
+            profiler=StageProfiler(trace_memory=trace_memory, hook=profile_hook),
+            output_labels_only=output_labels_only,
+            dtype=dtype,
+            model_path=model_path,
+            plot=plot,
+            plot_options=plot_options,
+            scaler_path=scaler_path,
+        )
+
+    profiler = StageProfiler(trace_memory=trace_memory, hook=profile_hook)
+
     # Load data
-    df = pd.read_csv(input_path)
+    with profiler.stage("load") as record:
+        df = load_data(input_path, columns=feature_cols if output_labels_only else None)
+        record["arrays"]["data"] = array_info(df)
 
     # Select and optionally standardise features
-    X_df = select_features(df, feature_cols)
-    X = X_df.to_numpy(dtype=float)
+    with profiler.stage("select") as record:
+        # A private, writeable X when it is standardised in place below.
+        X = select_features(df, feature_cols).to_numpy(dtype=dtype, copy=standardise)
+        record["arrays"]["X"] = array_info(X)
+
+    # Look up cached results: the main fit and the elbow curve are cached
+    # separately, so that either can be reused on its own.
+    cache = fit_key = elbow_key = None
+    cached_fit = cached_elbow = None
+    if cache_dir is not None and random_state is not None:
+        with profiler.stage("cache") as record:
+            cache = ResultCache(cache_dir, max_bytes=cache_max_bytes)
+            fit_key, elbow_key = _cache_keys(
+                cache,
+                input_path,
+                feature_cols,
+                algorithm,
+                k,
+                standardise,
+                random_state,
+                dtype,
+                silhouette_options,
+                elbow_k_values,
+                elbow_warm_start,
+            )
+            cached_fit = cache.get(fit_key)
+            if compute_elbow:
+                cached_elbow = cache.get(elbow_key)
+            record["hits"] = {"fit": cached_fit is not None, "elbow": cached_elbow is not None}
 
+    # A refit continues from a saved model, in its standardised space.
+    refit_model = None
+    if refit_from is not None:
+        refit_model = _load_refit_model(refit_from, feature_cols, k, standardise)
+
+    mean = scale = None
     if standardise:
-        X = standardise_features(X)
+        with profiler.stage("standardise") as record:
+            if cached_fit is not None:
+                mean, scale = cached_fit[1]["mean"], cached_fit[1]["scale"]
+            elif refit_model is not None:
+                mean, scale = refit_model[1]["mean"], refit_model[1]["scale"]
+            else:
+                mean, scale = _load_or_fit_scaler(
+                    scaler_path, feature_cols, lambda: StreamingStandardiser().fit(X)
+                )
+            apply_standardisation(X, mean, scale, out=X)
+            record["arrays"]["X"] = array_info(X)
 
-    # Run clustering
-    if algorithm == "kmeans":
-        labels, centroids = kmeans(X, k=k, random_state=random_state)
-    elif algorithm == "sklearn_kmeans":
-        labels, centroids = sklearn_kmeans(X, k=k, random_state=random_state)
+    # Inertias after each split of a bisecting K-means fit.
+    split_inertias: Optional[Dict[int, float]] = None
+    if cached_fit is not None:
+        metrics: Dict[str, Any] = cached_fit[0]["metrics"]
+        # JSON has no tuples: restore the interval as a fresh run returns it.
+        if metrics.get("silhouette_ci") is not None:
+            metrics["silhouette_ci"] = tuple(metrics["silhouette_ci"])
+        labels, centroids = cached_fit[1]["labels"], cached_fit[1]["centroids"]
+        counts = np.bincount(labels, minlength=k)
+        inertia = metrics["inertia"]
     else:
-        raise ValueError(f"Unknown algorithm '{algorithm}'. Use 'kmeans' or 'sklearn_kmeans'.")
-
-    # Compute metrics
-    inertia = compute_inertia(X, labels, centroids)
-    metrics: Dict[str, Any] = {"inertia": inertia}
+        # Run clustering
+        with profiler.stage("fit") as record:
+            counts = None
+            if refit_model is not None:
+                header, arrays = refit_model
+                n_previous = header["metadata"].get("n_samples", 0)
+                if n_previous > X.shape[0]:
+                    raise ValueError(
+                        f"The input has {X.shape[0]} rows, fewer than the {n_previous} "
+                        f"the model in '{refit_from}' was fitted on."
+                    )
+                if refit == "online" and "counts" not in arrays:
+                    raise ValueError(f"The model in '{refit_from}' has no cluster counts.")
+                labels, centroids, counts, record["refit"] = incremental_kmeans(
+                    arrays["centroids"],
+                    arrays.get("counts", np.zeros(k, dtype=np.int64)),
+                    X[n_previous:],
+                    X,
+                    method=refit,
+                    return_info=True,
+                    random_state=random_state,
+                )
+            elif algorithm == "kmeans":
+                labels, centroids, info = kmeans(X, k=k, random_state=random_state, return_info=True)
+                record["kmeans"] = info
+            elif algorithm == "sklearn_kmeans":
+                labels, centroids = sklearn_kmeans(X, k=k, random_state=random_state)
+            elif algorithm == "bisecting_kmeans":
+                labels, centroids, info = _fit_bisecting(
+                    X,
+                    k,
+                    random_state,
+                    elbow_k_values if compute_elbow and cached_elbow is None else None,
+                )
+                record["bisecting_kmeans"] = {
+                    key: info[key] for key in ("n_splits", "depth", "n_iter")
+                }
+                split_inertias = info["elbow_inertias"]
+            else:
+                raise ValueError(
+                    f"Unknown algorithm '{algorithm}'. "
+                    "Use 'kmeans', 'sklearn_kmeans' or 'bisecting_kmeans'."
+                )
+            record["arrays"]["centroids"] = array_info(centroids)
+        if counts is None:
+            counts = np.bincount(labels, minlength=k)
 
-    try:
-        sil = silhouette_score_sklearn(X, labels)
-    except ValueError:
-        sil = None
-    metrics["silhouette"] = sil
+        # Compute metrics
+        with profiler.stage("inertia"):
+            inertia = compute_inertia(X, labels, centroids)
+        metrics = {"inertia": inertia}
+        with profiler.stage("silhouette"):
+            metrics.update(silhouette_metrics(X, labels, centroids, **silhouette_options))
+        if cache is not None:
+            arrays = {"labels": labels, "centroids": centroids}
+            if mean is not None:
+                arrays.update(mean=mean, scale=scale)
+            cache.put(fit_key, {"metrics": metrics}, arrays)
 
     # Add labels to DataFrame
     df = df.copy()
     df["cluster"] = labels
 
-    # Export if requested
-    if output_path is not None:
-        export_to_csv(df, output_path, delimiter=",", include_index=False)
+    def write_output() -> None:
+        if output_labels_only:
+            export_labels(labels, output_path, index=df.index)
+        else:
+            export_data(df, output_path, include_index=False)
 
-    # Plot clusters (2D)
-    fig_cluster, _ = plot_clusters_2d(X, labels, centroids=centroids, title="Cluster plot")
+    _export_stage(
+        profiler,
+        write_output if output_path is not None else None,
+        model_path,
+        centroids,
+        mean,
+        scale,
+        feature_cols,
+        algorithm,
+        inertia,
+        counts,
+        X.shape[0],
+    )
 
-    # Optional elbow curve
-    fig_elbow = None
     elbow_inertias: Optional[Dict[int, float]] = None
-    if compute_elbow:
-        if elbow_k_values is None:
-            max_k = max(2, k + 5)
-            elbow_k_values = list(range(1, max_k + 1))
-        elbow_inertias = elbow_curve(
-            X,
-            k_values=elbow_k_values,
-            random_state=random_state,
-            use_sklearn=(algorithm == "sklearn_kmeans"),
+    if cached_elbow is not None:
+        elbow_inertias = dict(
+            zip(cached_elbow[1]["k_values"].tolist(), cached_elbow[1]["inertias"].tolist())
         )
-        fig_elbow, _ = plot_elbow(
-            elbow_k_values,
-            [elbow_inertias[val] for val in elbow_k_values],
+    figures = _plot_and_elbow_stages(
+        profiler,
+        plot,
+        plot_options,
+        X,
+        labels,
+        centroids,
+        elbow_options,
+        lambda: _elbow_inertias(X, algorithm, k, elbow_options, split_inertias),
+        elbow_inertias,
+    )
+    if cache is not None and cached_elbow is None and figures["elbow_inertias"] is not None:
+        cache.put(
+            elbow_key,
+            {},
+            {
+                "k_values": np.asarray(elbow_k_values),
+                "inertias": np.array(
+                    [figures["elbow_inertias"][val] for val in elbow_k_values]
+                ),
+            },
         )
 
     result: Dict[str, Any] = {
         "data": df,
         "labels": labels,
         "centroids": centroids,
+        "cluster_counts": counts,
         "metrics": metrics,
+        **figures,
+        "profile": profiler.as_dict(),
+    }
+    return result
+
+
+PLOT_MODES = ("eager", "deferred", "none")
+
+
+def _cache_keys(
+    cache: ResultCache,
+    input_path: str,
+    feature_cols: List[str],
+    algorithm: str,
+    k: int,
+    standardise: bool,
+    random_state: int,
+    dtype: np.dtype,
+    silhouette_options: Dict[str, Any],
+    elbow_k_values: Optional[List[int]],
+    elbow_warm_start: bool,
+) -> Tuple[str, str]:
+    """
+    Cache keys of the main fit and of the elbow curve of a run.
+    """
+    fingerprint = cache.fingerprint(input_path)
+    # The time budget is a wall-clock limit, not a parameter of the result.
+    silhouette = {
+        name: value for name, value in silhouette_options.items() if name != "time_budget"
+    }
+    common = {
+        "feature_cols": list(feature_cols),
+        "standardise": standardise,
+        "random_state": random_state,
+        "dtype": dtype.name,
+    }
+    fit_key = cache.key(
+        "fit",
+        fingerprint,
+        dict(common, algorithm=algorithm, k=k, silhouette=silhouette),
+    )
+    elbow_key = cache.key(
+        "elbow",
+        fingerprint,
+        dict(
+            common,
+            use_sklearn=algorithm == "sklearn_kmeans",
+            bisecting=algorithm == "bisecting_kmeans",
+            k_values=elbow_k_values,
+            warm_start=elbow_warm_start,
+        ),
+    )
+    return fit_key, elbow_key
+
+
+def _cluster_figure(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    plot_options: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Cluster plot of a run; headless unless plot_options say otherwise.
+    """
+    options: Dict[str, Any] = {"title": "Cluster plot", "headless": True}
+    options.update(plot_options or {})
+    fig, _ = plot_clusters_2d(X, labels, centroids=centroids, **options)
+    return fig
+
+
+def _elbow_figure(
+    k_values: List[int],
+    inertias: Dict[int, float],
+    plot_options: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Elbow plot of a run, headless like the cluster plot.
+    """
+    headless = (plot_options or {}).get("headless", True)
+    fig, _ = plot_elbow(k_values, [inertias[val] for val in k_values], headless=headless)
+    return fig
+
+
+def _plot_renderer(
+    plot: str,
+    X: Optional[np.ndarray],
+    labels: Optional[np.ndarray],
+    centroids: np.ndarray,
+    elbow_k_values: Optional[List[int]],
+    elbow_inertias: Optional[Dict[int, float]],
+    plot_options: Optional[Dict[str, Any]] = None,
+) -> Optional[Callable[[], Tuple[Any, Any]]]:
+    """
+    The "render_plots" entry of a result: for plot="deferred", a callable
+    building (fig_cluster, fig_elbow) from the captured data; else None.
+    """
+    if plot != "deferred":
+        return None
+
+    def render_plots() -> Tuple[Any, Any]:
+        fig_cluster = _cluster_figure(X, labels, centroids, plot_options)
+        fig_elbow = None
+        if elbow_inertias is not None:
+            fig_elbow = _elbow_figure(elbow_k_values, elbow_inertias, plot_options)
+        return fig_cluster, fig_elbow
+
+    return render_plots
+
+
+def _elbow_inertias(
+    X: np.ndarray,
+    algorithm: str,
+    k: int,
+    elbow_options: Dict[str, Any],
+    split_inertias: Optional[Dict[int, float]] = None,
+    memory_budget: Optional[int] = None,
+) -> Dict[int, float]:
+    """
+    Elbow curve of a run: one fit per k value, or for bisecting K-means
+    the inertias after each split (split_inertias, from the main fit if it
+    continued up to the largest k value).
+    """
+    k_values = elbow_options["k_values"]
+    if algorithm == "bisecting_kmeans":
+        if split_inertias is None:
+            _, _, info = _fit_bisecting(X, k, elbow_options["random_state"], k_values)
+            split_inertias = info["elbow_inertias"]
+        return {val: split_inertias[val] for val in k_values}
+    return elbow_curve(
+        X,
+        k_values=k_values,
+        random_state=elbow_options["random_state"],
+        use_sklearn=(algorithm == "sklearn_kmeans"),
+        n_jobs=elbow_options["n_jobs"],
+        warm_start=elbow_options["warm_start"],
+        memory_budget=memory_budget,
+    )
+
+
+def _plot_and_elbow_stages(
+    profiler: StageProfiler,
+    plot: str,
+    plot_options: Optional[Dict[str, Any]],
+    X: Optional[np.ndarray],
+    labels: Optional[np.ndarray],
+    centroids: np.ndarray,
+    elbow_options: Optional[Dict[str, Any]],
+    compute_elbow: Callable[[], Dict[int, float]],
+    elbow_inertias: Optional[Dict[int, float]] = None,
+) -> Dict[str, Any]:
+    """
+    The "plot" and "elbow" stages shared by every mode of `run_clustering`.
+
+    X and labels are the points to plot (all rows, or a sample). The elbow
+    curve is computed with compute_elbow() if elbow_options is not None,
+    unless elbow_inertias are given (e.g. from the cache). Returns the
+    "fig_cluster", "fig_elbow", "elbow_inertias" and "render_plots" entries
+    of the result.
+    """
+    fig_cluster = fig_elbow = None
+    if plot == "eager":
+        with profiler.stage("plot"):
+            fig_cluster = _cluster_figure(X, labels, centroids, plot_options)
+
+    k_values = None if elbow_options is None else elbow_options["k_values"]
+    if elbow_options is not None and elbow_inertias is None:
+        with profiler.stage("elbow"):
+            elbow_inertias = compute_elbow()
+            if plot == "eager":
+                fig_elbow = _elbow_figure(k_values, elbow_inertias, plot_options)
+    elif elbow_inertias is not None and plot == "eager":
+        fig_elbow = _elbow_figure(k_values, elbow_inertias, plot_options)
+
+    return {
         "fig_cluster": fig_cluster,
         "fig_elbow": fig_elbow,
         "elbow_inertias": elbow_inertias,
+        "render_plots": _plot_renderer(
+            plot, X, labels, centroids, k_values, elbow_inertias, plot_options
+        ),
+    }
+
+
+def _export_stage(
+    profiler: StageProfiler,
+    write_output: Optional[Callable[[], None]],
+    model_path: Optional[str],
+    centroids: np.ndarray,
+    mean: Optional[np.ndarray],
+    scale: Optional[np.ndarray],
+    feature_cols: List[str],
+    algorithm: str,
+    inertia: float,
+    counts: np.ndarray,
+    n_samples: int,
+) -> None:
+    """
+    The "export" stage: write_output() writes the labelled output (None if
+    there is none, or it was written already), and the fit is saved to
+    model_path if given.
+    """
+    if write_output is None and model_path is None:
+        return
+    with profiler.stage("export"):
+        if write_output is not None:
+            write_output()
+        if model_path is not None:
+            _save_fitted_model(
+                model_path, centroids, mean, scale, feature_cols, algorithm, inertia,
+                counts, n_samples,
+            )
+
+
+def _load_or_fit_scaler(
+    scaler_path: Optional[str],
+    feature_cols: List[str],
+    fit: Callable[[], StreamingStandardiser],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Standardisation mean and scale, read from scaler_path if it exists, else
+    computed with `fit()` (and saved to scaler_path if given).
+    """
+    if scaler_path is not None and os.path.exists(scaler_path):
+        scaler = StreamingStandardiser.load(scaler_path)
+        if scaler.feature_names_ != list(feature_cols):
+            raise ValueError(
+                f"The scaler in '{scaler_path}' was fitted on features "
+                f"{scaler.feature_names_}, not {list(feature_cols)}."
+            )
+    else:
+        scaler = fit()
+        scaler.feature_names_ = list(feature_cols)
+        if scaler_path is not None:
+            scaler.save(scaler_path)
+    return scaler.mean_, scaler.scale_
+
+
+def _save_fitted_model(
+    model_path: str,
+    centroids: np.ndarray,
+    mean: Optional[np.ndarray],
+    scale: Optional[np.ndarray],
+    feature_cols: List[str],
+    algorithm: str,
+    inertia: float,
+    counts: np.ndarray,
+    n_samples: int,
+) -> None:
+    """
+    Save the fitted centroids and scaler of a run to a model file, with the
+    cluster sizes and row count needed to refit it incrementally.
+    """
+    save_model(
+        model_path,
+        centroids,
+        mean=mean,
+        scale=scale,
+        feature_names=feature_cols,
+        metadata={
+            "algorithm": algorithm,
+            "k": int(centroids.shape[0]),
+            "inertia": float(inertia),
+            "n_samples": int(n_samples),
+        },
+        counts=counts,
+    )
+
+
+def _load_refit_model(
+    refit_from: str,
+    feature_cols: List[str],
+    k: int,
+    standardise: bool,
+) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Header and arrays of the model file a run is refitted from, checked
+    against the run's parameters.
+    """
+    header, arrays = load_model_arrays(refit_from)
+    if header.get("feature_names") != list(feature_cols):
+        raise ValueError(
+            f"The model in '{refit_from}' was fitted on features "
+            f"{header.get('feature_names')}, not {list(feature_cols)}."
+        )
+    if header["k"] != k:
+        raise ValueError(f"The model in '{refit_from}' has k={header['k']}, not {k}.")
+    if header["standardised"] != standardise:
+        raise ValueError(
+            f"The model in '{refit_from}' was fitted with standardise={header['standardised']}."
+        )
+    return header, arrays
+
+
+def _fit_bisecting(
+    X: np.ndarray,
+    k: int,
+    random_state: Optional[int],
+    elbow_k_values: Optional[List[int]] = None,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Bisecting K-means fit with k clusters. When elbow k values are given the
+    splits continue up to the largest of them and the fit is cut back to k
+    clusters: the first splits do not depend on the number of clusters, so
+    this is the fit with k clusters.
+    """
+    n_clusters = k
+    if elbow_k_values is not None:
+        if min(elbow_k_values) < 1:
+            raise ValueError("elbow_k_values must be positive integers.")
+        n_clusters = max(k, max(elbow_k_values))
+    labels, centroids, info = bisecting_kmeans(
+        X, n_clusters, random_state=random_state, return_info=True
+    )
+    if n_clusters > k:
+        labels = info["tree"].assign(X, n_clusters=k)
+        centroids = info["tree"].leaf_centroids(k)
+    return labels, centroids, info
+
+
+def _memmap_budget(X: np.ndarray) -> int:
+    """
+    Chunk memory budget for a memory-mapped feature matrix: 1/64 of its size
+    (at least 32 KiB, at most the default budget). A chunk needs a few
+    buffers of this size, so the memory used beyond the labels stays well
+    below the size of the matrix.
+    """
+    return int(max(32 * 1024, min(DEFAULT_MEMORY_BUDGET, X.nbytes // 64)))
+
+
+def _run_clustering_memmap(
+    input_path: str,
+    feature_cols: List[str],
+    algorithm: str,
+    k: int,
+    standardise: bool,
+    standardise_in_place: bool,
+    output_path: Optional[str],
+    random_state: Optional[int],
+    elbow_options: Optional[Dict[str, Any]] = None,
+    silhouette_options: Optional[Dict[str, Any]] = None,
+    profiler: Optional[StageProfiler] = None,
+    dtype: Any = np.float64,
+    model_path: Optional[str] = None,
+    plot: str = "eager",
+    plot_options: Optional[Dict[str, Any]] = None,
+    scaler_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Memory-mapped counterpart of `run_clustering` (see its `memory_map`
+    option).
+
+    Profile stages are the same as in memory, except that "load" only
+    opens the memory map. The cluster plot shows a uniform sample of at
+    most 10,000 rows, and silhouette "auto" means "simplified".
+    """
+    if profiler is None:
+        profiler = StageProfiler()
+    silhouette_options = dict(silhouette_options or {})
+    if silhouette_options.get("method", "auto") == "auto":
+        silhouette_options["method"] = "simplified"
+    if detect_format(input_path) != "npy":
+        raise ValueError("memory_map requires a .npy input file.")
+    if algorithm not in ("kmeans", "sklearn_kmeans"):
+        raise ValueError(
+            f"memory_map only supports algorithm='kmeans' or 'sklearn_kmeans', got '{algorithm}'."
+        )
+
+    with profiler.stage("load") as record:
+        in_place = standardise and standardise_in_place
+        array = open_npy(input_path, mmap_mode="r+" if in_place else "r")
+        record["arrays"]["data"] = array_info(array)
+    names = npy_column_names(array.shape[1])
+    missing = [col for col in feature_cols if col not in names]
+    if missing:
+        raise KeyError(f"The following feature columns are missing: {missing}")
+    col_idx = [names.index(col) for col in feature_cols]
+    budget = _memmap_budget(array)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Select: the memory map itself unless a column subset or another
+        # dtype forces a copy, which goes to a temporary file chunk by chunk.
+        with profiler.stage("select") as record:
+            X = array
+            if col_idx != list(range(array.shape[1])) or array.dtype != dtype:
+                if in_place:
+                    raise ValueError(
+                        "standardise_in_place needs all columns of the .npy file, "
+                        f"in order, stored as {dtype}."
+                    )
+                X = np.lib.format.open_memmap(
+                    os.path.join(workdir, "features.npy"),
+                    mode="w+",
+                    dtype=dtype,
+                    shape=(array.shape[0], len(col_idx)),
+                )
+                rows = chunk_rows(array.shape[0], array.shape[1], 8, budget)
+                for sl in iter_chunks(array.shape[0], rows):
+                    X[sl] = array[sl][:, col_idx]
+                in_place = True
+            record["arrays"]["X"] = array_info(X)
+
+        mean = scale = None
+        if standardise:
+            with profiler.stage("standardise") as record:
+                out = None
+                if not in_place:
+                    out = np.lib.format.open_memmap(
+                        os.path.join(workdir, "standardised.npy"),
+                        mode="w+",
+                        dtype=dtype,
+                        shape=X.shape,
+                    )
+                mean, scale = _load_or_fit_scaler(
+                    scaler_path,
+                    feature_cols,
+                    lambda: StreamingStandardiser().fit(X, memory_budget=budget),
+                )
+                X = apply_standardisation(
+                    X, mean, scale, out=X if in_place else out, memory_budget=budget
+                )
+                record["arrays"]["X"] = array_info(X)
+
+        with profiler.stage("fit") as record:
+            if algorithm == "kmeans":
+                labels, centroids, info = kmeans(
+                    X, k=k, random_state=random_state, memory_budget=budget, return_info=True
+                )
+                record["kmeans"] = info
+            else:
+                labels, centroids = sklearn_kmeans(X, k=k, random_state=random_state)
+            record["arrays"]["centroids"] = array_info(centroids)
+        counts = np.bincount(labels, minlength=k)
+
+        with profiler.stage("inertia"):
+            inertia = compute_inertia(X, labels, centroids, memory_budget=budget)
+        metrics: Dict[str, Any] = {"inertia": inertia}
+        with profiler.stage("silhouette"):
+            metrics.update(
+                silhouette_metrics(
+                    X, labels, centroids, memory_budget=budget, **silhouette_options
+                )
+            )
+
+        _export_stage(
+            profiler,
+            (lambda: export_labels(labels, output_path)) if output_path is not None else None,
+            model_path,
+            centroids,
+            mean,
+            scale,
+            feature_cols,
+            algorithm,
+            inertia,
+            counts,
+            X.shape[0],
+        )
+
+        # Plotting copies the data: plot a uniform sample, as in streaming mode.
+        plot_X = plot_labels = None
+        if plot != "none":
+            plot_idx = slice(None)
+            if X.shape[0] > _STREAM_SAMPLE_SIZE:
+                rng = np.random.RandomState(random_state)
+                plot_idx = np.sort(rng.choice(X.shape[0], _STREAM_SAMPLE_SIZE, replace=False))
+            plot_X, plot_labels = np.array(X[plot_idx]), labels[plot_idx]
+        figures = _plot_and_elbow_stages(
+            profiler,
+            plot,
+            plot_options,
+            plot_X,
+            plot_labels,
+            centroids,
+            elbow_options,
+            lambda: _elbow_inertias(X, algorithm, k, elbow_options, memory_budget=budget),
+        )
+        # Release the temporary memory maps before their directory is removed.
+        del X, array
+
+    result: Dict[str, Any] = {
+        "data": None,
+        "labels": labels,
+        "centroids": centroids,
+        "cluster_counts": counts,
+        "metrics": metrics,
+        **figures,
+        "n_samples": labels.shape[0],
+        "profile": profiler.as_dict(),
+    }
+    return result
+
+
+# Maximum number of rows kept in memory in streaming mode for the
+# silhouette score, the cluster plot and the elbow curve.
+_STREAM_SAMPLE_SIZE = 10_000
+
+
+def _iter_feature_chunks(
+    input_path: str,
+    feature_cols: List[str],
+    chunk_size: int,
+    mean: Optional[np.ndarray] = None,
+    scale: Optional[np.ndarray] = None,
+    columns: Optional[List[str]] = None,
+    dtype: Any = np.float64,
+) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Yield (chunk, X_chunk) pairs from a data file, optionally standardised
+    with the given mean and scale. Only `columns` are read (all if None).
+    """
+    for chunk in iter_data_chunks(input_path, chunk_size, columns=columns):
+        X = select_features(chunk, feature_cols).to_numpy(dtype=np.float64)
+        if mean is not None:
+            X = (X - mean) / scale
+        yield chunk, X.astype(dtype, copy=False)
+
+
+def _run_clustering_streaming(
+    input_path: str,
+    feature_cols: List[str],
+    algorithm: str,
+    k: int,
+    standardise: bool,
+    output_path: Optional[str],
+    random_state: Optional[int],
+    chunk_size: int,
+    elbow_options: Optional[Dict[str, Any]] = None,
+    silhouette_options: Optional[Dict[str, Any]] = None,
+    profiler: Optional[StageProfiler] = None,
+    output_labels_only: bool = False,
+    dtype: Any = np.float64,
+    model_path: Optional[str] = None,
+    plot: str = "eager",
+    plot_options: Optional[Dict[str, Any]] = None,
+    scaler_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Streaming counterpart of `run_clustering` (see its `chunk_size` option).
+
+    Profile stages: "standardise" (statistics pass), "fit" (mini-batch
+    passes), "assign" (labelling, inertia and export pass), "export" (model
+    file only), "silhouette", "plot" and "elbow".
+    """
+    if profiler is None:
+        profiler = StageProfiler()
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    if algorithm != "kmeans":
+        raise ValueError(
+            f"Streaming mode (chunk_size) only supports algorithm='kmeans', got '{algorithm}'."
+        )
+    if output_path is not None and detect_format(output_path) != "csv":
+        raise ValueError("Streaming mode (chunk_size) writes CSV output only.")
+    # Check for missing columns from the header alone; dtypes are checked
+    # chunk by chunk by select_features.
+    missing = [col for col in feature_cols if col not in read_columns(input_path)]
+    if missing:
+        raise KeyError(f"The following feature columns are missing: {missing}")
+
+    # Pass 1 (optional): column means and standard deviations, unless they
+    # are read from scaler_path.
+    def fit_scaler() -> StreamingStandardiser:
+        scaler = StreamingStandardiser()
+        for _, X in _iter_feature_chunks(input_path, feature_cols, chunk_size, columns=feature_cols):
+            scaler.partial_fit(X)
+        if scaler.n_samples_seen_ == 0:
+            raise ValueError("The input file contains no data rows.")
+        return scaler
+
+    mean = scale = None
+    if standardise:
+        with profiler.stage("standardise"):
+            mean, scale = _load_or_fit_scaler(scaler_path, feature_cols, fit_scaler)
+
+    # Mini-batch fit: one or more passes over the chunks.
+    def batches() -> Iterator[np.ndarray]:
+        for _, X in _iter_feature_chunks(
+            input_path, feature_cols, chunk_size, mean, scale, columns=feature_cols, dtype=dtype
+        ):
+            yield X
+
+    with profiler.stage("fit") as record:
+        centroids, _ = minibatch_kmeans(batches, k=k, random_state=random_state)
+        record["arrays"]["centroids"] = array_info(centroids)
+
+    # Final pass: assign labels, accumulate inertia, write the labelled output
+    # and keep a bounded uniform sample (smallest random keys) for metrics.
+    rng = np.random.RandomState(random_state)
+    inertia = 0.0
+    n_samples = 0
+    counts = np.zeros(k, dtype=np.int64)
+    sample_keys = np.empty(0)
+    sample_X = np.empty((0, len(feature_cols)), dtype=dtype)
+    sample_labels = np.empty(0, dtype=np.intp)
+    # The full rows are only needed to write the labelled input.
+    read_cols = None if output_path is not None and not output_labels_only else feature_cols
+    with profiler.stage("assign") as record:
+        for chunk, X in _iter_feature_chunks(
+            input_path, feature_cols, chunk_size, mean, scale, columns=read_cols, dtype=dtype
+        ):
+            labels, min_sq_dist = nearest_centroid(X, centroids)
+            inertia += float(min_sq_dist.sum(dtype=np.float64))
+            counts += np.bincount(labels, minlength=k)
+
+            if output_path is not None and output_labels_only:
+                export_labels(labels, output_path, index=chunk.index, append=n_samples > 0)
+            elif output_path is not None:
+                chunk = chunk.copy()
+                chunk["cluster"] = labels
+                export_to_csv(chunk, output_path, delimiter=",", include_index=False, append=n_samples > 0)
+            n_samples += X.shape[0]
+
+            sample_keys = np.concatenate([sample_keys, rng.random_sample(X.shape[0])])
+            sample_X = np.concatenate([sample_X, X])
+            sample_labels = np.concatenate([sample_labels, labels])
+            if sample_keys.size > _STREAM_SAMPLE_SIZE:
+                keep = np.argpartition(sample_keys, _STREAM_SAMPLE_SIZE)[:_STREAM_SAMPLE_SIZE]
+                sample_keys, sample_X, sample_labels = sample_keys[keep], sample_X[keep], sample_labels[keep]
+        record["arrays"]["sample_X"] = array_info(sample_X)
+
+    # The labelled output was written by the assign pass.
+    _export_stage(
+        profiler, None, model_path, centroids, mean, scale, feature_cols, algorithm, inertia,
+        counts, n_samples,
+    )
+
+    metrics: Dict[str, Any] = {"inertia": inertia}
+    with profiler.stage("silhouette"):
+        metrics.update(
+            silhouette_metrics(sample_X, sample_labels, centroids, **(silhouette_options or {}))
+        )
+
+    figures = _plot_and_elbow_stages(
+        profiler,
+        plot,
+        plot_options,
+        sample_X,
+        sample_labels,
+        centroids,
+        elbow_options,
+        lambda: _elbow_inertias(sample_X, algorithm, k, elbow_options),
+    )
+
+    result: Dict[str, Any] = {
+        "data": None,
+        "labels": None,
+        "centroids": centroids,
+        "cluster_counts": counts,
+        "metrics": metrics,
+        **figures,
+        "n_samples": n_samples,
+        "profile": profiler.as_dict(),
     }
-    return result
\ No newline at end of file
+    return result
@@ -0,0 +1,369 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Fitted K-means model for assigning new points.
+
+`KMeansModel` keeps the centroids together with the standardisation
+parameters used to fit them, so that new records are preprocessed exactly
+as the training data. Prediction is tuned for serving: centroid norms and
+the transposed centroid matrix are precomputed once, and single rows or
+micro-batches are processed in preallocated per-thread buffers.
+
+Only NumPy is imported at module level; the fitting code is imported when
+`fit` is called.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+
+class KMeansModel:
+    """
+    K-means clustering model with fit / predict / transform / score.
+
+    Parameters
+    ----------
+    k : int, default 3
+        Number of clusters.
+    standardise : bool, default True
+        If True, features are standardised with the mean and scale of the
+        training data, at fit and at predict time.
+    algorithm : {"lloyd", "hamerly", "elkan", "auto"}, default "lloyd"
+    init : {"random", "k-means++", "k-means||"}, default "random"
+    n_init : int, default 1
+    max_iter : int, default 300
+    tol : float, default 1e-4
+    random_state : int or None, default None
+        Passed to `algorithms.kmeans`.
+    dtype : {"float32", "float64"}, default "float64"
+        Dtype of the distance computations at fit and predict time.
+    batch_size : int, default 256
+        Rows processed per step by `predict`, `transform` and `score`;
+        sets the size of the reusable buffers.
+
+    Attributes
+    ----------
+    centroids_ : ndarray of shape (k, n_features)
+        Centroids in the standardised feature space (float64).
+    mean_, scale_ : ndarray of shape (n_features,) or None
+        Standardisation parameters (None if standardise is False).
+    feature_names_ : list of str or None
+        Column names when fitted on a DataFrame; DataFrames passed to
+        `predict` are reordered to match.
+    labels_ : ndarray of shape (n_samples,)
+        Labels of the training data (only after `fit`).
+    inertia_ : float
+        Inertia of the training data (only after `fit`).
+    cluster_counts_ : ndarray of shape (k,)
+        Number of training points in each cluster.
+
+    Notes
+    -----
+    Buffers are kept per thread, so one model can serve concurrent
+    requests from several threads.
+    """
+
+    def __init__(
+        self,
+        k: int = 3,
+        standardise: bool = True,
+        algorithm: str = "lloyd",
+        init: str = "random",
+        n_init: int = 1,
+        max_iter: int = 300,
+        tol: float = 1e-4,
+        random_state: Optional[int] = None,
+        dtype: Any = "float64",
+        batch_size: int = 256,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer.")
+        self.k = k
+        self.standardise = standardise
+        self.algorithm = algorithm
+        self.init = init
+        self.n_init = n_init
+        self.max_iter = max_iter
+        self.tol = tol
+        self.random_state = random_state
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+            raise ValueError(f"dtype must be float32 or float64, got {self.dtype}.")
+        self.batch_size = batch_size
+
+        self.centroids_: Optional[np.ndarray] = None
+        self.mean_: Optional[np.ndarray] = None
+        self.scale_: Optional[np.ndarray] = None
+        self.feature_names_: Optional[List[str]] = None
+        self.labels_: Optional[np.ndarray] = None
+        self.inertia_: Optional[float] = None
+        self.cluster_counts_: Optional[np.ndarray] = None
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_centroids(
+        cls,
+        centroids: np.ndarray,
+        mean: Optional[np.ndarray] = None,
+        scale: Optional[np.ndarray] = None,
+        feature_names: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> "KMeansModel":
+        """
+        Build a model from existing centroids, e.g. from `kmeans`,
+        `sklearn_kmeans` or a saved model.
+
+        Parameters
+        ----------
+        centroids : ndarray of shape (k, n_features)
+            Centroids in the (standardised, if mean/scale are given) space.
+        mean, scale : ndarray of shape (n_features,) or None
+            Standardisation parameters; both or neither.
+        feature_names : sequence of str or None
+        **kwargs
+            Other constructor arguments (e.g. dtype, batch_size), and
+            copy (default True): if False, float64 centroids are used
+            without copying, e.g. when they are memory-mapped.
+        """
+        centroids = np.asarray(centroids)
+        if centroids.ndim != 2:
+            raise ValueError("centroids must be a 2D array.")
+        if (mean is None) != (scale is None):
+            raise ValueError("mean and scale must be given together.")
+        copy = kwargs.pop("copy", True)
+        model = cls(k=centroids.shape[0], standardise=mean is not None, **kwargs)
+        model._set_state(centroids, mean, scale, feature_names, copy=copy)
+        return model
+
+    def _set_state(
+        self,
+        centroids: np.ndarray,
+        mean: Optional[np.ndarray],
+        scale: Optional[np.ndarray],
+        feature_names: Optional[Sequence[str]],
+        copy: bool = True,
+    ) -> None:
+        n_features = centroids.shape[1]
+        for name, value in (("mean", mean), ("scale", scale)):
+            if value is not None and np.shape(value) != (n_features,):
+                raise ValueError(f"{name} must have shape ({n_features},).")
+        if feature_names is not None and len(feature_names) != n_features:
+            raise ValueError(f"feature_names must have {n_features} entries.")
+
+        if copy:
+            self.centroids_ = np.array(centroids, dtype=np.float64)
+        else:
+            self.centroids_ = np.asarray(centroids, dtype=np.float64)
+        self.mean_ = None if mean is None else np.array(mean, dtype=np.float64)
+        self.scale_ = None if scale is None else np.array(scale, dtype=np.float64)
+        self.feature_names_ = None if feature_names is None else [str(f) for f in feature_names]
+        self.k = self.centroids_.shape[0]
+
+        # Precomputed once for every predict call: ||c||^2 and C^T in the
+        # compute dtype (a view when no cast is needed), and the
+        # standardisation folded into one multiply-add
+        # (x - mean) / scale = x * inv_scale - mean * inv_scale.
+        c = self.centroids_.astype(self.dtype, copy=False)
+        self._c_sq_norms = np.einsum("ij,ij->i", c, c)
+        self._ct = c.T
+        if self.mean_ is not None:
+            self._inv_scale = (1.0 / self.scale_).astype(self.dtype)
+            self._shift = (-self.mean_ / self.scale_).astype(self.dtype)
+        # Drop buffers sized for a previous state.
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Fitting
+    # ------------------------------------------------------------------
+    def fit(self, X: Any) -> "KMeansModel":
+        """
+        Fit the model on X.
+
+        Parameters
+        ----------
+        X : ndarray or pandas.DataFrame of shape (n_samples, n_features)
+            With a DataFrame, its column names become `feature_names_`.
+
+        Returns
+        -------
+        self : KMeansModel
+        """
+        from .algorithms import kmeans
+        from .preprocessing import apply_standardisation, standardisation_params
+
+        feature_names = None
+        if hasattr(X, "columns"):
+            feature_names = list(X.columns)
+            X = X.to_numpy(dtype=self.dtype)
+        X = np.asarray(X)
+        if X.ndim != 2:
+            raise ValueError("X must be a 2D array.")
+
+        mean = scale = None
+        if self.standardise:
+            mean, scale = standardisation_params(X)
+            X = apply_standardisation(X, mean, scale, dtype=self.dtype)
+
+        labels, centroids, info = kmeans(
+            X,
+            self.k,
+            max_iter=self.max_iter,
+            tol=self.tol,
+            random_state=self.random_state,
+            algorithm=self.algorithm,
+            init=self.init,
+            n_init=self.n_init,
+            dtype=self.dtype,
+            return_info=True,
+        )
+        self._set_state(centroids, mean, scale, feature_names)
+        self.labels_ = labels
+        self.inertia_ = info["inertia"]
+        self.cluster_counts_ = np.bincount(labels, minlength=self.k)
+        return self
+
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+    def _check_fitted(self) -> None:
+        if self.centroids_ is None:
+            raise RuntimeError("This KMeansModel is not fitted yet; call fit first.")
+
+    def _as_rows(self, X: Any) -> np.ndarray:
+        """
+        Raw input as a 2D array; a 1D array is a single row.
+        """
+        if hasattr(X, "columns"):
+            if self.feature_names_ is not None:
+                X = X[self.feature_names_]
+            X = X.to_numpy()
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        if X.ndim != 2 or X.shape[1] != self.centroids_.shape[1]:
+            raise ValueError(
+                f"X must have {self.centroids_.shape[1]} features, got shape {X.shape}."
+            )
+        return X
+
+    def _buffers(self) -> Any:
+        """
+        This thread's (rows, features, distances, labels) buffers.
+        """
+        local = self._local
+        if not hasattr(local, "rows"):
+            n_features = self.centroids_.shape[1]
+            local.rows = np.empty((self.batch_size, n_features), dtype=self.dtype)
+            local.dist = np.empty((self.batch_size, self.k), dtype=self.dtype)
+            local.labels = np.empty(self.batch_size, dtype=np.intp)
+        return local
+
+    def _partial_distances(self, block: np.ndarray, buf: Any) -> np.ndarray:
+        """
+        ||c||^2 - 2 x.c for the standardised rows of `block`, in the buffers.
+
+        Adding ||x||^2 gives the squared distances; it does not change the
+        argmin, so `predict` skips it.
+        """
+        m = block.shape[0]
+        rows = buf.rows[:m]
+        if self.mean_ is not None:
+            np.multiply(block, self._inv_scale, out=rows, casting="unsafe")
+            rows += self._shift
+        else:
+            rows[...] = block
+        tile = buf.dist[:m]
+        np.dot(rows, self._ct, out=tile)
+        tile *= -2.0
+        tile += self._c_sq_norms
+        return tile
+
+    def predict(self, X: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Index of the nearest centroid for each row of X.
+
+        Parameters
+        ----------
+        X : array-like or DataFrame of shape (n_samples, n_features)
+            Raw (unstandardised) features; a 1D array is one row.
+        out : ndarray of shape (n_samples,) or None
+            Preallocated buffer for the labels, of dtype intp.
+
+        Returns
+        -------
+        labels : ndarray of shape (n_samples,)
+        """
+        self._check_fitted()
+        X = self._as_rows(X)
+        n_samples = X.shape[0]
+        if out is None:
+            out = np.empty(n_samples, dtype=np.intp)
+        elif out.shape != (n_samples,) or out.dtype != np.intp:
+            raise ValueError(
+                f"out must have shape ({n_samples},) and dtype intp, "
+                f"got {out.shape} and {out.dtype}."
+            )
+        buf = self._buffers()
+        for start in range(0, n_samples, self.batch_size):
+            block = X[start:start + self.batch_size]
+            tile = self._partial_distances(block, buf)
+            np.argmin(tile, axis=1, out=out[start:start + block.shape[0]])
+        return out
+
+    def transform(self, X: Any) -> np.ndarray:
+        """
+        Euclidean distance from each row of X to every centroid, in the
+        standardised space.
+
+        Returns
+        -------
+        distances : ndarray of shape (n_samples, k)
+        """
+        self._check_fitted()
+        X = self._as_rows(X)
+        out = np.empty((X.shape[0], self.k), dtype=self.dtype)
+        buf = self._buffers()
+        for start in range(0, X.shape[0], self.batch_size):
+            block = X[start:start + self.batch_size]
+            m = block.shape[0]
+            tile = self._partial_distances(block, buf)
+            rows = buf.rows[:m]
+            tile += np.einsum("ij,ij->i", rows, rows)[:, np.newaxis]
+            np.maximum(tile, 0.0, out=tile)
+            np.sqrt(tile, out=out[start:start + m])
+        return out
+
+    def score(self, X: Any) -> float:
+        """
+        Opposite of the inertia of X under the model (higher is better),
+        following the scikit-learn convention. Accumulated in float64.
+        """
+        self._check_fitted()
+        X = self._as_rows(X)
+        total = 0.0
+        buf = self._buffers()
+        for start in range(0, X.shape[0], self.batch_size):
+            block = X[start:start + self.batch_size]
+            m = block.shape[0]
+            tile = self._partial_distances(block, buf)
+            rows = buf.rows[:m]
+            best = tile.min(axis=1) + np.einsum("ij,ij->i", rows, rows)
+            total += float(np.maximum(best, 0.0).sum(dtype=np.float64))
+        return -total
+
+    def fit_predict(self, X: Any) -> np.ndarray:
+        """
+        Fit the model on X and return the training labels.
+        """
+        return self.fit(X).labels_
@@ -0,0 +1,236 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Compact on-disk format for fitted clustering results.
+
+A model file is an uncompressed NumPy .npz archive with the members:
+- "header": UTF-8 JSON (stored as a uint8 array) with the format name and
+  version, k, n_features, feature names, the compute dtype and free-form
+  metadata
+- "centroids": float64 array of shape (k, n_features)
+- "mean", "scale": standardisation parameters (only if standardised)
+- "counts": number of training points per centroid (optional), used to
+  continue fitting with `algorithms.incremental_kmeans`
+
+Because the archive is stored uncompressed, each member is a plain .npy
+file at a fixed offset, so the centroids can be memory-mapped directly
+from the archive. Loading needs NumPy only.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zipfile
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .model import KMeansModel
+
+FORMAT_NAME = "cluster_maker.model"
+FORMAT_VERSION = 1
+
+# Size of the fixed part of a zip local file header, and the offsets of the
+# file name and extra field lengths within it (see the zip APPNOTE).
+_ZIP_LOCAL_HEADER_SIZE = 30
+_ZIP_NAME_LENGTH_OFFSET = 26
+
+# Extension of model files.
+MODEL_EXTENSION = ".npz"
+
+
+def model_file_path(path: str) -> str:
+    """
+    Path of the model file for `path`: ".npz" is appended unless already
+    there, as NumPy does when saving, so that saving and loading a path
+    without the extension refer to the same file.
+    """
+    path = os.fspath(path)
+    return path if path.endswith(MODEL_EXTENSION) else path + MODEL_EXTENSION
+
+
+def save_model(
+    path: str,
+    model: Union[KMeansModel, np.ndarray],
+    mean: Optional[np.ndarray] = None,
+    scale: Optional[np.ndarray] = None,
+    feature_names: Optional[Sequence[str]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    counts: Optional[np.ndarray] = None,
+) -> None:
+    """
+    Save a fitted model, or bare centroids, to a model file.
+
+    Parameters
+    ----------
+    path : str
+        Output file; ".npz" is appended if missing (see `model_file_path`).
+    model : KMeansModel or ndarray of shape (k, n_features)
+        A fitted model, or centroids e.g. from `kmeans` or `sklearn_kmeans`.
+    mean, scale : ndarray of shape (n_features,) or None
+        Standardisation parameters, when `model` is an array.
+    feature_names : sequence of str or None
+        Feature names, when `model` is an array.
+    metadata : dict or None
+        JSON-serialisable extra information (e.g. inertia, parameters).
+    counts : ndarray of shape (k,) or None
+        Training points per centroid, when `model` is an array (a fitted
+        KMeansModel provides its `cluster_counts_`).
+    """
+    if isinstance(model, KMeansModel):
+        if model.centroids_ is None:
+            raise RuntimeError("This KMeansModel is not fitted yet; call fit first.")
+        centroids = model.centroids_
+        mean, scale = model.mean_, model.scale_
+        feature_names = model.feature_names_
+        counts = model.cluster_counts_
+        dtype = model.dtype.name
+    else:
+        centroids = np.asarray(model, dtype=np.float64)
+        dtype = "float64"
+    if centroids.ndim != 2:
+        raise ValueError("centroids must be a 2D array.")
+    if (mean is None) != (scale is None):
+        raise ValueError("mean and scale must be given together.")
+
+    header = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "k": int(centroids.shape[0]),
+        "n_features": int(centroids.shape[1]),
+        "feature_names": None if feature_names is None else [str(f) for f in feature_names],
+        "standardised": mean is not None,
+        "dtype": dtype,
+        "metadata": metadata or {},
+    }
+    arrays = {
+        "header": np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8),
+        "centroids": np.ascontiguousarray(centroids, dtype=np.float64),
+    }
+    if mean is not None:
+        arrays["mean"] = np.asarray(mean, dtype=np.float64)
+        arrays["scale"] = np.asarray(scale, dtype=np.float64)
+    if counts is not None:
+        if np.shape(counts) != (centroids.shape[0],):
+            raise ValueError(f"counts must have shape ({centroids.shape[0]},).")
+        arrays["counts"] = np.asarray(counts, dtype=np.int64)
+    np.savez(model_file_path(path), **arrays)
+
+
+def _check_header(header: Dict[str, Any], path: str) -> None:
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"'{path}' is not a cluster_maker model file.")
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(
+            f"'{path}' uses model format version {header['version']}; "
+            f"this version of cluster_maker reads up to {FORMAT_VERSION}."
+        )
+
+
+def _mmap_member(path: str, archive: zipfile.ZipFile, name: str) -> np.ndarray:
+    """
+    Memory-map an uncompressed .npy member of a zip archive.
+    """
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"Member '{name}' of '{path}' is compressed and cannot be memory-mapped.")
+    with open(path, "rb") as f:
+        # The local header repeats the name and may have its own extra field.
+        f.seek(info.header_offset + _ZIP_NAME_LENGTH_OFFSET)
+        lengths = np.frombuffer(f.read(4), dtype="<u2")
+        data_start = info.header_offset + _ZIP_LOCAL_HEADER_SIZE + int(lengths.sum())
+        f.seek(data_start)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            raise ValueError(f"Unsupported .npy version {version} for member '{name}'.")
+        offset = f.tell()
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def load_model_arrays(
+    path: str,
+    mmap: bool = False,
+) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Read the header and arrays of a model file.
+
+    Parameters
+    ----------
+    path : str
+        Model file; ".npz" is appended if missing (see `model_file_path`).
+    mmap : bool, default False
+        If True, the centroids are memory-mapped from the archive instead of
+        read into memory (useful for very large k).
+
+    Returns
+    -------
+    header : dict
+    arrays : dict
+        "centroids", plus "mean" and "scale" if standardised and "counts"
+        if stored.
+    """
+    path = model_file_path(path)
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        if "header.npy" not in names:
+            raise ValueError(f"'{path}' is not a cluster_maker model file.")
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(data["header"].tobytes().decode("utf-8"))
+            _check_header(header, path)
+            arrays = {
+                key: data[key] for key in ("mean", "scale", "counts") if f"{key}.npy" in names
+            }
+            if not mmap:
+                arrays["centroids"] = data["centroids"]
+        if mmap:
+            arrays["centroids"] = _mmap_member(path, archive, "centroids.npy")
+    return header, arrays
+
+
+def load_model(path: str, mmap: bool = False, **kwargs: Any) -> KMeansModel:
+    """
+    Load a model file as a KMeansModel ready for prediction.
+
+    Parameters
+    ----------
+    path : str
+        Model file; ".npz" is appended if missing (see `model_file_path`).
+    mmap : bool, default False
+        Memory-map the centroids (see `load_model_arrays`); they are then
+        used without copying.
+    **kwargs
+        Passed to `KMeansModel.from_centroids` (e.g. batch_size). The compute
+        dtype defaults to the one the model was saved with.
+
+    Returns
+    -------
+    model : KMeansModel
+    """
+    header, arrays = load_model_arrays(path, mmap=mmap)
+    kwargs.setdefault("dtype", header.get("dtype", "float64"))
+    model = KMeansModel.from_centroids(
+        arrays["centroids"],
+        mean=arrays.get("mean"),
+        scale=arrays.get("scale"),
+        feature_names=header.get("feature_names"),
+        copy=not mmap,
+        **kwargs,
+    )
+    model.cluster_counts_ = arrays.get("counts")
+    return model
@@ -6,10 +6,49 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, List, Tuple, Optional
 
 import numpy as np
-import matplotlib.pyplot as plt
+
+from .sampling import stratified_sample
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+# matplotlib is imported when a plot is made, not when the package is
+# imported: loading pyplot takes a large share of the package import time.
+
+PLOT_STYLES = ("auto", "scatter", "raster", "hexbin", "hist2d")
+
+# Above this many plotted points the legend is placed at a fixed location:
+# loc="best" scans every point.
+_LEGEND_SEARCH_MAX_POINTS = 10_000
+
+
+def _new_figure(headless: bool) -> Tuple[Figure, Axes]:
+    """
+    A figure with one Axes. Headless figures are built with the
+    object-oriented API on an Agg canvas: pyplot never tracks them, so they
+    are freed as soon as they are no longer referenced.
+    """
+    if headless:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        return fig, fig.add_subplot()
+
+    import matplotlib.pyplot as plt
+
+    return plt.subplots()
+
+
+def _finish(fig: Figure, output_path: Optional[str], dpi: int) -> None:
+    fig.tight_layout()
+    if output_path is not None:
+        fig.savefig(output_path, dpi=dpi)
 
 
 def plot_clusters_2d(
@@ -17,7 +56,14 @@ def plot_clusters_2d(
     labels: np.ndarray,
     centroids: Optional[np.ndarray] = None,
     title: Optional[str] = None,
-) -> Tuple[plt.Figure, plt.Axes]:
+    style: str = "auto",
+    max_points: Optional[int] = 50_000,
+    gridsize: int = 200,
+    headless: bool = False,
+    output_path: Optional[str] = None,
+    dpi: int = 150,
+    random_state: Optional[int] = None,
+) -> Tuple[Figure, Axes]:
     """
     Plot clustered data in 2D using the first two features.
 
@@ -27,6 +73,30 @@ def plot_clusters_2d(
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features) or None
     title : str or None
+    style : {"auto", "scatter", "raster", "hexbin", "hist2d"}, default "auto"
+        - "scatter": one marker per point, coloured by cluster.
+        - "raster": the same, with the points rasterised (cheap to render
+          and small in vector output such as PDF or SVG).
+        - "hexbin", "hist2d": point density on a hexagonal or square grid
+          (log colour scale); cost is linear in n_samples and independent
+          of it when rendering.
+        - "auto": "scatter" up to `max_points` points, else "raster".
+    max_points : int or None, default 50000
+        For "scatter" and "raster", plot at most this many points, sampled
+        stratified by cluster so that small clusters stay visible. None
+        plots every point.
+    gridsize : int, default 200
+        Number of bins along x for "hexbin" and "hist2d".
+    headless : bool, default False
+        If True, build the figure without pyplot (no global state, no GUI
+        backend), so it is released as soon as it is no longer referenced.
+        Use for scripts, servers and long-running processes.
+    output_path : str or None
+        If given, the figure is also saved to this file.
+    dpi : int, default 150
+        Resolution used when saving.
+    random_state : int or None
+        Seed for the downsampling.
 
     Returns
     -------
@@ -34,9 +104,45 @@ def plot_clusters_2d(
     """
     if X.shape[1] < 2:
         raise ValueError("X must have at least 2 features for a 2D plot.")
-
-    fig, ax = plt.subplots()
-    scatter = ax.scatter(X[:, 0], X[:, 1], c=labels, cmap="tab10", alpha=0.8)
+    if style not in PLOT_STYLES:
+        raise ValueError(
+            f"Unknown plot style '{style}'. "
+            "Use 'auto', 'scatter', 'raster', 'hexbin' or 'hist2d'."
+        )
+    labels = np.asarray(labels)
+    n_samples = X.shape[0]
+    too_many = max_points is not None and n_samples > max_points
+    if style == "auto":
+        style = "raster" if too_many else "scatter"
+
+    fig, ax = _new_figure(headless)
+    n_plotted = n_samples
+    if style in ("scatter", "raster"):
+        idx: np.ndarray | slice = slice(None)
+        if too_many:
+            idx = stratified_sample(labels, max_points, random_state)
+            n_plotted = idx.size
+        points = X[idx]
+        scatter = ax.scatter(
+            points[:, 0],
+            points[:, 1],
+            c=labels[idx],
+            cmap="tab10",
+            alpha=0.8,
+            s=None if n_plotted <= _LEGEND_SEARCH_MAX_POINTS else 4,
+            rasterized=style == "raster",
+        )
+        fig.colorbar(scatter, ax=ax, label="Cluster label")
+    elif style == "hexbin":
+        density = ax.hexbin(X[:, 0], X[:, 1], gridsize=gridsize, bins="log", mincnt=1, cmap="viridis")
+        fig.colorbar(density, ax=ax, label="Points per bin")
+    else:
+        from matplotlib.colors import LogNorm
+
+        counts, x_edges, y_edges = np.histogram2d(X[:, 0], X[:, 1], bins=gridsize)
+        counts = np.ma.masked_equal(counts.T, 0)
+        density = ax.pcolormesh(x_edges, y_edges, counts, norm=LogNorm(), cmap="viridis")
+        fig.colorbar(density, ax=ax, label="Points per bin")
 
     if centroids is not None:
         ax.scatter(
@@ -45,18 +151,17 @@ def plot_clusters_2d(
             marker="x",
             s=200,
             linewidths=2,
-            color="black",
+            color="black" if style in ("scatter", "raster") else "red",
             label="Centroids",
         )
-        ax.legend()
+        ax.legend(loc="best" if n_plotted <= _LEGEND_SEARCH_MAX_POINTS else "upper right")
 
     ax.set_xlabel("Feature 1")
     ax.set_ylabel("Feature 2")
     if title:
         ax.set_title(title)
 
-    fig.colorbar(scatter, ax=ax, label="Cluster label")
-    fig.tight_layout()
+    _finish(fig, output_path, dpi)
     return fig, ax
 
 
@@ -64,7 +169,10 @@ def plot_elbow(
     k_values: List[int],
     inertias: List[float],
     title: str = "Elbow Curve",
-) -> Tuple[plt.Figure, plt.Axes]:
+    headless: bool = False,
+    output_path: Optional[str] = None,
+    dpi: int = 150,
+) -> Tuple[Figure, Axes]:
     """
     Plot inertia vs k (elbow method).
 
@@ -73,6 +181,11 @@ def plot_elbow(
     k_values : list of int
     inertias : list of float
     title : str, default "Elbow Curve"
+    headless : bool, default False
+        Build the figure without pyplot (see `plot_clusters_2d`).
+    output_path : str or None
+        If given, the figure is also saved to this file.
+    dpi : int, default 150
 
     Returns
     -------
@@ -81,11 +194,11 @@ def plot_elbow(
     if len(k_values) != len(inertias):
         raise ValueError("k_values and inertias must have the same length.")
 
-    fig, ax = plt.subplots()
+    fig, ax = _new_figure(headless)
     ax.plot(k_values, inertias, marker="o")
     ax.set_xlabel("Number of clusters (k)")
     ax.set_ylabel("Inertia")
     ax.set_title(title)
     ax.grid(True)
-    fig.tight_layout()
-    return fig, ax
\ No newline at end of file
+    _finish(fig, output_path, dpi)
+    return fig, ax
@@ -6,11 +6,12 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
+
+from .distances import chunk_rows, iter_chunks, resolve_dtype
 
 
 def select_features(data: pd.DataFrame, feature_cols: List[str]) -> pd.DataFrame:
@@ -51,13 +52,101 @@ def select_features(data: pd.DataFrame, feature_cols: List[str]) -> pd.DataFrame
     return X_df
 
 
-def standardise_features(X: np.ndarray) -> np.ndarray:
+def standardisation_params(
+    X: np.ndarray,
+    memory_budget: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column means and scales (population standard deviations) of X.
+
+    X is read in row chunks and the per-chunk moments are merged with Chan's
+    parallel update (see `StreamingStandardiser`), so only one chunk is
+    converted to float64 at a time and the computation is numerically
+    stable. Constant columns get a scale of 1 (see
+    `StreamingStandardiser.scale_`).
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+        May be a numpy.memmap.
+    memory_budget : int or None
+        Budget in bytes for the float64 copy of one chunk.
+
+    Returns
+    -------
+    mean : ndarray of shape (n_features,)
+    scale : ndarray of shape (n_features,)
+    """
+    if X.shape[0] == 0:
+        raise ValueError("Cannot standardise an empty array.")
+    scaler = StreamingStandardiser().fit(X, memory_budget=memory_budget)
+    return scaler.mean_, scaler.scale_
+
+
+def apply_standardisation(
+    X: np.ndarray,
+    mean: np.ndarray,
+    scale: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    memory_budget: Optional[int] = None,
+    dtype: Any = "float64",
+) -> np.ndarray:
+    """
+    Compute (X - mean) / scale chunk by chunk into `out`.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    mean, scale : ndarray of shape (n_features,)
+    out : ndarray of shape (n_samples, n_features) or None
+        Destination; may be X itself (in place) or a writeable memmap.
+        A new array of dtype `dtype` is allocated if None.
+    memory_budget : int or None
+        Budget in bytes for the temporaries of one chunk.
+    dtype : {"float32", "float64"}, default "float64"
+        Dtype of the allocated output. Each chunk is computed in float64
+        and rounded once when it is stored.
+
+    Returns
+    -------
+    out : ndarray of shape (n_samples, n_features)
+    """
+    if out is None:
+        out = np.empty(X.shape, dtype=resolve_dtype(X, dtype))
+    if out.shape != X.shape:
+        raise ValueError("out must have the same shape as X.")
+    rows = chunk_rows(X.shape[0], X.shape[1], 8, memory_budget)
+    for sl in iter_chunks(X.shape[0], rows):
+        block = np.subtract(X[sl], mean, dtype=np.float64)
+        block /= scale
+        out[sl] = block
+    return out
+
+
+def standardise_features(
+    X: np.ndarray,
+    in_place: bool = False,
+    out: Optional[np.ndarray] = None,
+    memory_budget: Optional[int] = None,
+    dtype: Any = "float64",
+) -> np.ndarray:
     """
     Standardise features to zero mean and unit variance.
 
     Parameters
     ----------
     X : ndarray of shape (n_samples, n_features)
+        May be a numpy.memmap; it is only read chunk by chunk.
+    in_place : bool, default False
+        If True, overwrite X (which must be a writeable floating-point
+        array) instead of allocating a new array.
+    out : ndarray of shape (n_samples, n_features) or None
+        Destination array, e.g. a writeable memmap, used when not in place.
+    memory_budget : int or None
+        Budget in bytes for the temporaries of one chunk.
+    dtype : {"float32", "float64"}, default "float64"
+        Dtype of the result when it is newly allocated. Means and scales
+        are always computed in float64.
 
     Returns
     -------
@@ -65,5 +154,193 @@ def standardise_features(X: np.ndarray) -> np.ndarray:
     """
     if not isinstance(X, np.ndarray):
         raise TypeError("X must be a NumPy array.")
-    scaler = StandardScaler()
-    return scaler.fit_transform(X)
\ No newline at end of file
+    if in_place:
+        if not np.issubdtype(X.dtype, np.floating):
+            raise TypeError("In-place standardisation requires a floating-point array.")
+        out = X
+    mean, scale = standardisation_params(X, memory_budget=memory_budget)
+    return apply_standardisation(
+        X, mean, scale, out=out, memory_budget=memory_budget, dtype=dtype
+    )
+
+
+class StreamingStandardiser:
+    """
+    Standardiser fitted incrementally, for chunked and out-of-core data.
+
+    Column means and sums of squared deviations are accumulated chunk by
+    chunk with Chan's parallel update, so `partial_fit` over the chunks of
+    a file gives the same parameters as fitting on the whole array, and
+    standardisers fitted on different parts of the data (e.g. by separate
+    workers) can be combined with `merge`. The fitted state can be saved and
+    reloaded to reuse it, or to continue fitting, in a later run.
+
+    Parameters
+    ----------
+    feature_names : list of str or None
+        Names of the columns, checked against DataFrames passed to
+        `partial_fit` and recorded in saved files.
+
+    Attributes
+    ----------
+    n_samples_seen_ : int
+    mean_ : ndarray of shape (n_features,) or None
+    var_ : ndarray of shape (n_features,) or None
+        Population variances.
+    scale_ : ndarray of shape (n_features,) or None
+        Population standard deviations; 1 for constant columns, i.e. those
+        whose standard deviation is below 10 * eps * max(1, |mean|), which
+        is rounding noise (same convention as scikit-learn's
+        StandardScaler).
+    """
+
+    def __init__(self, feature_names: Optional[List[str]] = None) -> None:
+        self.feature_names_ = None if feature_names is None else list(feature_names)
+        self.n_samples_seen_ = 0
+        self.mean_: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None
+
+    def _check_fitted(self) -> None:
+        if self.mean_ is None:
+            raise RuntimeError(
+                "This StreamingStandardiser is not fitted yet; call partial_fit first."
+            )
+
+    @property
+    def var_(self) -> np.ndarray:
+        self._check_fitted()
+        return self._m2 / self.n_samples_seen_
+
+    @property
+    def scale_(self) -> np.ndarray:
+        scale = np.sqrt(self.var_)
+        # A tolerance rather than == 0: the variance of a constant column
+        # with a large mean is rarely computed as exactly zero.
+        eps = np.finfo(np.float64).eps
+        scale[scale < 10 * eps * np.maximum(1.0, np.abs(self.mean_))] = 1.0
+        return scale
+
+    def _update(self, n_b: int, mean_b: np.ndarray, m2_b: np.ndarray) -> None:
+        if self.mean_ is None:
+            self.mean_ = np.zeros(mean_b.shape[0])
+            self._m2 = np.zeros(mean_b.shape[0])
+        elif mean_b.shape != self.mean_.shape:
+            raise ValueError(
+                f"Expected {self.mean_.shape[0]} features, got {mean_b.shape[0]}."
+            )
+        total = self.n_samples_seen_ + n_b
+        delta = mean_b - self.mean_
+        self.mean_ += delta * (n_b / total)
+        self._m2 += m2_b + delta ** 2 * (self.n_samples_seen_ * n_b / total)
+        self.n_samples_seen_ = total
+
+    def partial_fit(self, X: Any) -> "StreamingStandardiser":
+        """
+        Update the statistics with one chunk of rows.
+
+        Parameters
+        ----------
+        X : ndarray or pandas.DataFrame of shape (n_samples, n_features)
+            A DataFrame is reordered to `feature_names_` if set, and sets
+            them otherwise.
+        """
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names_ is None:
+                self.feature_names_ = [str(c) for c in X.columns]
+            X = select_features(X, self.feature_names_).to_numpy()
+        block = np.asarray(X, dtype=np.float64)
+        if block.ndim != 2:
+            raise ValueError("X must be a 2D array.")
+        if block.shape[0] == 0:
+            return self
+        mean_b = block.mean(axis=0)
+        m2_b = ((block - mean_b) ** 2).sum(axis=0)
+        self._update(block.shape[0], mean_b, m2_b)
+        return self
+
+    def fit(
+        self, X: np.ndarray, memory_budget: Optional[int] = None
+    ) -> "StreamingStandardiser":
+        """
+        Fit on a whole array (e.g. a numpy.memmap), read in row chunks of
+        at most `memory_budget` bytes as float64. Previous statistics are
+        discarded.
+        """
+        self.n_samples_seen_ = 0
+        self.mean_ = self._m2 = None
+        rows = chunk_rows(X.shape[0], X.shape[1], 8, memory_budget)
+        for sl in iter_chunks(X.shape[0], rows):
+            self.partial_fit(X[sl])
+        return self
+
+    def merge(self, other: "StreamingStandardiser") -> "StreamingStandardiser":
+        """
+        Combine with a standardiser fitted on other rows, in place.
+        """
+        if other.mean_ is None:
+            return self
+        if (
+            self.feature_names_ is not None
+            and other.feature_names_ is not None
+            and self.feature_names_ != other.feature_names_
+        ):
+            raise ValueError("Cannot merge standardisers fitted on different features.")
+        if self.feature_names_ is None:
+            self.feature_names_ = other.feature_names_
+        self._update(other.n_samples_seen_, other.mean_, other._m2)
+        return self
+
+    def transform(
+        self,
+        X: np.ndarray,
+        in_place: bool = False,
+        out: Optional[np.ndarray] = None,
+        memory_budget: Optional[int] = None,
+        dtype: Any = "float64",
+    ) -> np.ndarray:
+        """
+        Standardise X with the fitted parameters.
+
+        Parameters are as in `standardise_features`: with in_place=True a
+        writeable floating-point X is overwritten instead of copied.
+        """
+        self._check_fitted()
+        if in_place:
+            if not isinstance(X, np.ndarray) or not np.issubdtype(X.dtype, np.floating):
+                raise TypeError(
+                    "In-place standardisation requires a floating-point array."
+                )
+            out = X
+        return apply_standardisation(
+            X, self.mean_, self.scale_, out=out, memory_budget=memory_budget, dtype=dtype
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Write the fitted state to an .npz file at exactly `path`.
+        """
+        self._check_fitted()
+        arrays = {
+            "n_samples_seen": np.array(self.n_samples_seen_),
+            "mean": self.mean_,
+            "m2": self._m2,
+        }
+        if self.feature_names_ is not None:
+            arrays["feature_names"] = np.array(self.feature_names_, dtype=str)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "StreamingStandardiser":
+        """
+        Read a standardiser written by `save`.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            names = None
+            if "feature_names" in data.files:
+                names = [str(name) for name in data["feature_names"]]
+            scaler = cls(names)
+            scaler.n_samples_seen_ = int(data["n_samples_seen"])
+            scaler.mean_ = data["mean"].astype(np.float64)
+            scaler._m2 = data["m2"].astype(np.float64)
+        return scaler
@@ -0,0 +1,147 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Lightweight per-stage instrumentation for the clustering pipeline.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+try:  # Not available on Windows.
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """
+    High-water mark of the resident set size of this process, in bytes.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def array_info(X: Any) -> Dict[str, Any]:
+    """
+    Shape, dtype and size in bytes of an array (or DataFrame).
+    """
+    if hasattr(X, "memory_usage") and not isinstance(X, np.ndarray):
+        # pandas DataFrame
+        return {"shape": list(X.shape), "nbytes": int(X.memory_usage(deep=False).sum())}
+    return {"shape": list(X.shape), "dtype": str(X.dtype), "nbytes": int(X.nbytes)}
+
+
+class StageProfiler:
+    """
+    Record wall time, CPU time and memory of named pipeline stages.
+
+    Each stage produces a record with:
+    - "stage": the stage name
+    - "wall_time_s", "cpu_time_s": elapsed wall-clock and process CPU time
+    - "peak_rss_bytes": process RSS high-water mark at the end of the stage,
+      and "rss_growth_bytes": how much the stage raised it
+    - "tracemalloc_peak_bytes": peak traced allocations above the level at
+      the start of the stage (only if trace_memory is True)
+    - "arrays": sizes of arrays attached by the stage (see `stage`)
+
+    Parameters
+    ----------
+    trace_memory : bool, default False
+        If True, trace Python/NumPy allocations with tracemalloc. This gives
+        exact per-stage peaks but slows down allocation-heavy code.
+    hook : callable or None
+        Called with each record as soon as its stage ends.
+    """
+
+    def __init__(
+        self,
+        trace_memory: bool = False,
+        hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        self.trace_memory = trace_memory
+        self.hook = hook
+        self.records: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Context manager measuring one stage.
+
+        The yielded record can be updated inside the block, e.g.
+        ``record["arrays"]["X"] = array_info(X)``.
+        """
+        record: Dict[str, Any] = {"stage": name, "arrays": {}}
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+        rss_start = _peak_rss_bytes()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_time_s"] = time.perf_counter() - wall_start
+            record["cpu_time_s"] = time.process_time() - cpu_start
+            rss_end = _peak_rss_bytes()
+            record["peak_rss_bytes"] = rss_end
+            record["rss_growth_bytes"] = (
+                None if rss_end is None or rss_start is None else rss_end - rss_start
+            )
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                record["tracemalloc_peak_bytes"] = max(0, peak - traced_start)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.records.append(record)
+            if self.hook is not None:
+                self.hook(record)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Records keyed by stage name, in execution order.
+        """
+        return {record["stage"]: record for record in self.records}
+
+    def summary(self) -> str:
+        """
+        Human-readable table of the stages, one line per stage.
+        """
+        return format_profile(self.records)
+
+
+def format_profile(records: Iterable[Dict[str, Any]]) -> str:
+    """
+    Human-readable table of stage records, one line per stage, e.g.
+    ``format_profile(result["profile"].values())`` for `run_clustering`.
+    """
+    records = list(records)
+    lines = [f"{'stage':<14} {'wall [s]':>9} {'cpu [s]':>9} {'peak RSS [MiB]':>15}"]
+    for record in records:
+        rss = record.get("peak_rss_bytes")
+        rss_str = "-" if rss is None else f"{rss / 1024 ** 2:.1f}"
+        lines.append(
+            f"{record['stage']:<14} {record['wall_time_s']:>9.3f} "
+            f"{record['cpu_time_s']:>9.3f} {rss_str:>15}"
+        )
+    total = sum(record["wall_time_s"] for record in records)
+    lines.append(f"{'total':<14} {total:>9.3f}")
+    return "\n".join(lines)
@@ -0,0 +1,51 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+"""
+Sampling helpers shared by the evaluation and plotting modules.
+"""
+
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+
+
+def stratified_sample(
+    labels: np.ndarray,
+    sample_size: int,
+    random_state: Union[None, int, np.random.RandomState] = None,
+) -> np.ndarray:
+    """
+    Indices of a sample stratified by cluster, with proportional allocation
+    and at least two points per cluster (when the cluster has them).
+
+    Parameters
+    ----------
+    labels : ndarray of shape (n_samples,)
+    sample_size : int
+        Approximate number of points in the sample.
+    random_state : int, RandomState or None
+
+    Returns
+    -------
+    indices : ndarray
+        Sorted row indices of the sample.
+    """
+    rng = (
+        random_state
+        if isinstance(random_state, np.random.RandomState)
+        else np.random.RandomState(random_state)
+    )
+    clusters, sizes = np.unique(labels, return_counts=True)
+    alloc = np.floor(sample_size * sizes / sizes.sum()).astype(int)
+    alloc = np.minimum(np.maximum(alloc, 2), sizes)
+    indices = [
+        rng.choice(np.flatnonzero(labels == cluster), size=n_h, replace=False)
+        for cluster, n_h in zip(clusters, alloc)
+    ]
+    return np.sort(np.concatenate(indices))
@@ -0,0 +1,292 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import unittest
+
+import numpy as np
+
+from cluster_maker.algorithms import (
+    assign_clusters,
+    bisecting_kmeans,
+    incremental_kmeans,
+    init_centroids,
+    kmeans,
+    update_centroids,
+)
+from cluster_maker.distances import nearest_centroid, pairwise_sq_distances
+from cluster_maker.evaluation import compute_inertia
+
+
+def _blobs(n_per_cluster=50, random_state=0):
+    rng = np.random.RandomState(random_state)
+    centres = np.array([[0.0, 0.0], [8.0, 8.0], [-8.0, 8.0]])
+    X = np.vstack([c + rng.normal(size=(n_per_cluster, 2)) for c in centres])
+    return X, centres
+
+
+class TestDistanceEngine(unittest.TestCase):
+    def test_pairwise_sq_distances_matches_broadcast(self):
+        rng = np.random.RandomState(0)
+        X = rng.normal(size=(40, 5))
+        C = rng.normal(size=(7, 5))
+        expected = ((X[:, None, :] - C[None, :, :]) ** 2).sum(axis=2)
+        self.assertTrue(np.allclose(pairwise_sq_distances(X, C), expected))
+
+    def test_assign_clusters_independent_of_memory_budget(self):
+        rng = np.random.RandomState(1)
+        X = rng.normal(size=(101, 4))
+        C = rng.normal(size=(6, 4))
+        expected = np.argmin(((X[:, None, :] - C[None, :, :]) ** 2).sum(axis=2), axis=1)
+        # A tiny budget forces one row per tile.
+        labels = assign_clusters(X, C, memory_budget=1)
+        self.assertTrue(np.array_equal(labels, expected))
+        self.assertTrue(np.array_equal(assign_clusters(X, C), expected))
+
+    def test_nearest_centroid_reuses_buffers(self):
+        X, centres = _blobs()
+        labels_out = np.empty(X.shape[0], dtype=np.intp)
+        dist_out = np.empty(X.shape[0])
+        labels, dist = nearest_centroid(X, centres, labels_out=labels_out, distances_out=dist_out)
+        self.assertIs(labels, labels_out)
+        self.assertIs(dist, dist_out)
+        self.assertTrue(np.allclose(dist, ((X - centres[labels]) ** 2).sum(axis=1)))
+
+
+class TestInitCentroids(unittest.TestCase):
+    def test_seeding_methods_pick_points_of_X(self):
+        X, _ = _blobs()
+        for init in ("random", "k-means++", "k-means||"):
+            centroids = init_centroids(X, 3, random_state=0, init=init)
+            self.assertEqual(centroids.shape, (3, 2))
+            for c in centroids:
+                self.assertTrue(np.any(np.all(X == c, axis=1)), init)
+
+    def test_kmeans_plusplus_spreads_centres_over_blobs(self):
+        X, centres = _blobs()
+        centroids = init_centroids(X, 3, random_state=0, init="k-means++")
+        # One seed per blob: each true centre has a distinct nearest seed.
+        self.assertEqual(len(set(assign_clusters(centres, centroids))), 3)
+
+    def test_array_init_and_validation(self):
+        X, centres = _blobs()
+        centroids = init_centroids(X, 3, init=centres)
+        self.assertTrue(np.array_equal(centroids, centres))
+        self.assertIsNot(centroids, centres)
+        with self.assertRaises(ValueError):
+            init_centroids(X, 2, init=centres)
+        with self.assertRaises(ValueError):
+            init_centroids(X, 3, init="furthest")
+
+
+class TestUpdateCentroids(unittest.TestCase):
+    def test_update_centroids_matches_cluster_means(self):
+        rng = np.random.RandomState(2)
+        X = rng.normal(size=(200, 3))
+        labels = rng.randint(0, 5, size=200)
+        out = np.empty((5, 3))
+        centroids = update_centroids(X, labels, 5, out=out)
+        self.assertIs(centroids, out)
+        for j in range(5):
+            self.assertTrue(np.allclose(centroids[j], X[labels == j].mean(axis=0)))
+
+    def test_empty_cluster_reinitialisation_varies_with_shared_rng(self):
+        X = np.arange(200, dtype=float).reshape(100, 2)
+        labels = np.zeros(100, dtype=np.intp)
+        rng = np.random.RandomState(0)
+        picks = {
+            tuple(update_centroids(X, labels, 2, random_state=rng)[1])
+            for _ in range(5)
+        }
+        self.assertGreater(len(picks), 1)
+
+
+class TestKMeans(unittest.TestCase):
+    def test_kmeans_recovers_blobs(self):
+        X, _ = _blobs()
+        labels, centroids = kmeans(X, k=3, random_state=0)
+        self.assertEqual(centroids.shape, (3, 2))
+        self.assertEqual(len(np.unique(labels)), 3)
+        inertia = compute_inertia(X, labels, centroids)
+        self.assertAlmostEqual(
+            inertia, float(((X - centroids[labels]) ** 2).sum()), places=8
+        )
+        self.assertAlmostEqual(
+            compute_inertia(X, labels, centroids, memory_budget=1), inertia, places=8
+        )
+
+    def test_accelerated_algorithms_match_lloyd(self):
+        rng = np.random.RandomState(3)
+        X64 = rng.normal(size=(400, 3))
+        for X in (X64, X64.astype(np.float32)):
+            for k in (4, 25):
+                ref_labels, ref_centroids = kmeans(X, k=k, random_state=7)
+                for algorithm in ("hamerly", "elkan", "auto"):
+                    labels, centroids, info = kmeans(
+                        X, k=k, random_state=7, algorithm=algorithm, return_info=True
+                    )
+                    case = (X.dtype, k, algorithm)
+                    self.assertTrue(np.array_equal(labels, ref_labels), case)
+                    self.assertTrue(np.allclose(centroids, ref_centroids), case)
+                    self.assertGreater(info["distances_skipped"], 0)
+
+    def test_history_is_identical_across_algorithms(self):
+        X, _ = _blobs()
+        _, _, ref = kmeans(X, k=3, random_state=0, return_info=True)
+        self.assertEqual(len(ref["history"]), ref["n_iter"])
+        inertias = [row["inertia"] for row in ref["history"]]
+        self.assertTrue(all(a >= b - 1e-9 for a, b in zip(inertias, inertias[1:])))
+        for algorithm in ("hamerly", "elkan"):
+            _, _, info = kmeans(X, k=3, random_state=0, algorithm=algorithm, return_info=True)
+            self.assertTrue(
+                np.allclose([row["inertia"] for row in info["history"]], inertias)
+            )
+            self.assertTrue(
+                np.allclose(
+                    [row["shift"] for row in info["history"]],
+                    [row["shift"] for row in ref["history"]],
+                )
+            )
+
+    def test_n_init_is_reproducible_across_worker_counts(self):
+        rng = np.random.RandomState(4)
+        X = rng.normal(size=(300, 2))
+        serial = kmeans(X, k=5, random_state=11, n_init=4, return_info=True)
+        threaded = kmeans(X, k=5, random_state=11, n_init=4, n_jobs=3, return_info=True)
+        self.assertTrue(np.array_equal(serial[0], threaded[0]))
+        self.assertTrue(np.array_equal(serial[1], threaded[1]))
+        self.assertEqual(len(serial[2]["inertias"]), 4)
+        self.assertEqual(serial[2]["inertia"], min(serial[2]["inertias"]))
+
+    def test_kmeans_rejects_unknown_algorithm(self):
+        X, _ = _blobs()
+        with self.assertRaises(ValueError):
+            kmeans(X, k=3, algorithm="fastest")
+
+
+class TestFloat32(unittest.TestCase):
+    def test_float32_matches_float64(self):
+        X, _ = _blobs(n_per_cluster=500)
+        X32 = X.astype(np.float32)
+        ref_labels, ref_centroids = kmeans(X, k=3, random_state=0)
+        for algorithm in ("lloyd", "hamerly", "elkan"):
+            labels, centroids = kmeans(X, k=3, random_state=0, algorithm=algorithm, dtype="float32")
+            self.assertTrue(np.array_equal(labels, ref_labels))
+            # float32 input needs no dtype and gives the same fit.
+            labels32, centroids32 = kmeans(X32, k=3, random_state=0, algorithm=algorithm)
+            self.assertTrue(np.array_equal(labels32, labels), algorithm)
+            self.assertTrue(np.array_equal(centroids32, centroids), algorithm)
+            # Centroids are accumulated and returned in float64.
+            self.assertEqual(centroids.dtype, np.float64)
+            self.assertTrue(np.allclose(centroids, ref_centroids, atol=1e-5))
+
+        self.assertTrue(np.array_equal(assign_clusters(X, ref_centroids, dtype="float32"), ref_labels))
+        self.assertEqual(update_centroids(X32, ref_labels, 3, dtype="float32").dtype, np.float32)
+        inertia = compute_inertia(X, ref_labels, ref_centroids)
+        inertia32 = compute_inertia(X32, ref_labels, ref_centroids)
+        self.assertLess(abs(inertia32 - inertia) / inertia, 1e-6)
+
+    def test_rejects_non_float_dtype(self):
+        X, _ = _blobs()
+        with self.assertRaises(ValueError):
+            kmeans(X, k=3, dtype="int32")
+
+
+
+class TestIncrementalKMeans(unittest.TestCase):
+    def setUp(self):
+        X, _ = _blobs(n_per_cluster=2000)
+        rng = np.random.RandomState(1)
+        self.X = X[rng.permutation(len(X))]
+        self.n_old = 5000
+        labels, self.centroids = kmeans(self.X[:self.n_old], k=3, random_state=0)
+        self.counts = np.bincount(labels, minlength=3)
+
+    def test_refine_warm_start_converges_quickly(self):
+        _, _, cold = kmeans(self.X, k=3, random_state=0, return_info=True)
+        labels, centroids, counts, info = incremental_kmeans(
+            self.centroids, self.counts, self.X[self.n_old:], self.X, method="refine", return_info=True
+        )
+        self.assertLessEqual(info["n_iter"], cold["n_iter"])
+        self.assertLessEqual(info["n_iter"], 3)
+        self.assertEqual(counts.sum(), len(self.X))
+        self.assertTrue(np.array_equal(counts, np.bincount(labels, minlength=3)))
+
+    def test_refine_reinitialises_empty_clusters_reproducibly(self):
+        # A centroid far from every point loses all its members at once.
+        centroids = np.vstack([self.centroids, [[1e3, 1e3]]])
+        counts = np.append(self.counts, 0)
+        fits = [
+            incremental_kmeans(
+                centroids, counts, self.X[self.n_old:], self.X, method="refine", random_state=0
+            )
+            for _ in range(2)
+        ]
+        self.assertTrue(np.array_equal(fits[0][0], fits[1][0]))
+        self.assertTrue(np.array_equal(fits[0][1], fits[1][1]))
+        self.assertLess(np.abs(fits[0][1]).max(), 1e3)
+
+    def test_online_update_keeps_running_means(self):
+        labels, centroids, counts = incremental_kmeans(
+            self.centroids, self.counts, self.X[self.n_old:], batch_size=10_000
+        )
+        self.assertEqual(labels.shape, (len(self.X) - self.n_old,))
+        self.assertEqual(counts.sum(), len(self.X))
+        # One batch: each centroid is the weighted mean of its old value and
+        # the new points assigned to it.
+        new_labels = assign_clusters(self.X[self.n_old:], self.centroids)
+        for j in range(3):
+            members = self.X[self.n_old:][new_labels == j]
+            expected = (self.counts[j] * self.centroids[j] + members.sum(axis=0)) / counts[j]
+            np.testing.assert_allclose(centroids[j], expected)
+        with self.assertRaises(ValueError):
+            incremental_kmeans(self.centroids, self.counts, self.X, method="refine")
+        with self.assertRaises(ValueError):
+            incremental_kmeans(self.centroids, self.counts[:2], self.X)
+
+
+class TestBisectingKMeans(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        centres = rng.uniform(-50, 50, size=(12, 3))
+        self.X = np.vstack([c + rng.normal(size=(100, 3)) for c in centres])
+
+    def test_tree_assignment_and_split_history(self):
+        labels, centroids, info = bisecting_kmeans(self.X, k=12, random_state=0, return_info=True)
+        tree = info["tree"]
+        self.assertEqual(tree.n_clusters, 12)
+        self.assertEqual(centroids.shape, (12, 3))
+        self.assertTrue(np.array_equal(tree.assign(self.X), labels))
+        self.assertTrue(np.array_equal(tree.assign(self.X, memory_budget=256), labels))
+        self.assertLess(info["depth"], 12)
+        self.assertAlmostEqual(info["inertia"], compute_inertia(self.X, labels, centroids))
+        # Well separated blobs: the tree finds the nearest centroid.
+        self.assertTrue(np.array_equal(assign_clusters(self.X, centroids), labels))
+
+        inertias = list(info["elbow_inertias"].values())
+        self.assertListEqual(list(info["elbow_inertias"]), list(range(1, 13)))
+        self.assertTrue(all(a > b for a, b in zip(inertias, inertias[1:])))
+
+    def test_fewer_clusters_are_a_prefix_of_the_splits(self):
+        _, _, info = bisecting_kmeans(self.X, k=12, random_state=0, return_info=True)
+        labels, centroids = bisecting_kmeans(self.X, k=5, random_state=0)
+        self.assertTrue(np.array_equal(info["tree"].assign(self.X, n_clusters=5), labels))
+        np.testing.assert_allclose(info["tree"].leaf_centroids(5), centroids)
+        self.assertAlmostEqual(
+            info["elbow_inertias"][5], compute_inertia(self.X, labels, centroids)
+        )
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            bisecting_kmeans(self.X[:3], k=4)
+        with self.assertRaises(ValueError):
+            # Only two distinct points.
+            bisecting_kmeans(np.repeat([[0.0, 0.0], [1.0, 1.0]], 5, axis=0), k=3)
+        labels, _ = bisecting_kmeans(self.X.astype(np.float32), k=12, random_state=0)
+        self.assertEqual(len(np.unique(labels)), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
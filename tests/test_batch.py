@@ -0,0 +1,82 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.batch import run_batch
+from cluster_maker.cli import main
+from cluster_maker.interface import run_clustering
+
+
+def _write_blobs_csv(path, random_state=0):
+    rng = np.random.RandomState(random_state)
+    X = np.vstack([c + rng.normal(size=(100, 2)) for c in ([0, 0], [9, 9], [-9, 9])])
+    pd.DataFrame(X, columns=["x", "y"]).to_csv(path, index=False)
+
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.inputs = []
+        for i in range(2):
+            path = os.path.join(self.tmpdir.name, f"input{i}.csv")
+            _write_blobs_csv(path, random_state=i)
+            self.inputs.append(path)
+        self.bad = os.path.join(self.tmpdir.name, "bad.csv")
+        with open(self.bad, "w") as f:
+            f.write("x,y\na,b\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_grid_matches_run_clustering_and_failures_are_recorded(self):
+        summary_path = os.path.join(self.tmpdir.name, "summary.csv")
+        summary = run_batch(
+            self.inputs + [self.bad],
+            ["x", "y"],
+            param_grid={"k": [2, 3], "standardise": [True, False], "random_state": [0]},
+            output_dir=os.path.join(self.tmpdir.name, "labels"),
+            summary_path=summary_path,
+        )
+        self.assertEqual(len(summary), 12)
+        self.assertListEqual(list(summary["status"]), ["ok"] * 8 + ["error"] * 4)
+        self.assertTrue(summary["error"].iloc[8].startswith("TypeError"))
+        self.assertEqual(len(pd.read_csv(summary_path)), 12)
+
+        row = summary[(summary["input"] == self.inputs[1]) & (summary["k"] == 3) & summary["standardise"]].iloc[0]
+        ref = run_clustering(self.inputs[1], ["x", "y"], k=3, random_state=0, plot="none")
+        self.assertAlmostEqual(row["inertia"], ref["metrics"]["inertia"], places=6)
+        labels = pd.read_csv(row["labels_path"])
+        self.assertTrue(np.array_equal(labels["cluster"], ref["labels"]))
+
+        with self.assertRaises(ValueError):
+            run_batch(self.inputs, param_grid={"init": ["random"]})
+
+    def test_invalid_silhouette_method_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run_batch(self.inputs, ["x", "y"], silhouette="bogus")
+
+    def test_process_pool_and_command_line(self):
+        summary = run_batch(self.inputs, param_grid={"k": [2, 3], "random_state": [0]}, n_jobs=2)
+        serial = run_batch(self.inputs, param_grid={"k": [2, 3], "random_state": [0]})
+        np.testing.assert_allclose(summary["inertia"], serial["inertia"])
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            status = main(["batch", self.inputs[0], self.bad, "--k", "2", "--random-state", "0"])
+        self.assertEqual(status, 1)
+        self.assertIn("input0.csv", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from cluster_maker.cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fingerprint_and_keys(self):
+        cache = ResultCache(self.cache_dir)
+        path = os.path.join(self.tmpdir.name, "a.csv")
+        with open(path, "w") as f:
+            f.write("x\n1\n")
+        first = cache.fingerprint(path)
+        self.assertEqual(cache.fingerprint(path), first)
+        with open(path, "w") as f:
+            f.write("x\n2\n")
+        os.utime(path, ns=(1, 1))
+        self.assertNotEqual(cache.fingerprint(path), first)
+        self.assertNotEqual(cache.key("fit", first, {"k": 3}), cache.key("fit", first, {"k": 4}))
+        self.assertEqual(cache.key("fit", first, {"k": 3, "a": 1}), cache.key("fit", first, {"a": 1, "k": 3}))
+
+        # One fingerprint record per input: another cache object (e.g. in
+        # another process) updating a second input keeps the first record.
+        other = os.path.join(self.tmpdir.name, "b.csv")
+        with open(other, "w") as f:
+            f.write("x\n3\n")
+        ResultCache(self.cache_dir).fingerprint(other)
+        records = os.listdir(os.path.join(self.cache_dir, "fingerprints"))
+        self.assertEqual(len(records), 2)
+        cache.clear()
+        self.assertListEqual(os.listdir(os.path.join(self.cache_dir, "fingerprints")), [])
+
+    def test_round_trip_and_lru_eviction(self):
+        cache = ResultCache(self.cache_dir, max_bytes=6000)
+        block = np.arange(250, dtype=np.float64)  # 2.5 kB per entry
+        cache.put("a", {"v": np.float64(1.5)}, {"x": block})
+        meta, arrays = cache.get("a")
+        self.assertEqual(meta, {"v": 1.5})
+        np.testing.assert_array_equal(arrays["x"], block)
+        cache.put("b", {}, {"x": block})
+        os.utime(os.path.join(self.cache_dir, "b.npz"), ns=(1, 1))
+        cache.get("a")
+        cache.put("c", {}, {"x": block})
+        # "b" was the least recently used entry.
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
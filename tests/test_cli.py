@@ -0,0 +1,92 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.cli import main
+
+
+def _run_main(argv):
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        status = main(argv)
+    return status, out.getvalue(), err.getvalue()
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        rng = np.random.RandomState(0)
+        X = np.vstack([c + rng.normal(size=(100, 2)) for c in ([0, 0], [9, 9], [-9, 9])])
+        df = pd.DataFrame(X, columns=["x", "y"])
+        df["name"] = "p"
+        self.input_path = os.path.join(self.tmpdir.name, "input.csv")
+        df.to_csv(self.input_path, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_run_streaming_with_output(self):
+        output_path = os.path.join(self.tmpdir.name, "labels.csv")
+        status, out, _ = _run_main(
+            [
+                "run", self.input_path, "--k", "3", "--random-state", "0",
+                "--chunk-size", "64", "--output", output_path, "--labels-only",
+                "--silhouette", "simplified",
+            ]
+        )
+        self.assertEqual(status, 0)
+        # Numeric columns are picked by default; the stage table is printed.
+        self.assertIn("Features: x, y", out)
+        self.assertIn("Clustered 300 rows", out)
+        self.assertIn("assign", out)
+        self.assertEqual(len(pd.read_csv(output_path)), 300)
+
+    def test_run_elbow_options(self):
+        status, out, _ = _run_main(
+            [
+                "run", self.input_path, "--random-state", "0", "--elbow", "--elbow-k", "1", "2", "3",
+                "--elbow-warm-start", "--n-jobs", "2",
+            ]
+        )
+        self.assertEqual(status, 0)
+        self.assertIn("Elbow inertias:", out)
+        self.assertIn("k=3:", out)
+
+    def test_batch_and_errors(self):
+        status, out, _ = _run_main(["batch", self.input_path, "--k", "2", "3", "--random-state", "0"])
+        self.assertEqual(status, 0)
+        self.assertEqual(out.count("ok"), 2)
+        status, _, err = _run_main(["run", os.path.join(self.tmpdir.name, "missing.csv")])
+        self.assertEqual(status, 1)
+        self.assertIn("error", err)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["run", self.input_path, "--dtype", "float16"])
+
+    def test_no_plot_run_does_not_import_matplotlib(self):
+        code = (
+            "import sys\n"
+            "from cluster_maker.cli import main\n"
+            f"main(['run', {self.input_path!r}, '--random-state', '0'])\n"
+            "print('matplotlib' in sys.modules, file=sys.stderr)\n"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(completed.stderr.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.data_analyser import (
+    QuantileSketch,
+    StreamingStatistics,
+    calculate_streaming_correlation,
+    streaming_statistics,
+)
+
+
+def _frame(n=5000, random_state=0):
+    rng = np.random.RandomState(random_state)
+    X = rng.normal(size=(n, 3)) @ rng.normal(size=(3, 3)) + 1e6
+    df = pd.DataFrame(X, columns=["a", "b", "c"])
+    df.loc[rng.rand(n) < 0.1, "b"] = np.nan
+    df["name"] = "p"
+    return df
+
+
+def _chunks(df, size):
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+class TestStreamingStatistics(unittest.TestCase):
+    def setUp(self):
+        self.df = _frame()
+
+    def test_matches_pandas(self):
+        stats = streaming_statistics(_chunks(self.df, 700))
+        numeric = self.df[["a", "b", "c"]]
+        expected = numeric.describe()
+        result = stats.describe()
+        self.assertListEqual(list(result.index), list(expected.index))
+        moments = ["count", "mean", "std", "min", "max"]
+        np.testing.assert_allclose(result.loc[moments], expected.loc[moments], rtol=1e-9)
+        # Quantiles are approximate once the sketch has compacted.
+        np.testing.assert_allclose(
+            result.loc[["25%", "50%", "75%"]], expected.loc[["25%", "50%", "75%"]], atol=0.1
+        )
+        np.testing.assert_allclose(stats.correlation(), numeric.corr(), atol=1e-9)
+        np.testing.assert_allclose(stats.covariance(), numeric.cov(), rtol=1e-8)
+
+    def test_merge_equals_single_pass(self):
+        chunks = _chunks(self.df, 700)
+        single = streaming_statistics(chunks)
+        left = streaming_statistics(chunks[:3])
+        right = streaming_statistics(chunks[3:])
+        merged = StreamingStatistics().merge(left).merge(right)
+        np.testing.assert_allclose(merged.correlation(), single.correlation(), atol=1e-12)
+        np.testing.assert_allclose(
+            merged.describe().loc[["count", "mean", "std", "min", "max"]],
+            single.describe().loc[["count", "mean", "std", "min", "max"]],
+            rtol=1e-12,
+        )
+        with self.assertRaises(ValueError):
+            merged.merge(streaming_statistics(chunks, columns=["a", "c"]))
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.csv")
+            small = self.df.iloc[:300]
+            small.to_csv(path, index=False)
+            stats = streaming_statistics(path, columns=["a", "b"], chunk_size=64)
+            # Small inputs fit in the sketch, so every statistic is exact.
+            pd.testing.assert_frame_equal(stats.describe(), small[["a", "b"]].describe())
+            corr = calculate_streaming_correlation(path, chunk_size=64)
+            np.testing.assert_allclose(corr, small.corr(numeric_only=True), atol=1e-9)
+
+    def test_quantile_sketch(self):
+        values = np.random.RandomState(1).rand(200_000)
+        sketch = QuantileSketch(capacity=256, random_state=0)
+        for start in range(0, values.size, 10_000):
+            sketch.update(values[start:start + 10_000])
+        self.assertEqual(sketch.count, values.size)
+        self.assertLess(sum(level.size for level in sketch.levels), 256 * 12)
+        np.testing.assert_allclose(sketch.quantile([0.1, 0.5, 0.9]), [0.1, 0.5, 0.9], atol=0.02)
+        with self.assertRaises(ValueError):
+            sketch.quantile(1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from cluster_maker.data_exporter import export_data, export_labels
+from cluster_maker.data_loader import detect_format, iter_data_chunks, load_data
+from cluster_maker.interface import run_clustering
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def _frame(n=120, random_state=0):
+    rng = np.random.RandomState(random_state)
+    X = np.vstack([c + rng.normal(size=(n // 3, 2)) for c in ([0, 0], [9, 9], [-9, 9])])
+    df = pd.DataFrame(X, columns=["x", "y"])
+    df["z"] = np.arange(len(df), dtype=float)
+    return df
+
+
+class TestDataIO(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.df = _frame()
+
+    def tearDown(self):
+        plt.close("all")
+        self.tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("a/b.CSV"), "csv")
+        self.assertEqual(detect_format("b.parquet"), "parquet")
+        self.assertEqual(detect_format("b.arrow"), "feather")
+        with self.assertRaises(ValueError):
+            detect_format("b.xlsx")
+
+    def test_round_trip_and_projection(self):
+        names = ["data.csv", "data.npy"]
+        if HAS_PYARROW:
+            names += ["data.parquet", "data.feather"]
+        for name in names:
+            path = self._path(name)
+            export_data(self.df, path)
+            loaded = load_data(path)
+            expected = self.df.copy()
+            if name.endswith(".npy"):
+                expected.columns = ["0", "1", "2"]
+            pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+
+            cols = ["2", "0"] if name.endswith(".npy") else ["z", "x"]
+            projected = load_data(path, columns=cols)
+            self.assertListEqual(list(projected.columns), cols)
+            with self.assertRaises(KeyError):
+                load_data(path, columns=["missing"])
+
+            chunks = list(iter_data_chunks(path, 50, columns=cols))
+            self.assertListEqual([len(c) for c in chunks], [50, 50, 20])
+            pd.testing.assert_frame_equal(pd.concat(chunks), projected, check_dtype=False)
+
+    def test_export_labels_only(self):
+        path = self._path("labels.csv")
+        export_labels(np.array([2, 0, 1]), path, index=[10, 11, 12])
+        written = pd.read_csv(path)
+        self.assertListEqual(list(written.columns), ["row", "cluster"])
+        self.assertListEqual(list(written["row"]), [10, 11, 12])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_run_clustering_from_parquet_with_labels_only_output(self):
+        input_path = self._path("input.parquet")
+        output_path = self._path("labels.parquet")
+        export_data(self.df, input_path)
+        result = run_clustering(
+            input_path,
+            ["x", "y"],
+            k=3,
+            random_state=0,
+            output_path=output_path,
+            output_labels_only=True,
+        )
+        self.assertListEqual(list(result["data"].columns), ["x", "y", "cluster"])
+        labels = pd.read_parquet(output_path)
+        self.assertListEqual(list(labels.columns), ["row", "cluster"])
+        self.assertTrue(np.array_equal(labels["cluster"], result["labels"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
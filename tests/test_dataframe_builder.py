@@ -9,7 +9,11 @@ import unittest
 import numpy as np
 import pandas as pd
 
-from cluster_maker.dataframe_builder import define_dataframe_structure, simulate_data
+from cluster_maker.dataframe_builder import (
+    define_dataframe_structure,
+    simulate_data,
+    simulate_data_chunks,
+)
 
 
 class TestDataFrameBuilder(unittest.TestCase):
@@ -33,6 +37,30 @@ class TestDataFrameBuilder(unittest.TestCase):
         self.assertEqual(data.shape[0], 100)
         self.assertIn("true_cluster", data.columns)
 
+    def test_simulate_data_chunks_concatenate_to_simulate_data(self):
+        seed_df = define_dataframe_structure(
+            [{"name": "x", "reps": [0.0, 5.0, 9.0]}, {"name": "y", "reps": [1.0, 2.0, 3.0]}]
+        )
+        full = simulate_data(seed_df, n_points=1001, random_state=3)
+        chunks = list(simulate_data_chunks(seed_df, n_points=1001, random_state=3, chunk_size=100))
+        self.assertEqual(len(chunks), 11)
+        pd.testing.assert_frame_equal(pd.concat(chunks), full)
+
+    def test_simulate_data_weights_and_per_cluster_std(self):
+        seed_df = define_dataframe_structure(
+            [{"name": "x", "reps": [0.0, 100.0]}, {"name": "y", "reps": [0.0, 100.0]}]
+        )
+        data = simulate_data(
+            seed_df, n_points=4000, cluster_std=[0.5, 3.0], weights=[3, 1], random_state=0
+        )
+        counts = data["true_cluster"].value_counts().sort_index()
+        self.assertListEqual(list(counts), [3000, 1000])
+        stds = data.groupby("true_cluster")["x"].std()
+        self.assertAlmostEqual(stds[0], 0.5, delta=0.05)
+        self.assertAlmostEqual(stds[1], 3.0, delta=0.3)
+        with self.assertRaises(ValueError):
+            simulate_data(seed_df, cluster_std=[1.0, -1.0])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from cluster_maker.algorithms import kmeans
+from cluster_maker.evaluation import (
+    _split_highest_sse,
+    elbow_curve,
+    evaluate_silhouette,
+    iter_elbow_curve,
+    silhouette_score_sampled,
+    silhouette_metrics,
+    silhouette_score_sklearn,
+    simplified_silhouette,
+)
+
+
+def _blobs(n_per_cluster=60, random_state=0):
+    rng = np.random.RandomState(random_state)
+    centres = np.array([[0.0, 0.0], [8.0, 8.0], [-8.0, 8.0], [8.0, -8.0]])
+    return np.vstack([c + rng.normal(size=(n_per_cluster, 2)) for c in centres])
+
+
+class TestElbowCurve(unittest.TestCase):
+    def test_parallel_sweep_matches_serial(self):
+        X = _blobs()
+        k_values = [1, 2, 3, 4, 5]
+        for use_sklearn in (True, False):
+            serial = elbow_curve(X, k_values, random_state=0, use_sklearn=use_sklearn)
+            parallel = elbow_curve(
+                X, k_values, random_state=0, use_sklearn=use_sklearn, n_jobs=3
+            )
+            self.assertListEqual(list(parallel), k_values)
+            for k in k_values:
+                self.assertAlmostEqual(parallel[k], serial[k], places=6)
+
+    def test_warm_start_split_of_a_cluster_without_spread(self):
+        # Cluster 0 has the highest SSE but identical members (its centre is
+        # not their mean, as can happen with scikit-learn's final labels).
+        X = np.array([[0.0, 0.0], [0.0, 0.0], [5.0, 5.0], [6.0, 6.0]])
+        centroids = _split_highest_sse(
+            X, np.array([0, 0, 1, 1]), np.array([[1.0, 1.0], [5.5, 5.5]]), 2
+        )
+        self.assertEqual(centroids.shape, (4, 2))
+        self.assertEqual(len(np.unique(centroids, axis=0)), 4)
+        np.testing.assert_array_equal(centroids[2], [0.0, 0.0])
+
+    def test_warm_start_gives_decreasing_inertia(self):
+        X = _blobs()
+        inertias = elbow_curve(X, [1, 2, 3, 4], random_state=0, use_sklearn=False, warm_start=True)
+        values = [inertias[k] for k in (1, 2, 3, 4)]
+        self.assertTrue(all(a > b for a, b in zip(values, values[1:])))
+        # The warm-started k=4 fit finds the four blobs.
+        self.assertLess(values[-1], 2.5 * X.shape[0])
+
+    def test_results_are_streamed_through_callback(self):
+        X = _blobs()
+        seen = []
+        elbow_curve(X, [2, 3], random_state=0, callback=lambda k, v: seen.append(k))
+        self.assertCountEqual(seen, [2, 3])
+        self.assertEqual(len(list(iter_elbow_curve(X, [1, 2], n_jobs=2))), 2)
+
+    def test_invalid_k(self):
+        with self.assertRaises(ValueError):
+            elbow_curve(_blobs(), [0, 2])
+
+
+class TestSilhouette(unittest.TestCase):
+    def setUp(self):
+        self.X = _blobs(n_per_cluster=300)
+        self.labels, self.centroids = kmeans(self.X, k=4, random_state=0)
+        self.exact = silhouette_score_sklearn(self.X, self.labels)
+
+    def test_sampled_estimate_is_close_and_bracketed(self):
+        score, (low, high) = silhouette_score_sampled(
+            self.X, self.labels, sample_size=400, random_state=0
+        )
+        self.assertLess(low, score)
+        self.assertLess(score, high)
+        self.assertAlmostEqual(score, self.exact, delta=0.05)
+
+    def test_sampled_estimate_bounds_its_distance_memory(self):
+        # The whole 1200-point sample would need an 11 MB distance matrix.
+        tracemalloc.start()
+        try:
+            bounded, _ = silhouette_score_sampled(
+                self.X, self.labels, sample_size=2000, random_state=0,
+                memory_budget=1024 ** 2,
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 4 * 1024 ** 2)
+        self.assertAlmostEqual(bounded, self.exact)
+
+    def test_simplified_silhouette_is_close(self):
+        score = simplified_silhouette(self.X, self.labels, self.centroids)
+        self.assertAlmostEqual(score, self.exact, delta=0.1)
+
+    def test_auto_strategy_depends_on_size(self):
+        small = evaluate_silhouette(self.X, self.labels, self.centroids)
+        self.assertEqual(small["silhouette_method"], "exact")
+        self.assertAlmostEqual(small["silhouette"], self.exact)
+        large = evaluate_silhouette(self.X, self.labels, self.centroids, sample_size=300)
+        self.assertEqual(large["silhouette_method"], "sampled")
+        self.assertIsNotNone(large["silhouette_ci"])
+        tiny_budget = evaluate_silhouette(
+            self.X, self.labels, self.centroids, time_budget=1e-9
+        )
+        self.assertEqual(tiny_budget["silhouette_method"], "simplified")
+
+    def test_single_cluster_rejected(self):
+        with self.assertRaises(ValueError):
+            evaluate_silhouette(self.X, np.zeros(self.X.shape[0], dtype=int))
+
+    def test_metrics_entries_are_none_only_when_undefined_or_skipped(self):
+        one_cluster = silhouette_metrics(self.X, np.zeros(self.X.shape[0], dtype=int))
+        self.assertIsNone(one_cluster["silhouette"])
+        self.assertIsNone(silhouette_metrics(self.X, self.labels, method="none")["silhouette"])
+        self.assertAlmostEqual(silhouette_metrics(self.X, self.labels)["silhouette"], self.exact)
+        with self.assertRaises(ValueError):
+            silhouette_metrics(self.X, self.labels, method="bogus")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import subprocess
+import sys
+import unittest
+
+import cluster_maker
+
+
+def _loaded_modules(statement):
+    """
+    Top-level heavy modules loaded by `statement` in a fresh interpreter.
+    """
+    code = (
+        f"{statement}\n"
+        "import sys\n"
+        "print(' '.join(m for m in ('matplotlib', 'sklearn', 'pandas', 'scipy') if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_import_does_not_load_heavy_dependencies(self):
+        self.assertEqual(_loaded_modules("import cluster_maker"), set())
+        self.assertEqual(
+            _loaded_modules("from cluster_maker import assign_clusters, kmeans, load_model"),
+            set(),
+        )
+        self.assertNotIn(
+            "matplotlib", _loaded_modules("from cluster_maker import run_clustering")
+        )
+
+    def test_public_names_resolve(self):
+        for name in cluster_maker.__all__:
+            self.assertTrue(callable(getattr(cluster_maker, name)), name)
+        self.assertIn("kmeans", dir(cluster_maker))
+        self.assertIs(cluster_maker.distances, sys.modules["cluster_maker.distances"])
+        with self.assertRaises(AttributeError):
+            cluster_maker.not_a_function
+
+
+if __name__ == "__main__":
+    unittest.main()
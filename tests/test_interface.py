@@ -0,0 +1,338 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from cluster_maker.interface import run_clustering
+
+
+def _write_blobs_csv(path, n_per_cluster=200, random_state=0):
+    rng = np.random.RandomState(random_state)
+    centres = np.array([[0.0, 0.0], [10.0, 10.0], [-10.0, 10.0]])
+    X = np.vstack([c + rng.normal(size=(n_per_cluster, 2)) for c in centres])
+    df = pd.DataFrame(X, columns=["x", "y"])
+    df["name"] = "p"
+    df.to_csv(path, index=False)
+    return df
+
+
+class TestRunClustering(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmpdir.name, "input.csv")
+        self.df = _write_blobs_csv(self.input_path)
+
+    def tearDown(self):
+        plt.close("all")
+        self.tmpdir.cleanup()
+
+    def test_streaming_matches_in_memory(self):
+        output_path = os.path.join(self.tmpdir.name, "out.csv")
+        full = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0)
+        streamed = run_clustering(
+            self.input_path,
+            ["x", "y"],
+            k=3,
+            random_state=0,
+            output_path=output_path,
+            chunk_size=64,
+        )
+        self.assertIsNone(streamed["data"])
+        self.assertEqual(streamed["n_samples"], len(self.df))
+        self.assertAlmostEqual(
+            streamed["metrics"]["inertia"], full["metrics"]["inertia"], delta=1e-3
+        )
+
+        written = pd.read_csv(output_path)
+        self.assertEqual(len(written), len(self.df))
+        self.assertListEqual(list(written.columns), ["x", "y", "name", "cluster"])
+        # Same partition up to a relabelling of the clusters.
+        pairs = set(zip(full["labels"], written["cluster"]))
+        self.assertEqual(len(pairs), 3)
+
+    def test_silhouette_strategies(self):
+        sampled = run_clustering(
+            self.input_path, ["x", "y"], k=3, random_state=0, silhouette_sample_size=100
+        )
+        self.assertEqual(sampled["metrics"]["silhouette_method"], "sampled")
+        skipped = run_clustering(self.input_path, ["x", "y"], k=3, silhouette="none")
+        self.assertIsNone(skipped["metrics"]["silhouette"])
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path, ["x", "y"], silhouette="approximate")
+
+    def test_profile_records_every_stage(self):
+        seen = []
+        result = run_clustering(
+            self.input_path,
+            ["x", "y"],
+            k=3,
+            random_state=0,
+            compute_elbow=True,
+            profile_hook=lambda record: seen.append(record["stage"]),
+            trace_memory=True,
+        )
+        profile = result["profile"]
+        self.assertListEqual(list(profile), seen)
+        self.assertListEqual(
+            seen,
+            ["load", "select", "standardise", "fit", "inertia", "silhouette", "plot", "elbow"],
+        )
+        for record in profile.values():
+            self.assertGreaterEqual(record["wall_time_s"], 0.0)
+            self.assertIn("tracemalloc_peak_bytes", record)
+        self.assertEqual(profile["select"]["arrays"]["X"]["shape"], [600, 2])
+        self.assertIn("history", profile["fit"]["kmeans"])
+
+    def test_float32_pipeline(self):
+        ref = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0)
+        result = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0, dtype="float32")
+        self.assertEqual(result["profile"]["standardise"]["arrays"]["X"]["dtype"], "float32")
+        self.assertTrue(np.array_equal(result["labels"], ref["labels"]))
+        self.assertAlmostEqual(
+            result["metrics"]["inertia"], ref["metrics"]["inertia"], delta=1e-4
+        )
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path, ["x", "y"], dtype="float16")
+
+    def test_plot_modes(self):
+        figure_path = os.path.join(self.tmpdir.name, "clusters.png")
+        eager = run_clustering(
+            self.input_path,
+            ["x", "y"],
+            k=3,
+            random_state=0,
+            plot_options={"style": "hexbin", "output_path": figure_path},
+        )
+        self.assertIsNotNone(eager["fig_cluster"])
+        self.assertIsNone(eager["render_plots"])
+        self.assertTrue(os.path.getsize(figure_path) > 0)
+        # Headless figures are not registered with pyplot.
+        self.assertListEqual(plt.get_fignums(), [])
+
+        deferred = run_clustering(
+            self.input_path, ["x", "y"], k=3, random_state=0, compute_elbow=True, plot="deferred"
+        )
+        self.assertIsNone(deferred["fig_cluster"])
+        self.assertNotIn("plot", deferred["profile"])
+        fig_cluster, fig_elbow = deferred["render_plots"]()
+        self.assertIsNotNone(fig_cluster)
+        self.assertIsNotNone(fig_elbow)
+
+        skipped = run_clustering(
+            self.input_path, ["x", "y"], k=3, chunk_size=100, random_state=0, plot="none"
+        )
+        self.assertIsNone(skipped["fig_cluster"])
+        self.assertIsNone(skipped["render_plots"])
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path, ["x", "y"], plot="lazy")
+
+    def test_scaler_path_reuses_parameters(self):
+        scaler_path = os.path.join(self.tmpdir.name, "scaler.npz")
+        first = run_clustering(
+            self.input_path, ["x", "y"], k=3, random_state=0, chunk_size=100, scaler_path=scaler_path
+        )
+        self.assertTrue(os.path.exists(scaler_path))
+        # The in-memory run reads the parameters saved by the streaming run.
+        os.utime(scaler_path, (0, 0))
+        second = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0, scaler_path=scaler_path)
+        self.assertEqual(os.stat(scaler_path).st_mtime, 0)
+        full = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0)
+        np.testing.assert_allclose(second["centroids"], full["centroids"], atol=1e-9)
+        self.assertEqual(first["n_samples"], 600)
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path, ["y", "x"], scaler_path=scaler_path)
+
+    def test_run_clustering_reuses_fit_and_elbow(self):
+        input_path = self.input_path
+        cache_dir = os.path.join(self.tmpdir.name, "cache")
+        kwargs = dict(k=3, random_state=0, cache_dir=cache_dir, plot="none")
+        first = run_clustering(input_path, ["x", "y"], **kwargs)
+        self.assertIn("fit", first["profile"])
+        self.assertFalse(first["profile"]["cache"]["hits"]["fit"])
+
+        # Only compute_elbow changes: the cached fit is reused.
+        second = run_clustering(input_path, ["x", "y"], compute_elbow=True, **kwargs)
+        self.assertNotIn("fit", second["profile"])
+        self.assertIn("elbow", second["profile"])
+        np.testing.assert_array_equal(second["labels"], first["labels"])
+        self.assertEqual(second["metrics"], first["metrics"])
+        self.assertListEqual(list(second["data"]["cluster"]), list(first["labels"]))
+
+        third = run_clustering(input_path, ["x", "y"], compute_elbow=True, **kwargs)
+        self.assertNotIn("elbow", third["profile"])
+        self.assertEqual(third["elbow_inertias"], second["elbow_inertias"])
+
+        # The silhouette time budget does not change the key.
+        budget = run_clustering(input_path, ["x", "y"], silhouette_time_budget=5.0, **kwargs)
+        self.assertNotIn("fit", budget["profile"])
+
+        other_k = run_clustering(input_path, ["x", "y"], **dict(kwargs, k=2))
+        self.assertIn("fit", other_k["profile"])
+        with self.assertRaises(ValueError):
+            run_clustering(input_path, ["x", "y"], chunk_size=100, **kwargs)
+
+    def test_cache_hit_returns_the_same_metrics_as_a_miss(self):
+        kwargs = dict(
+            k=3, random_state=0, plot="none", silhouette="sampled", silhouette_sample_size=100,
+            cache_dir=os.path.join(self.tmpdir.name, "cache"),
+        )
+        miss = run_clustering(self.input_path, ["x", "y"], **kwargs)
+        hit = run_clustering(self.input_path, ["x", "y"], **kwargs)
+        self.assertTrue(hit["profile"]["cache"]["hits"]["fit"])
+        self.assertIsInstance(miss["metrics"]["silhouette_ci"], tuple)
+        self.assertEqual(hit["metrics"], miss["metrics"])
+
+    def test_refit_from_saved_model_after_append(self):
+        model_path = os.path.join(self.tmpdir.name, "model.npz")
+        first = run_clustering(
+            self.input_path, ["x", "y"], k=3, random_state=0, model_path=model_path, plot="none"
+        )
+        self.assertEqual(first["cluster_counts"].sum(), 600)
+        extra = _write_blobs_csv(os.path.join(self.tmpdir.name, "extra.csv"), 50, random_state=1)
+        extra.to_csv(self.input_path, mode="a", header=False, index=False)
+
+        refined = run_clustering(
+            self.input_path, ["x", "y"], k=3, refit_from=model_path, model_path=model_path, plot="none"
+        )
+        self.assertLessEqual(refined["profile"]["fit"]["refit"]["n_iter"], 3)
+        self.assertEqual(len(refined["labels"]), 750)
+        full = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0, plot="none")
+        # Same partition as a fit from scratch (up to label permutation).
+        self.assertEqual(len(set(zip(refined["labels"], full["labels"]))), 3)
+
+        online = run_clustering(
+            self.input_path, ["x", "y"], k=3, refit_from=model_path, refit="online", plot="none"
+        )
+        # Nothing was appended since the refined model was saved.
+        self.assertEqual(online["profile"]["fit"]["refit"]["n_new"], 0)
+        np.testing.assert_allclose(online["centroids"], refined["centroids"])
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path, ["x", "y"], k=4, refit_from=model_path)
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path, ["x", "y"], refit_from=model_path, chunk_size=100)
+
+    def test_bisecting_kmeans_elbow_from_split_history(self):
+        result = run_clustering(
+            self.input_path,
+            ["x", "y"],
+            algorithm="bisecting_kmeans",
+            k=3,
+            random_state=0,
+            compute_elbow=True,
+            elbow_k_values=[1, 2, 3, 4, 5],
+            plot="none",
+        )
+        self.assertEqual(result["profile"]["fit"]["bisecting_kmeans"]["n_splits"], 4)
+        self.assertEqual(len(np.unique(result["labels"])), 3)
+        self.assertListEqual(list(result["elbow_inertias"]), [1, 2, 3, 4, 5])
+        self.assertAlmostEqual(result["elbow_inertias"][3], result["metrics"]["inertia"])
+        with self.assertRaises(ValueError):
+            run_clustering(
+                self.input_path, ["x", "y"], algorithm="bisecting_kmeans", chunk_size=50
+            )
+
+    def test_streaming_rejects_sklearn(self):
+        with self.assertRaises(ValueError):
+            run_clustering(
+                self.input_path, ["x", "y"], algorithm="sklearn_kmeans", chunk_size=50
+            )
+
+    def test_streaming_missing_column(self):
+        with self.assertRaises(KeyError):
+            run_clustering(self.input_path, ["x", "z"], chunk_size=50)
+
+
+class TestRunClusteringMemoryMap(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmpdir.name, "features.npy")
+        rng = np.random.RandomState(0)
+        X = rng.normal(size=(100_000, 8))
+        X[: X.shape[0] // 2] += 6.0
+        np.save(self.input_path, X)
+        self.nbytes = X.nbytes
+        self.feature_cols = [str(j) for j in range(X.shape[1])]
+
+    def tearDown(self):
+        plt.close("all")
+        self.tmpdir.cleanup()
+
+    def _assert_extra_memory_is_small(self, input_path, feature_cols, nbytes, dtype):
+        # Beyond the labels it returns, each stage may only allocate a
+        # small fraction of the feature matrix: any full-length copy of a
+        # column, or any other per-sample array, fails this. (The plot only
+        # sees a sample of fixed size, so it is left out.)
+        mapped = run_clustering(
+            input_path,
+            feature_cols,
+            k=2,
+            random_state=0,
+            memory_map=True,
+            trace_memory=True,
+            dtype=dtype,
+        )
+        self.assertIsNone(mapped["data"])
+        self.assertEqual(mapped["metrics"]["silhouette_method"], "simplified")
+        for stage in ("load", "select", "standardise", "fit", "inertia", "silhouette"):
+            extra = mapped["profile"][stage]["tracemalloc_peak_bytes"]
+            if stage == "fit":
+                extra -= mapped["labels"].nbytes
+            self.assertLess(extra, 0.2 * nbytes, stage)
+        return mapped
+
+    def test_peak_memory_is_bounded_by_the_feature_matrix(self):
+        mapped = self._assert_extra_memory_is_small(
+            self.input_path, self.feature_cols, self.nbytes, "float64"
+        )
+        self.assertEqual(mapped["n_samples"], 100_000)
+
+        in_memory = run_clustering(self.input_path, self.feature_cols, k=2, random_state=0)
+        self.assertAlmostEqual(
+            mapped["metrics"]["inertia"], in_memory["metrics"]["inertia"], delta=1e-6
+        )
+
+    def test_peak_memory_of_a_narrow_float32_matrix(self):
+        # Two float32 columns take as many bytes per row as an int64 label,
+        # so even a copy of one column in float64 exceeds the bound.
+        path = os.path.join(self.tmpdir.name, "narrow.npy")
+        rng = np.random.RandomState(1)
+        X = rng.normal(size=(200_000, 2)).astype(np.float32)
+        X[: X.shape[0] // 2] += 6.0
+        np.save(path, X)
+        mapped = self._assert_extra_memory_is_small(path, ["0", "1"], X.nbytes, "float32")
+        self.assertEqual(mapped["n_samples"], 200_000)
+
+    def test_standardise_in_place_and_column_subset(self):
+        output_path = os.path.join(self.tmpdir.name, "labels.csv")
+        subset = run_clustering(
+            self.input_path, ["3", "0"], k=2, random_state=0, memory_map=True,
+            output_path=output_path,
+        )
+        self.assertEqual(len(pd.read_csv(output_path)), 100_000)
+        self.assertEqual(subset["centroids"].shape, (2, 2))
+
+        run_clustering(
+            self.input_path, self.feature_cols, k=2, random_state=0, memory_map=True,
+            standardise_in_place=True,
+        )
+        X = np.load(self.input_path)
+        np.testing.assert_allclose(X.mean(axis=0), 0.0, atol=1e-10)
+        np.testing.assert_allclose(X.std(axis=0), 1.0)
+
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path.replace(".npy", ".csv"), ["0"], memory_map=True)
+        with self.assertRaises(KeyError):
+            run_clustering(self.input_path, ["8"], memory_map=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
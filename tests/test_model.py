@@ -0,0 +1,72 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.algorithms import kmeans
+from cluster_maker.model import KMeansModel
+from cluster_maker.preprocessing import standardise_features
+
+
+def _blobs(n_per_cluster=100, random_state=0):
+    rng = np.random.RandomState(random_state)
+    centres = np.array([[0.0, 0.0, 0.0], [8.0, 8.0, 0.0], [-8.0, 8.0, 4.0]])
+    X = np.vstack([c + rng.normal(size=(n_per_cluster, 3)) for c in centres])
+    return 5.0 * X + 100.0
+
+
+class TestKMeansModel(unittest.TestCase):
+    def test_fit_matches_functional_api(self):
+        X = _blobs()
+        model = KMeansModel(k=3, random_state=0).fit(X)
+        labels, centroids = kmeans(standardise_features(X), k=3, random_state=0)
+        self.assertTrue(np.array_equal(model.labels_, labels))
+        self.assertTrue(np.allclose(model.centroids_, centroids))
+        self.assertEqual(model.cluster_counts_.sum(), X.shape[0])
+
+        # Predict applies the training standardisation to raw inputs.
+        self.assertTrue(np.array_equal(model.predict(X), labels))
+        self.assertAlmostEqual(-model.score(X), model.inertia_, places=6)
+
+        Xs = standardise_features(X)
+        expected = np.sqrt(((Xs[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2))
+        self.assertTrue(np.allclose(model.transform(X), expected))
+
+    def test_single_rows_and_micro_batches(self):
+        X = _blobs()
+        model = KMeansModel(k=3, random_state=0, batch_size=16).fit(X)
+        for i in (0, 150, 299):
+            self.assertEqual(model.predict(X[i])[0], model.labels_[i])
+        out = np.empty(X.shape[0], dtype=np.intp)
+        self.assertIs(model.predict(X, out=out), out)
+        self.assertTrue(np.array_equal(out, model.labels_))
+        with self.assertRaises(ValueError):
+            model.predict(X, out=out[:-1])
+        with self.assertRaises(ValueError):
+            model.predict(X, out=out.astype(np.int32))
+
+    def test_dataframe_columns_are_realigned(self):
+        df = pd.DataFrame(_blobs(), columns=["a", "b", "c"])
+        model = KMeansModel(k=3, random_state=0, dtype="float32").fit(df)
+        self.assertListEqual(model.feature_names_, ["a", "b", "c"])
+        self.assertTrue(np.array_equal(model.predict(df[["c", "a", "b"]]), model.labels_))
+
+    def test_from_centroids_and_errors(self):
+        model = KMeansModel.from_centroids(np.array([[0.0, 0.0], [10.0, 10.0]]))
+        self.assertListEqual(list(model.predict([[1.0, 1.0], [9.0, 8.0]])), [0, 1])
+        with self.assertRaises(ValueError):
+            model.predict(np.zeros((2, 3)))
+        with self.assertRaises(RuntimeError):
+            KMeansModel().predict(np.zeros((1, 2)))
+        with self.assertRaises(ValueError):
+            KMeansModel.from_centroids(np.zeros((2, 2)), mean=np.zeros(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
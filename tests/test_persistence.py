@@ -0,0 +1,85 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from cluster_maker.interface import run_clustering
+from cluster_maker.model import KMeansModel
+from cluster_maker.persistence import load_model, load_model_arrays, save_model
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        rng = np.random.RandomState(0)
+        centres = np.array([[0.0, 0.0], [10.0, 10.0], [-10.0, 10.0]])
+        self.X = np.vstack([c + rng.normal(size=(100, 2)) for c in centres])
+
+    def tearDown(self):
+        plt.close("all")
+        self.tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_round_trip_and_mmap(self):
+        df = pd.DataFrame(self.X, columns=["x", "y"])
+        model = KMeansModel(k=3, random_state=0).fit(df)
+        path = self._path("model.npz")
+        save_model(path, model, metadata={"inertia": model.inertia_})
+
+        header, arrays = load_model_arrays(path)
+        self.assertEqual(header["version"], 1)
+        self.assertListEqual(header["feature_names"], ["x", "y"])
+        self.assertAlmostEqual(header["metadata"]["inertia"], model.inertia_)
+
+        for mmap in (False, True):
+            loaded = load_model(path, mmap=mmap)
+            self.assertTrue(np.array_equal(loaded.centroids_, model.centroids_))
+            self.assertTrue(np.array_equal(loaded.mean_, model.mean_))
+            self.assertTrue(np.array_equal(loaded.predict(df), model.labels_))
+
+    def test_path_without_extension(self):
+        path = self._path("model")
+        save_model(path, np.array([[0.0, 0.0], [5.0, 5.0]]))
+        self.assertTrue(os.path.exists(path + ".npz"))
+        self.assertEqual(load_model(path).k, 2)
+        self.assertEqual(load_model_arrays(path + ".npz")[0]["k"], 2)
+
+    def test_bare_centroids_and_bad_files(self):
+        path = self._path("centroids.npz")
+        save_model(path, np.array([[0.0, 0.0], [5.0, 5.0]]))
+        model = load_model(path, mmap=True)
+        self.assertIsNone(model.mean_)
+        self.assertListEqual(list(model.predict([[1.0, 0.0], [4.0, 6.0]])), [0, 1])
+
+        other = self._path("other.npz")
+        np.savez(other, centroids=np.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            load_model(other)
+
+    def test_run_clustering_saves_model(self):
+        input_path = self._path("input.csv")
+        pd.DataFrame(self.X, columns=["x", "y"]).to_csv(input_path, index=False)
+        for options in ({}, {"chunk_size": 64}):
+            model_path = self._path("run_model.npz")
+            result = run_clustering(
+                input_path, ["x", "y"], k=3, random_state=0, model_path=model_path, **options
+            )
+            model = load_model(model_path)
+            self.assertListEqual(model.feature_names_, ["x", "y"])
+            self.assertTrue(np.allclose(model.centroids_, result["centroids"]))
+            self.assertAlmostEqual(-model.score(self.X), result["metrics"]["inertia"], places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
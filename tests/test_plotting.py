@@ -0,0 +1,55 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from cluster_maker.plotting_clustered import plot_clusters_2d, plot_elbow
+
+
+class TestPlotting(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        # One large and one small cluster.
+        self.X = np.vstack([rng.normal(size=(2000, 2)), 8 + rng.normal(size=(20, 2))])
+        self.labels = np.repeat([0, 1], [2000, 20])
+        self.centroids = np.array([[0.0, 0.0], [8.0, 8.0]])
+
+    def tearDown(self):
+        plt.close("all")
+
+    def test_styles(self):
+        for style in ("scatter", "raster", "hexbin", "hist2d"):
+            fig, ax = plot_clusters_2d(
+                self.X, self.labels, centroids=self.centroids, style=style, headless=True
+            )
+            self.assertEqual(ax.get_xlabel(), "Feature 1")
+        with self.assertRaises(ValueError):
+            plot_clusters_2d(self.X, self.labels, style="contour")
+
+    def test_downsampling_keeps_small_clusters(self):
+        _, ax = plot_clusters_2d(
+            self.X, self.labels, max_points=200, headless=True, random_state=0
+        )
+        scatter = ax.collections[0]
+        self.assertEqual(len(scatter.get_offsets()), 200)
+        self.assertIn(1, set(scatter.get_array()))
+        self.assertTrue(scatter.get_rasterized())
+
+    def test_headless_figure_written_to_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "elbow.png")
+            plot_elbow([1, 2, 3], [9.0, 4.0, 3.5], headless=True, output_path=path)
+            self.assertTrue(os.path.getsize(path) > 0)
+        self.assertListEqual(plt.get_fignums(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.preprocessing import StreamingStandardiser, standardise_features
+
+
+class TestStreamingStandardiser(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.X = rng.normal(loc=1e6, scale=[1.0, 5.0, 0.1], size=(1000, 3))
+        self.X[:, 2] = 7.0  # constant column
+
+    def test_partial_fit_matches_full_fit(self):
+        scaler = StreamingStandardiser()
+        for start in range(0, 1000, 128):
+            scaler.partial_fit(self.X[start:start + 128])
+        self.assertEqual(scaler.n_samples_seen_, 1000)
+        np.testing.assert_allclose(scaler.mean_, self.X.mean(axis=0), rtol=1e-12)
+        np.testing.assert_allclose(scaler.var_, self.X.var(axis=0), rtol=1e-9, atol=1e-12)
+        self.assertEqual(scaler.scale_[2], 1.0)
+        np.testing.assert_allclose(scaler.transform(self.X), standardise_features(self.X), atol=1e-9)
+
+        left = StreamingStandardiser().partial_fit(self.X[:300])
+        right = StreamingStandardiser().partial_fit(self.X[300:])
+        merged = left.merge(right)
+        np.testing.assert_allclose(merged.mean_, scaler.mean_, rtol=1e-12)
+        np.testing.assert_allclose(merged.var_, scaler.var_, rtol=1e-9, atol=1e-12)
+
+    def test_near_constant_column_is_not_scaled_up(self):
+        X = np.full((1000, 2), 1e6)
+        X[:, 1] = np.random.RandomState(1).normal(size=1000)
+        X[::2, 0] += 1e-10  # rounding-level noise around a large mean
+        scaler = StreamingStandardiser().fit(X)
+        self.assertGreater(scaler.var_[0], 0.0)
+        self.assertEqual(scaler.scale_[0], 1.0)
+        self.assertLess(np.abs(scaler.transform(X)[:, 0]).max(), 1e-9)
+
+    def test_in_place_transform(self):
+        scaler = StreamingStandardiser().fit(self.X, memory_budget=4096)
+        X = self.X.copy()
+        result = scaler.transform(X, in_place=True)
+        self.assertIs(result, X)
+        np.testing.assert_allclose(X, standardise_features(self.X), atol=1e-8)
+        with self.assertRaises(TypeError):
+            scaler.transform(np.ones((2, 3), dtype=int), in_place=True)
+
+    def test_save_load_and_feature_names(self):
+        df = pd.DataFrame(self.X, columns=["a", "b", "c"])
+        scaler = StreamingStandardiser().partial_fit(df)
+        self.assertListEqual(scaler.feature_names_, ["a", "b", "c"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "scaler.npz")
+            scaler.save(path)
+            loaded = StreamingStandardiser.load(path)
+        self.assertListEqual(loaded.feature_names_, ["a", "b", "c"])
+        self.assertEqual(loaded.n_samples_seen_, 1000)
+        np.testing.assert_array_equal(loaded.scale_, scaler.scale_)
+        # Loaded standardisers keep accumulating; columns are matched by name.
+        loaded.partial_fit(df[["c", "a", "b"]])
+        self.assertEqual(loaded.n_samples_seen_, 2000)
+        np.testing.assert_allclose(loaded.mean_, scaler.mean_, rtol=1e-12)
+        with self.assertRaises(RuntimeError):
+            StreamingStandardiser().transform(self.X)
+
+
+if __name__ == "__main__":
+    unittest.main()
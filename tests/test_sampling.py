@@ -0,0 +1,24 @@
+###
+## cluster_maker - test file
+## James Foadi - University of Bath
+## November 2025
+###
+
+import unittest
+
+import numpy as np
+
+from cluster_maker.sampling import stratified_sample
+
+
+class TestStratifiedSample(unittest.TestCase):
+    def test_proportional_allocation_keeps_small_clusters(self):
+        labels = np.repeat([0, 1, 2], [9000, 990, 10])
+        idx = stratified_sample(labels, 1000, random_state=0)
+        self.assertTrue(np.all(np.diff(idx) > 0))
+        np.testing.assert_array_equal(np.bincount(labels[idx]), [900, 99, 2])
+        np.testing.assert_array_equal(idx, stratified_sample(labels, 1000, random_state=0))
+
+
+if __name__ == "__main__":
+    unittest.main()